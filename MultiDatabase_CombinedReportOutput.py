@@ -16,9 +16,7 @@ import tempfile
 import shutil
 import traceback
 from collections import OrderedDict
-from contextlib import contextmanager
 from datetime import datetime, timedelta
-from openpyxl import load_workbook
 from openpyxl.styles import NamedStyle, Alignment, PatternFill, Border, Side, Font, Fill
 import arcpy
 from arcpy import env
@@ -29,6 +27,28 @@ from openpyxl.formatting.rule import Rule
 from openpyxl.worksheet.cell_range import CellRange
 
 from reporting import HuntingDetailReport
+from report_data import read_table, read_where_in, in_clauses, invalidate, IN_LIST_SIZE, use_snapshot, snapshot_parameter, export_snapshot, SNAPSHOT_TABLES
+from report_facts import read_facts, build_facts, with_location, fill_locations
+from report_styles import style_range
+from report_batch import REPORT_WORKERS, save_reports
+from report_details import GuidedRecDetail, OutfittingDetail, MendenhallDetail, IcefieldDetail, HeliskiDetail
+from report_names import fill_names, name_tables, update_index, drop_names, scan_names, NAME_TABLES
+from report_specs import run_spec, write_sheets, CONFIRM_USE, ICEFIELD_SUMMARY, MENDENHALL_SUMMARY
+
+
+def _records(frame):
+    """ Rows of a frame as dicts, with None for nulls the way the cursors gave them"""
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+
+
+def _joined_rows(activity_table, trips, key='TRIP_GUID'):
+    """ The rows MakeQueryTable gave for an activity table joined to its trip table on key, as
+    (field, value) pairs with the activity's fields first and then the trip's. Going through
+    read_where_in lets the detail reports run off a snapshot too."""
+    trip_rows = OrderedDict((row[key], row) for row in _records(trips))
+    for row in _records(read_where_in(activity_table, key, list(trip_rows))):
+        if row[key] in trip_rows:
+            yield list(row.items()) + list(trip_rows[row[key]].items())
 
 
 class Toolbox(object):
@@ -41,119 +61,8 @@ class Toolbox(object):
         # List of tool classes associated with this toolbox
         self.tools = [GuidedRecReport, BusinessXlsCreator, BusinessXlsUpdater, OutfittingReport, MendenhallReport, IcefieldReport,
                       IcefieldSummary, MendenhallSummary, HeliskiReport, HuntingDetailReport, FiveYearSummary, RVD_Report,
-                      NEPAReview_Shoreline2, NEPAReview_KMRD, ConfirmActualUse, WildernessSummary, HeliskiSummary, VisitationSummary]
-
-class GuidedRecDetail:
-
-    def __init__(self, business_name, startdate, enddate, certification, save_path):
-
-        self.row = 4
-        wb_path = r'{'ExamplePath'}\guided_rec_detail_template.xlsx'
-        wb = load_workbook(wb_path)
-
-        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
-        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
-        self.savefile = "GuidedRecDetail_" + savedates + '_' + savebusiness + ".xlsx"
-        self.path = os.path.join(save_path, self.savefile)
-
-        trip_style = NamedStyle('trip_style')
-        thin = Side(border_style='thin', color='000000')
-        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
-        wb.add_named_style(trip_style)
-
-        int_style = NamedStyle('int_style', number_format='0')
-        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        int_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(int_style)
-
-        coord_style = NamedStyle('coord_style', number_format='###.##0')
-        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        coord_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(coord_style)
-
-        float_style = NamedStyle('float_style', number_format='0.00')
-        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        float_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(float_style)
-
-        str_style = NamedStyle('str_style')
-        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        str_style.alignment = Alignment(horizontal='left')
-        wb.add_named_style(str_style)
-
-        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
-        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        datetime_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(datetime_style)
-
-        self.styles = ['datetime_style', 'int_style', 'str_style', 'coord_style',
-                       'coord_style', 'str_style', 'int_style', 'int_style',
-                       'int_style', 'float_style', 'datetime_style']
-
-        ws = wb.active
-        ws['C2'] = certification
-        header = 'Business/Organization: {}\nOperating Season: {}'.format(business_name, enddate.strftime('%Y'))
-        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
-        ws.firstHeader.left.text = header
-        ws.firstFooter.left.text = footer
-        ws.oddHeader.left.text = header
-        ws.evenHeader.left.text = header
-        ws.oddFooter.left.text = footer
-        ws.evenFooter.left.text = footer
-        wb.save(self.path)
-
-    @contextmanager
-    def __worksheet(self):
-
-        wb = load_workbook(self.path)
-        ws = wb.active
-        try:
-            yield ws
-        finally:
-            wb.save(self.path)
-
-    def save_trips(self, trips):
-
-        with self.__worksheet() as ws:
-            for trip_guid in trips.keys():
-                self._add_trip(ws, **trips[trip_guid])
-
-    def _add_trip(self, ws, startdate, enddate, tripclients, category, submitter, activities):
-
-        # Skip to next page if trip records span page.
-        current_page_line = (self.row - 27) % 29 if self.row > 27 else self.row
-        current_page_line = 29 if not current_page_line else current_page_line
-        trip_end_line = current_page_line + len(activities)
-        if (self.row <= 27) and (trip_end_line > 27):
-            self.row += 28 - current_page_line
-        elif trip_end_line > 29:
-            self.row += 30 - current_page_line
-
-        for col in range(1, 11):
-            cell = ws.cell(row=self.row, column=col)
-            cell.style = 'trip_style'
-
-        ws.merge_cells('A{}:C{}'.format(self.row, self.row))
-        ws.merge_cells('D{}:E{}'.format(self.row, self.row))
-        ws.merge_cells('F{}:G{}'.format(self.row, self.row))
-        ws.merge_cells('H{}:J{}'.format(self.row, self.row))
-        ws['A{}'.format(self.row)] = "Trip Dates: {}-{}".format(startdate.strftime('%m/%d/%Y'),
-                                                                enddate.strftime('%m/%d/%Y'))
-        ws['D{}'.format(self.row)] = 'Clients on Trip: {}'.format(tripclients)
-        ws['F{}'.format(self.row)] = 'Category: {}'.format(category)
-        ws['H{}'.format(self.row)] = 'By: {}, {}'.format(submitter[0], submitter[1].strftime('%m/%d/%Y'))
-        self.row += 1
-        self._add_activities(ws, activities)
-
-    def _add_activities(self, worksheet, activity_records):
-
-        for record in activity_records:
-            for col, value in enumerate(record, 1):
-                cell = worksheet.cell(row=self.row, column=col)
-                cell.value = value
-                cell.style = self.styles[col - 1]
-            self.row += 1
+                      NEPAReview_Shoreline2, NEPAReview_KMRD, ConfirmActualUse, WildernessSummary, HeliskiSummary, VisitationSummary,
+                      SnapshotExport]
 
 
 class GuidedRecReport(object):
@@ -167,6 +76,7 @@ class GuidedRecReport(object):
                   'table3',
                   'table4']
         self.tables = [connection + table for table in tables]
+        self.connection = connection
 
     def getParameterInfo(self):
         # Define parameter definitions
@@ -176,12 +86,12 @@ class GuidedRecReport(object):
             name="business",
             datatype="GPString",
             parameterType="Required",
-            direction="Input")
+            direction="Input",
+            multiValue=True)
 
         param0.filter.type = "ValueList"
-
-        sc = arcpy.da.SearchCursor(self.tables[3], "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        param0.filter.list = [row[0] for row in sc]
+        # filled in by updateParameters
+        param0.filter.list = []
 
         param1 = arcpy.Parameter(
             displayName="that end between",
@@ -209,7 +119,16 @@ class GuidedRecReport(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        param4 = arcpy.Parameter(
+            displayName="Reports to build at the same time",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input")
+
+        param4.value = REPORT_WORKERS
+
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
 
         return params
 
@@ -217,69 +136,78 @@ class GuidedRecReport(object):
         return True
 
     def updateParameters(self, parameters):  # optional
+        fill_names(parameters[0], name_tables(self.connection, ['GUIDEDREC']))
         return
 
     def updateMessages(self, parameters):  # optional
         return
 
-    def _get_rows(self, table, where):
+    def _get_rows(self, table, fields, trip_guids):
 
-        rows = []
-        with arcpy.da.SearchCursor(table, '*', where) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                row = dict(zip(fields, row))
-                rows.append(row)
-        return pd.DataFrame(rows)
+        return read_where_in(table, 'TRIP_GUID', trip_guids, fields)
 
     def _read_activities(self, trip_guids):
 
-        where_trip = "TRIP_GUID IN ({})".format(','.join(["'{}'".format(guid) for guid in trip_guids]))
+        trip_guids = list(trip_guids)
 
-        activities = self._get_rows(self.tables[0], where_trip)
-        stops = self._get_rows(self.tables[1], where_trip)
-        days = self._get_rows(self.tables[2], where_trip)
+        activities = self._get_rows(self.tables[0], ['ACTIVITY', 'CLIENTNUMBER', 'GROUPNUMBER', 'GUIDENUMBER', 'HOURSSPENTONFS', 'STOP_GUID'], trip_guids)
+        stops = self._get_rows(self.tables[1], ['STOP_GUID', 'USELOCATION', 'LOCATION_ID', 'DAY_GUID'], trip_guids)
+        days = self._get_rows(self.tables[2], ['DAY_GUID', 'TRIPDATE', 'TOTALCLIENTSONDAY', 'TRIP_GUID'], trip_guids)
 
         use_report = (
-            activities[['ACTIVITY', 'CLIENTNUMBER', 'GROUPNUMBER', 'GUIDENUMBER', 'HOURSSPENTONFS', 'STOP_GUID']]
-            .merge(stops[['STOP_GUID', 'USELOCATION', 'LOCATION_ID', 'DAY_GUID']], on='STOP_GUID')
-            .merge(days[['DAY_GUID', 'TRIPDATE', 'TOTALCLIENTSONDAY', 'TRIP_GUID']], on='DAY_GUID'))
+            activities
+            .merge(stops, on='STOP_GUID')
+            .merge(days, on='DAY_GUID'))
+        # empty cells for nulls rather than NaN
+        use_report = use_report.astype(object).where(use_report.notna(), None)
 
         return sorted(use_report.to_dict(orient='records'), key=lambda x: x['TRIPDATE'])
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
 
-        businessname = parameters[0].value
+    def _execute(self, parameters, messages):
+
+        businessnames = parameters[0].values
         startdate = parameters[1].value
         enddate = parameters[2].value
         savepath = parameters[3].value.value
-
-        trips = OrderedDict()
-        certification = None
-        query = """"BUSINESSNAME" = '{}' AND "ENDDATE" >= date '{}' AND "ENDDATE" <= date '{}'"""
-        query = query.format(businessname, startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
-        with arcpy.da.SearchCursor(self.tables[-1], '*', query) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                row = dict(zip(fields, row))
-                certification = certification or row['CERTIFICATION']
-                trips[row['TRIP_GUID']] = {'startdate': row['STARTDATE'],
-                                           'enddate': row['ENDDATE'],
-                                           'tripclients': row['MAXCLIENTS'],
-                                           'category': row['USECATEGORY'],
-                                           'submitter': (row['REPORTERNAME'], row['CREATIONDATE']),
-                                           'activities': []}
-
-        trips = OrderedDict(sorted(trips.items(), key=lambda x: (x[1]['startdate'], x[1]['enddate'])))
-
-        if trips:
-            arcpy.AddMessage("Processed {} trip records...".format(len(trips)))
+        workers = parameters[4].value or 1
+
+        """Reads the trips of every business picked at once, then splits them up by business"""
+        businesses = OrderedDict((name, {'certification': None, 'trips': OrderedDict()}) for name in businessnames)
+        query = """"ENDDATE" >= date '{}' AND "ENDDATE" <= date '{}'"""
+        query = query.format(startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
+        fields = ['TRIP_GUID', 'BUSINESSNAME', 'STARTDATE', 'ENDDATE', 'MAXCLIENTS', 'USECATEGORY', 'REPORTERNAME', 'CREATIONDATE', 'CERTIFICATION']
+        tripDF = read_where_in(self.tables[-1], 'BUSINESSNAME', businessnames, fields, where=query)
+        tripRecords = OrderedDict()
+        for row in tripDF.to_dict(orient='records'):
+            if row['BUSINESSNAME'] not in businesses:
+                continue
+            business = businesses[row['BUSINESSNAME']]
+            business['certification'] = business['certification'] or row['CERTIFICATION']
+            business['trips'][row['TRIP_GUID']] = {'startdate': row['STARTDATE'],
+                                                   'enddate': row['ENDDATE'],
+                                                   # the column is float when a trip has no MAXCLIENTS
+                                                   'tripclients': None if pd.isnull(row['MAXCLIENTS']) else int(row['MAXCLIENTS']),
+                                                   'category': row['USECATEGORY'],
+                                                   'submitter': (row['REPORTERNAME'], row['CREATIONDATE']),
+                                                   'activities': []}
+            tripRecords[row['TRIP_GUID']] = business['trips'][row['TRIP_GUID']]
+
+        for business in businesses.values():
+            business['trips'] = OrderedDict(sorted(business['trips'].items(), key=lambda x: (x[1]['startdate'], x[1]['enddate'])))
+
+        if tripRecords:
+            arcpy.AddMessage("Processed {} trip records...".format(len(tripRecords)))
         else:
             arcpy.AddMessage("No trips to report in date range.")
             return
 
         use_reports = 0
-        for row in self._read_activities(trips.keys()):
+        for row in self._read_activities(tripRecords.keys()):
             use_reports += 1
             if row['LOCATION_ID'].startswith('+'):
                 latitude, longitude = [float(coord) for coord in row['LOCATION_ID'].split('_')]
@@ -296,22 +224,22 @@ class GuidedRecReport(object):
                       row['GROUPNUMBER'],
                       row['GUIDENUMBER'],
                       row['HOURSSPENTONFS']]
-            if row['TRIP_GUID'] in trips.keys():
-                trips[row['TRIP_GUID']]['activities'].append(record)
+            if row['TRIP_GUID'] in tripRecords:
+                tripRecords[row['TRIP_GUID']]['activities'].append(record)
 
-        for trip in trips.keys():
+        for trip in tripRecords.keys():
             try:
-                trips[trip]['activities'] = sorted(trips[trip]['activities'], key=lambda x: x[0])
+                tripRecords[trip]['activities'] = sorted(tripRecords[trip]['activities'], key=lambda x: x[0])
             except Exception as e:
-                arcpy.AddError("ERROR: {}\nTRIPID {}: {}\nACTIVITY DATA: {}".format(e, trips[trip], trips[trip]['activities']))
+                arcpy.AddError("ERROR: {}\nTRIPID {}: {}\nACTIVITY DATA: {}".format(e, tripRecords[trip], tripRecords[trip]['activities']))
                 raise e
 
         arcpy.AddMessage("Processed {} use report records.".format(use_reports))
 
-        report = GuidedRecDetail(businessname, startdate, enddate, certification, savepath)
-
-        arcpy.AddMessage('Saving {}...'.format(report.savefile))
-        report.save_trips(trips)
+        reports = [(businessname, (businessname, startdate, enddate, business['certification'], savepath), business['trips'])
+                   for businessname, business in businesses.items()]
+        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
+        save_reports(GuidedRecDetail, reports, os.path.join(savepath, "GuidedRecDetail_" + savedates + "_manifest.csv"), workers)
 
 
 class BusinessXlsCreator(object):
@@ -353,7 +281,16 @@ class BusinessXlsCreator(object):
             direction="Input")
         param2.filter.list = ['GUIDEDREC', 'HUNTING', 'HELISKI', 'OUTFITTING', 'MENDENHALL', 'ICEFIELD', 'ALL']
 
-        params = [param0, param1, param2]
+        # the index reads one table a dataset, so it misses names that are only in the other tables
+        param3 = arcpy.Parameter(
+            displayName="Read names from the business name index (faster, one table a dataset)",
+            name="useIndex",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input")
+        param3.value = False
+
+        params = [param0, param1, param2, param3]
         return params
 
     def isLicensed(self):
@@ -379,6 +316,7 @@ class BusinessXlsCreator(object):
         # xl = parameters[1].value.value
         xl = parameters[1].valueAsText
         ds = parameters[2].valueAsText
+        useIndex = parameters[3].value is True
         arcpy.AddMessage("     Output Excel file: " + xl)
         # sde = parameters[0].value.value
         sde = parameters[0].valueAsText
@@ -396,25 +334,24 @@ class BusinessXlsCreator(object):
             ofgList = [ds]
         arcpy.AddMessage("     SDE connection: " + sde)
         arcpy.AddMessage("     Dataset: " + ds)
-        df_all = pd.DataFrame(columns=['Current', 'New', 'Dataset'])
-        for o in ofgList:
-            objFilter = '*'.format(o)
-            dsList = [os.path.basename(obj) for obj in arcpy.ListFeatureClasses(objFilter) if
-                      not obj.endswith('_MV') and not obj.endswith('_VIEW') and 'CHRISTAL' not in obj]
-            dsList += [os.path.basename(obj) for obj in arcpy.ListTables(objFilter) if
-                       not obj.endswith('_MV') and not obj.endswith('__ATTACH') and not obj.endswith(
-                           '_VIEW') and 'CHRISTAL' not in obj]
-            i = 0
-            while i in range(len(dsList)):
-                d = dsList[i]
-                inData = os.path.join(sde, d)
-                arcpy.AddMessage("Reading BUSINESSNAME data from {}".format(d))
-                npArr = np.unique(arcpy.da.FeatureClassToNumPyArray(inData, ["BUSINESSNAME"], skip_nulls=True))
-                npArr.dtype.names = ('Current',)
-                df = pd.DataFrame(npArr, columns=['Current', 'New'])
-                df.insert(2, "Dataset", d.split(".")[1])
-                df_all = df_all.append(df, ignore_index=True)
-                i += 1
+        if useIndex:
+            # the index's table of each dataset, as it is named in this workspace
+            objects = dict((obj.split('.')[-1].upper(), os.path.join(sde, obj)) for obj in dsList)
+            tables = OrderedDict((o, objects[NAME_TABLES[o][0]]) for o in ofgList if NAME_TABLES[o][0] in objects)
+            arcpy.AddMessage("Reading BUSINESSNAME data from the business name index")
+            index = update_index(tables)
+            # listed under the index's table, the way a scan lists each table
+            df_all = pd.DataFrame({'Current': index['BUSINESSNAME'], 'New': None,
+                                   'Dataset': [NAME_TABLES[d][0] for d in index['DATASET']]},
+                                  columns=['Current', 'New', 'Dataset'])
+        else:
+            # every table of the datasets, each read once
+            tables = OrderedDict((d.split(".")[1], os.path.join(sde, d)) for d in dsList
+                                 if d.split(".")[-1].split("_")[0] in ofgList)
+            arcpy.AddMessage("Reading BUSINESSNAME data from {} tables".format(len(tables)))
+            pairs = sorted(scan_names(tables))
+            df_all = pd.DataFrame({'Current': [name for name, d in pairs], 'New': None, 'Dataset': [d for name, d in pairs]},
+                                  columns=['Current', 'New', 'Dataset'])
         arcpy.AddMessage("Converting to Excel...")
         if ds == 'ALL':
             df_all_out = df_all.drop_duplicates(subset=['Current', 'Dataset'])
@@ -463,7 +400,23 @@ class BusinessXlsUpdater(object):
             parameterType="Required",
             direction="Input")
 
-        params = [param0, param1, param2]
+        param3 = arcpy.Parameter(
+            displayName="Dry run (only count the records each table would update)",
+            name="dryRun",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input")
+        param3.value = False
+
+        param4 = arcpy.Parameter(
+            displayName="Update every table in one edit session",
+            name="oneSession",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input")
+        param4.value = True
+
+        params = [param0, param1, param2, param3, param4]
         return params
 
     def isLicensed(self):
@@ -499,11 +452,12 @@ class BusinessXlsUpdater(object):
         env.workspace = sde
         vers = parameters[2].value
         arcpy.AddMessage("     Edit Version: " + vers)
+        dryRun = bool(parameters[3].value)
+        oneSession = parameters[4].value is not False
         # create pandas data frame of excel file and drop all blanks in the New column
         arcpy.AddMessage("Reading Excel data....")
         ofg = pd.ExcelFile(xl).sheet_names[0]
-        df = pd.read_excel(xl, header=0).replace("\'", "\'\'", regex=True).dropna()
-        # df = df.replace("\'", "\'\'", regex=True)
+        df = pd.read_excel(xl, header=0).dropna()
         # list of fc and tables to update
         objFilter = '*'.format(ofg)
         updtObj = [os.path.basename(obj) for obj in arcpy.ListFeatureClasses(objFilter) if
@@ -513,9 +467,9 @@ class BusinessXlsUpdater(object):
                     not obj.endswith('_MV') and not obj.endswith('__ATTACH') and not obj.endswith(
                         '_VIEW') and 'CHRISTAL' not in obj]
 
-        # turn excel data frame into a dictionary with Current:New
-        data_dict = df.set_index('Current')['New'].to_dict()
-        print(data_dict)
+        # turn excel data frame into a dictionary with Current:New, the names as they are in the
+        # tables so each row is one lookup. Quotes are only escaped in the where clause.
+        renames = df.set_index('Current')['New'].to_dict()
 
         # create temp sde connection file to user's version
         sdeTempPath = tempfile.mkdtemp()
@@ -538,38 +492,48 @@ class BusinessXlsUpdater(object):
             # Iterate through Excel data and update table(s)
             field = "BUSINESSNAME"
             arcpy.AddMessage("Beginning Business Name updates")
-            valueList = list(data_dict.keys())
-            nameCnt = len(valueList)
+            nameCnt = len(renames)
             arcpy.AddMessage("{} business names:".format(nameCnt))
-            sql = """{} IN ('{}')""".format(arcpy.AddFieldDelimiters(os.path.join(sde, updtObj[0]), field),
-                                            '\', \''.join(map(str, valueList)))
-            for tbl in updtObj:
-                if 'ACTIVITY' in tbl:
-                    arcpy.MakeFeatureLayer_management(os.path.join(mySDE, tbl), "tblLyr", sql)
-                else:
-                    arcpy.MakeTableView_management(os.path.join(mySDE, tbl), "tblLyr", sql)
-                arcpy.AddMessage("Updating {}".format(tbl))
-                edit.startEditing(False, True)
-                edit.startOperation()
-                cnt = 0
-                with arcpy.da.UpdateCursor("tblLyr", field) as uCur:
-                    for row in uCur:
-                        for bName in valueList:
-                            if row[0] == bName.replace("\'\'", "\'"):
-                                row[0] = data_dict[bName]
+            # Oracle takes 1000 values an IN list
+            sql = " OR ".join("({})".format(clause) for clause in
+                              in_clauses(arcpy.AddFieldDelimiters(os.path.join(sde, updtObj[0]), field), renames))
+            if dryRun:
+                total = 0
+                for tbl in updtObj:
+                    with arcpy.da.SearchCursor(os.path.join(mySDE, tbl), field, sql) as sCur:
+                        cnt = sum(1 for row in sCur if row[0] in renames)
+                    total += cnt
+                    arcpy.AddMessage("     {} would have {} records updated".format(tbl, cnt))
+                arcpy.AddMessage("Dry run, nothing was edited. {} records would be updated in edit version {}".format(total, vers))
+                return
+            if oneSession:
+                counts, direct = self._update_all(edit, mySDE, updtObj, field, renames, sql)
+                for tbl, cnt in counts.items():
+                    arcpy.AddMessage("     Updated {} with {} records affected".format(tbl, cnt))
+                if direct:
+                    # the database updates skip editor tracking, so the name index can't see them
+                    drop_names(set(tbl.split('.')[-1].split('_')[0] for tbl in direct))
+            else:
+                for tbl in updtObj:
+                    if 'ACTIVITY' in tbl:
+                        arcpy.MakeFeatureLayer_management(os.path.join(mySDE, tbl), "tblLyr", sql)
+                    else:
+                        arcpy.MakeTableView_management(os.path.join(mySDE, tbl), "tblLyr", sql)
+                    arcpy.AddMessage("Updating {}".format(tbl))
+                    edit.startEditing(False, True)
+                    edit.startOperation()
+                    cnt = 0
+                    with arcpy.da.UpdateCursor("tblLyr", field) as uCur:
+                        for row in uCur:
+                            if row[0] in renames:
+                                row[0] = renames[row[0]]
                                 uCur.updateRow(row)
                                 cnt += 1
-                    else:
-                        print("No rows in cursor")
-                edit.stopOperation()
-                edit.stopEditing(True)
-                if arcpy.Exists("tblLyr"):
-                    arcpy.Delete_management("tblLyr")
-                if uCur:
-                    del uCur
-                if row:
-                    del row
-                arcpy.AddMessage("     Updated {} with {} records affected".format(tbl, cnt))
+                    edit.stopOperation()
+                    edit.stopEditing(True)
+                    if arcpy.Exists("tblLyr"):
+                        arcpy.Delete_management("tblLyr")
+                    arcpy.AddMessage("     Updated {} with {} records affected".format(tbl, cnt))
             arcpy.AddMessage("Finished updating BUSINESSNAME in edit version {}".format(vers))
             arcpy.AddMessage(
                 "\n***** Verify edits, then contact SDE Manager to reconcile/post your version to DEFAULT *****\n")
@@ -586,139 +550,95 @@ class BusinessXlsUpdater(object):
             raise errtype(errval)
         finally:
             shutil.rmtree(sdeTempPath)
-            
-            
-class OutfittingDetail:
-
-    def __init__(self, business_name, startdate, enddate, reporter, certification, forestName, save_path):
-
-        self.row = 4
-        wbPath = r'{'ExamplePath'}\Reports\outfitting_detail_template.xlsx'
-        wb = load_workbook(wbPath)
-
-        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
-        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
-        self.savefile = "OutfittingDetail_" + savedates + '_' + savebusiness + ".xlsx"
-        self.path = os.path.join(save_path, self.savefile)
-
-        trip_style = NamedStyle('trip_style')
-        thin = Side(border_style='thin', color='000000')
-        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-#        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
-        wb.add_named_style(trip_style)
-
-        int_style = NamedStyle('int_style', number_format='0')
-        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        int_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(int_style)
-
-        coord_style = NamedStyle('coord_style', number_format='###.##0')
-        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        coord_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(coord_style)
-
-        float_style = NamedStyle('float_style', number_format='0.000')
-        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        float_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(float_style)
-
-        str_style = NamedStyle('str_style')
-        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        str_style.alignment = Alignment(horizontal='left', wrapText = True)
-        wb.add_named_style(str_style)
-
-        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
-        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        datetime_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(datetime_style)
-
-        currancy_style = NamedStyle('curr_style', number_format=('#,##0.00'))
-        currancy_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        currancy_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(currancy_style)
-        
-        
-        self.styles = ['datetime_style', 'int_style', 'str_style',
-                       'str_style', 'datetime_style', 'str_style']
-
-        ws = wb.active
-        ws['C2'] = certification
-        header1 = 'Business/Organization: {}\nOperating Season: {}'.format(business_name,  enddate.strftime('%Y'))
-        
-        header2 = 'Outfitting Actual Use Report \n{} National Forest'.format(forestName) 
-        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
-        ws.firstHeader.left.text = header1
-        ws.firstFooter.left.text = footer
-        ws.firstHeader.right.text = header2
-        ws.oddHeader.left.text = header1
-        ws.evenHeader.left.text = header1
-        ws.oddFooter.left.text = footer
-        ws.evenFooter.left.text = footer
-        ws.oddHeader.right.text = header2
-        ws.evenHeader.right.text = header2
-        wb.save(self.path)
-        
-    @contextmanager
-    def __worksheet(self):
-    
-        wb = load_workbook(self.path)
-        ws = wb.active
+            # business names changed, so any tables the reports have cached are stale
+            invalidate()
+
+    def _update_all(self, edit, workspace, tables, field, renames, sql):
+        """Renames the businesses in every table in one edit session and operation. Tables that
+        aren't versioned are updated in the database with one UPDATE ... CASE per 1000 names,
+        in a transaction that is checked before the edits are saved and only committed once
+        they have been. If any table fails, or the edits can't be saved, nothing is kept. Gives
+        back the records updated per table and the tables updated in the database."""
+        versioned = [tbl for tbl in tables if arcpy.Describe(os.path.join(workspace, tbl)).isVersioned]
+        direct = [tbl for tbl in tables if tbl not in versioned]
+        counts = OrderedDict()
+        sqlConn = None
+
+        def quote(value):
+            return "'{}'".format(str(value).replace("'", "''"))
+
+        edit.startEditing(False, True)
+        edit.startOperation()
+        operation_open = True
         try:
-            yield ws
-        finally:
-            wb.save(self.path)
-    
-    def save_trips(self, trips):
-    
-        with self.__worksheet() as ws:
-            for trip in trips.keys():
-                self._add_trip(ws, **trips[trip])
-                
-    def _add_trip(self, ws, tripDate, activities):
-
-        # Skip to next page if trip records span page.
-        current_page_line = (self.row - 27) % 29 if self.row > 27 else self.row
-        current_page_line = 29 if not current_page_line else current_page_line
-        trip_end_line = current_page_line + len(activities)
-        if (self.row <= 27) and (trip_end_line > 27):
-            self.row += 28 - current_page_line
-        elif trip_end_line > 29:
-            self.row += 30 - current_page_line
-
-        for col in range(1, 6):
-            cell = ws.cell(row=self.row, column=col)
-            cell.style = 'trip_style'
-
-
-#        self.row += 1
-        self._add_activities(ws, activities)
+            for tbl in versioned:
+                arcpy.AddMessage("Updating {}".format(tbl))
+                cnt = 0
+                with arcpy.da.UpdateCursor(os.path.join(workspace, tbl), field, sql) as uCur:
+                    for row in uCur:
+                        if row[0] in renames:
+                            row[0] = renames[row[0]]
+                            uCur.updateRow(row)
+                            cnt += 1
+                counts[tbl] = cnt
+            if direct:
+                sqlConn = arcpy.ArcSDESQLExecute(workspace)
+                sqlConn.startTransaction()
+                names = list(renames)
+                for tbl in direct:
+                    arcpy.AddMessage("Updating {} in the database".format(tbl))
+                    counts[tbl] = int(sqlConn.execute("SELECT COUNT(*) FROM {} WHERE {}".format(tbl, sql)))
+                    for i in range(0, len(names), IN_LIST_SIZE):
+                        chunk = names[i:i + IN_LIST_SIZE]
+                        cases = " ".join("WHEN {} THEN {}".format(quote(name), quote(renames[name])) for name in chunk)
+                        if not sqlConn.execute("UPDATE {} SET {} = CASE {} {} END WHERE {}".format(
+                                tbl, field, field, cases, next(in_clauses(field, chunk)))):
+                            raise RuntimeError("The update of {} failed in the database".format(tbl))
+                # the old names that aren't also a new name must be gone before the edits are saved
+                gone = [name for name in names if name not in set(renames.values())]
+                for tbl in direct:
+                    left = sum(int(sqlConn.execute("SELECT COUNT(*) FROM {} WHERE {}".format(tbl, clause)))
+                               for clause in in_clauses(field, gone))
+                    if left:
+                        raise RuntimeError("{} still has {} records under the old names".format(tbl, left))
+            edit.stopOperation()
+            operation_open = False
+            edit.stopEditing(True)
+        except Exception:
+            if sqlConn:
+                sqlConn.rollbackTransaction()
+            if edit.isEditing:
+                if operation_open:
+                    edit.abortOperation()
+                edit.stopEditing(False)
+            arcpy.AddWarning("Business name updates were rolled back in every table")
+            raise
+        if sqlConn:
+            try:
+                sqlConn.commitTransaction()
+            except Exception:
+                arcpy.AddError("The edits to {} were saved but the database updates to {} couldn't be committed".format(
+                    ', '.join(versioned), ', '.join(direct)))
+                raise
+        return counts, direct
 
-    def _add_activities(self, worksheet, activity_records):
 
-        for record in activity_records:
-            for col, value in enumerate(record, 1):
-                cell = worksheet.cell(row=self.row, column=col)
-                cell.value = value
-                cell.style = self.styles[col-1]
-            self.row += 1
-            
 class OutfittingReport(object):
     def __init__(self):
         """Define the tool (tool name is the name of the class)."""
         self.label = "Run Outfitting Detail Report"
         self.description = ""
         self.canRunInBackground = False
-        
-        
-    def getParameterInfo(self):
-        # Define parameter definitions
 
         connection = r'{'ExamplePath'}'
         tables = ['OUTFITTING_ACTIVITY']
         self.tables = [connection + table for table in tables]
+        self.connection = connection
+        
+        
+    def getParameterInfo(self):
+        # Define parameter definitions
 
-        sc = arcpy.da.SearchCursor(self.tables[0], "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        self.business_names = [row[0] for row in sc]
         self.parameters = self.getParameterInfo()
 
         param0 = arcpy.Parameter(
@@ -726,10 +646,12 @@ class OutfittingReport(object):
             name="business",
             datatype="GPString",
             parameterType="Required",
-            direction="Input")
+            direction="Input",
+            multiValue=True)
 
         param0.filter.type = "ValueList"
-        param0.filter.list = self.business_names
+        # filled in by updateParameters
+        param0.filter.list = []
 
         param1  = arcpy.Parameter(
             displayName="that end between",
@@ -757,7 +679,16 @@ class OutfittingReport(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        param4 = arcpy.Parameter(
+            displayName="Reports to build at the same time",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input")
+
+        param4.value = REPORT_WORKERS
+
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
 
         return params
 
@@ -767,211 +698,102 @@ class OutfittingReport(object):
         return True
 
 
+    def updateParameters(self, parameters):
+        fill_names(parameters[0], name_tables(self.connection, ['OUTFITTING']))
+        return
+
     def updateMessages(self, parameters):
         """Modify the messages created by internal validation for each tool
         parameter.  This method is called after internal validation."""
         return
 
     def execute(self, parameters, messages):
-        
-        businessname = parameters[0].value
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
+
+        businessnames = parameters[0].values
         startdate = parameters[1].value
         enddate = parameters[2].value
         savepath = parameters[3].value.value
+        workers = parameters[4].value or 1
+
+        """Reads the trips of every business picked at once, then splits them up by business"""
+        businesses = OrderedDict((name, {'reporter': None, 'certification': None, 'forestName': None, 'trips': OrderedDict()})
+                                 for name in businessnames)
+        dates = "OUTFITTING_ACTIVITY.TRIPDATE >= date '{}' AND OUTFITTING_ACTIVITY.TRIPDATE <= date '{}'".format(startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
+        fields = ['TRIP_GUID', 'BUSINESSNAME', 'TRIPDATE', 'REPORTERNAME', 'CERTIFICATION', 'FORESTNAME',
+                  'TOTALCLIENTSONDAY', 'USELOCATION', 'ACTIVITY', 'CREATIONDATE']
+        activityRows = _records(read_where_in(self.tables[-1], 'BUSINESSNAME', businessnames, fields, where=dates))
+
+        tripRecords = {}
+        for row in activityRows:
+            if row['BUSINESSNAME'] not in businesses:
+                continue
+            business = businesses[row['BUSINESSNAME']]
+            business['reporter'] = business['reporter'] or row['REPORTERNAME']
+            business['certification'] = business['certification'] or row['CERTIFICATION']
+            business['forestName'] = business['forestName'] or row['FORESTNAME']
+            business['trips'][row['TRIP_GUID']] = {'tripDate' : row['TRIPDATE'],
+                                                   'activities': []}
+            tripRecords[row['TRIP_GUID']] = business['trips'][row['TRIP_GUID']]
     
-        arcpy.MakeQueryTable_management(self.tables, 'QueryTable', 'NO_KEY_FIELD')
-
-            
-    
-        trips = OrderedDict()
-        reporter = None
-        certification = None
-        forestName = None
-        query1 = "OUTFITTING_ACTIVITY.BUSINESSNAME = '{}' AND OUTFITTING_ACTIVITY.TRIPDATE >= date '{}' AND OUTFITTING_ACTIVITY.TRIPDATE <= date '{}'".format(businessname, startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
-
+        for business in businesses.values():
+            business['trips'] = OrderedDict(sorted(business['trips'].items(), key=lambda x:(x[1]['tripDate'])))
     
-        with arcpy.da.SearchCursor(self.tables[-1], '*', query1) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                row = dict(zip(fields, row))
-                reporter = reporter or row['REPORTERNAME']
-                certification = certification or row['CERTIFICATION']
-                forestName = forestName or row['FORESTNAME']
-                trips[row['TRIP_GUID']] = {'tripDate' : row['TRIPDATE'],
-                                                  'activities': []}
-                     
-    
-        trips = OrderedDict(sorted(trips.items(), key=lambda x:(x[1]['tripDate'])))
-    
-        if trips: 
-            arcpy.AddMessage("Processing {} trip records...".format(len(trips)))
+        if tripRecords: 
+            arcpy.AddMessage("Processing {} trip records...".format(len(tripRecords)))
         else:
             arcpy.AddWarning("No trips to report in date range.")
             return
     
-        query2 = "OUTFITTING_ACTIVITY.BUSINESSNAME = '{}' AND OUTFITTING_ACTIVITY.TRIPDATE >= date '{}' AND OUTFITTING_ACTIVITY.TRIPDATE <= date '{}'".format(businessname, startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
         use_reports = 0
-        with arcpy.da.SearchCursor("QueryTable", '*', query2) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                use_reports += 1
-                row = dict(zip(fields, row))
-                record = [row['TRIPDATE'],
-                          row['TOTALCLIENTSONDAY'],
-                          row['USELOCATION'],
-                          row['ACTIVITY'],
-                          row['CREATIONDATE'],
-                          row['REPORTERNAME']]
-                if row['TRIP_GUID'] in trips.keys():
-                    trips[row['TRIP_GUID']]['activities'].append(record)
+        for row in activityRows:
+            use_reports += 1
+            record = [row['TRIPDATE'],
+                      row['TOTALCLIENTSONDAY'],
+                      row['USELOCATION'],
+                      row['ACTIVITY'],
+                      row['CREATIONDATE'],
+                      row['REPORTERNAME']]
+            if row['TRIP_GUID'] in tripRecords:
+                tripRecords[row['TRIP_GUID']]['activities'].append(record)
     
-        for trip in trips.keys():
+        for trip in tripRecords.keys():
             try:
-                trips[trip]['activities'] = sorted(trips[trip]['activities'], key=lambda x:x[0])
+                tripRecords[trip]['activities'] = sorted(tripRecords[trip]['activities'], key=lambda x:x[0])
             except Exception as e:
                 arcpy.AddError("ERROR: {}\nOUTFITTING_GUID {}: {}\nACTIVITY DATA: {}")
                 raise e
     
         arcpy.AddMessage("Processing {} use report records.".format(use_reports))
     
-        report = OutfittingDetail(businessname, startdate, enddate,
-                                     reporter, certification, forestName, savepath)
-    
-        arcpy.AddMessage('Saving {}...'.format(report.savefile))
-        report.save_trips(trips)
-        
-
-class MendenhallDetail:
-
-    def __init__(self, business_name, startdate, enddate, reporter, certification, save_path):
-
-        self.row = 4
-        wbPath = r'{'ExamplePath'}\Reports\mendenhall_detail_template.xlsx'
-        wb = load_workbook(wbPath)
-
-        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
-        savedates = str(int(startdate)) + "_" + str(int(enddate))
-        self.savefile = "MendenhallDetail_" + savedates + '_' + savebusiness + ".xlsx"
-        self.path = os.path.join(save_path, self.savefile)
-
-        trip_style = NamedStyle('trip_style')
-        thin = Side(border_style='thin', color='000000')
-        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
-        wb.add_named_style(trip_style)
-
-        int_style = NamedStyle('int_style', number_format='0')
-        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        int_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(int_style)
-
-        coord_style = NamedStyle('coord_style', number_format='###.##0')
-        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        coord_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(coord_style)
-
-        float_style = NamedStyle('float_style', number_format='0.000')
-        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        float_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(float_style)
-
-        str_style = NamedStyle('str_style')
-        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        str_style.alignment = Alignment(horizontal='left', wrapText = True)
-        wb.add_named_style(str_style)
-
-        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
-        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        datetime_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(datetime_style)
-
-        self.styles = ['str_style', 'int_style',
-                       'int_style', 'int_style', 'str_style', 'datetime_style', 'str_style']
-
-        ws = wb.active
-        ws['C2'] = certification
-        header = 'Business/Organization: {}\nOperating Season: {} - {}'.format(business_name, int(startdate),
-                                                                                                   int(enddate))
-        footer = 'Report Generated: {}\n*None is not zero. It means that no data was collected.'.format(datetime.today().strftime('%m/%d/%Y'))
-        ws.firstHeader.left.text = header
-        ws.firstFooter.left.text = footer
-        ws.oddHeader.left.text = header
-        ws.evenHeader.left.text = header
-        ws.oddFooter.left.text = footer
-        ws.evenFooter.left.text = footer
-        wb.save(self.path)
-
-    @contextmanager
-    def __worksheet(self):
-
-        wb = load_workbook(self.path)
-        ws = wb.active
-        try:
-            yield ws
-        finally:
-            wb.save(self.path)
-
-    def save_trips(self, trips):
-
-        with self.__worksheet() as ws:
-            for trip_guid in trips.keys():
-                self._add_trip(ws, **trips[trip_guid])
-
-    def _add_trip(self, ws, reportMonth, tripMonth, clientMonth, sum16up, sum15down, activities):
-
-        # Skip to next page if trip records span page.
-        current_page_line = (self.row - 27) % 29 if self.row > 27 else self.row
-        current_page_line = 29 if not current_page_line else current_page_line
-        trip_end_line = current_page_line + len(activities)
-        if (self.row <= 27) and (trip_end_line > 27):
-            self.row += 28 - current_page_line
-        elif trip_end_line > 29:
-            self.row += 30 - current_page_line
-
-        for col in range(1, 7):
-            cell = ws.cell(row=self.row, column=col)
-            cell.style = 'trip_style'
-
-        ws.merge_cells('B{}:C{}'.format(self.row, self.row))
-        ws.merge_cells('F{}:G{}'.format(self.row, self.row))
-
-        
-        ws['A{}'.format(self.row)] = "Month: {}".format(reportMonth)
-        ws['B{}'.format(self.row)] = 'Trips Per Month: {}'.format(tripMonth)
-        ws['D{}'.format(self.row)] = 'Clients: {}'.format(clientMonth)
-        ws['E{}'.format(self.row)] = 'Clients > 16: {}'.format(sum16up)
-        ws['F{}'.format(self.row)] = 'Clients < 15: {}'.format(sum15down)
-        self.row += 1
-        self._add_activities(ws, activities)
-
-    def _add_activities(self, worksheet, activity_records):
+        reports = [(businessname, (businessname, startdate, enddate, business['reporter'], business['certification'],
+                                   business['forestName'], savepath), business['trips'])
+                   for businessname, business in businesses.items()]
+        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
+        save_reports(OutfittingDetail, reports, os.path.join(savepath, "OutfittingDetail_" + savedates + "_manifest.csv"), workers)
 
-        for record in activity_records:
-            for col, value in enumerate(record, 1):
-                cell = worksheet.cell(row=self.row, column=col)
-                cell.value = value
-                cell.style = self.styles[col-1]
-            self.row += 1
-            
 
 class MendenhallReport(object):
     def __init__(self):
         self.label = "Run Mendenhall Detail Report"
         self.canRunInBackground = False
 
+        connection = r'{'ExamplePath'}'
+        tables = ['MENDENHALL_ACTIVITY',
+                  'MENDENHALL_TRIPMONTH']
+        self.tables = [connection + table for table in tables]
+        self.connection = connection
+
 
 
 
     def getParameterInfo(self):
         # Define parameter definitions
         
-        connection = r'{'ExamplePath'}'
-        tables = ['MENDENHALL_ACTIVITY',
-                  'MENDENHALL_TRIPMONTH']
-        self.tables = [connection + table for table in tables]
-
-        sc = arcpy.da.SearchCursor(self.tables[1], "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        self.business_names = [row[0] for row in sc]
         self.parameters = self.getParameterInfo()
 
         self.whereClause = "MENDENHALL_TRIPMONTH.TRIP_GUID ="\
@@ -982,10 +804,12 @@ class MendenhallReport(object):
             name="business",
             datatype="GPString",
             parameterType="Required",
-            direction="Input")
+            direction="Input",
+            multiValue=True)
 
         param0.filter.type = "ValueList"
-        param0.filter.list = self.business_names
+        # filled in by updateParameters
+        param0.filter.list = []
 
         param1  = arcpy.Parameter(
             displayName="that end between",
@@ -1015,7 +839,16 @@ class MendenhallReport(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        param4 = arcpy.Parameter(
+            displayName="Reports to build at the same time",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input")
+
+        param4.value = REPORT_WORKERS
+
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
 
         return params
 
@@ -1023,224 +856,111 @@ class MendenhallReport(object):
         return True
 
     def updateParameters(self, parameters):  # optional
+        fill_names(parameters[0], name_tables(self.connection, ['MENDENHALL']))
         return
 
     def updateMessages(self, parameters):  # optional
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
 
-        businessname = parameters[0].value
+    def _execute(self, parameters, messages):
+
+        businessnames = parameters[0].values
         startdate = parameters[1].value
         enddate = parameters[2].value
         savepath = parameters[3].value.value
-
-        arcpy.MakeQueryTable_management(self.tables, 'QueryTable', 'NO_KEY_FIELD', '', '', self.whereClause)
-
-        trips = OrderedDict()
-        reporter = None
-        certification = None
-        query1 = "MENDENHALL_TRIPMONTH.BUSINESSNAME = '{}' AND MENDENHALL_TRIPMONTH.REPORTYEAR >= '{}' AND MENDENHALL_TRIPMONTH.REPORTYEAR <= '{}'".format(businessname, startdate, enddate)
-
-        with arcpy.da.SearchCursor(self.tables[-1], '*', query1) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                row = dict(zip(fields, row))
-                reporter = reporter or row['REPORTERNAME']
-                certification = certification or row['CERTIFICATION']
-                trips[row['TRIP_GUID']] = {'reportMonth' : row['REPORTMONTH'],
-                                            'tripMonth' : row['TRIPSPERMONTH'],
-                                            'clientMonth' : row['CLIENTMONTH'],
-                                            'sum16up' : row['SUMCLIENT16UP'],
-                                            'sum15down' : row['SUMCLIENT15BELOW'],
-                                            'activities': []}
+        workers = parameters[4].value or 1
+
+        """Reads the trips of every business picked at once, then splits them up by business"""
+        businesses = OrderedDict((name, {'reporter': None, 'certification': None, 'trips': OrderedDict()}) for name in businessnames)
+        years = "MENDENHALL_TRIPMONTH.REPORTYEAR >= '{}' AND MENDENHALL_TRIPMONTH.REPORTYEAR <= '{}'".format(startdate, enddate)
+        # every trip field, the query table used to carry them all onto the activity rows
+        tripTable = read_where_in(self.tables[-1], 'BUSINESSNAME', businessnames, where=years)
+
+        tripRecords = {}
+        for row in _records(tripTable):
+            if row['BUSINESSNAME'] not in businesses:
+                continue
+            business = businesses[row['BUSINESSNAME']]
+            business['reporter'] = business['reporter'] or row['REPORTERNAME']
+            business['certification'] = business['certification'] or row['CERTIFICATION']
+            business['trips'][row['TRIP_GUID']] = {'reportMonth' : row['REPORTMONTH'],
+                                                   'tripMonth' : row['TRIPSPERMONTH'],
+                                                   'clientMonth' : row['CLIENTMONTH'],
+                                                   'sum16up' : row['SUMCLIENT16UP'],
+                                                   'sum15down' : row['SUMCLIENT15BELOW'],
+                                                   'activities': []}
+            tripRecords[row['TRIP_GUID']] = business['trips'][row['TRIP_GUID']]
 
         monthDict = {'January': 1, 'February':2, 'March':3, 'April':4, 'May':5, 'June':6, 'July':7, 'August':8, 'September':9, 'October':10, 'November':11, 'December':12}
         
-        
-        ordered_records = OrderedDict()
-        for key in sorted(trips, key=lambda x: monthDict[trips[x]['reportMonth']]):
-            ordered_records[key] = trips[key]
-        
-        trips = ordered_records
+        for business in businesses.values():
+            trips = business['trips']
+            business['trips'] = OrderedDict((key, trips[key]) for key in sorted(trips, key=lambda x: monthDict[trips[x]['reportMonth']]))
 
 
-        if trips:
-            arcpy.AddMessage("Processing {} trip records...".format(len(trips)))
+        if tripRecords:
+            arcpy.AddMessage("Processing {} trip records...".format(len(tripRecords)))
         else:
             arcpy.AddWarning("No trips to report in date range.")
             return
 
-        query2 = "MENDENHALL_TRIPMONTH.BUSINESSNAME = '{}' AND MENDENHALL_TRIPMONTH.REPORTYEAR >= '{}' AND MENDENHALL_TRIPMONTH.REPORTYEAR <= '{}'".format(businessname, startdate, enddate)
         use_reports = 0
-                    
-                    
-        
-        with arcpy.da.SearchCursor("QueryTable", '*', query2) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                use_reports += 1
-                actCol = {}
-                for i, j in zip(row, fields):
-                    actCol.setdefault(i, []).append(j)
-                actCol = ','.join(actCol[1]) if 1 in actCol else ''
-                
-                row = dict(zip(fields, row)) 
-                record = [row['USELOCATION'],
-                          row['CLIENTSLOCATION'],
-                          row['CLIENTS16OLDER'],
-                          row['CLIENTS15YOUNGER'],
-                          actCol,
-                          row['CREATIONDATE'],
-                          row['REPORTERNAME']]
-                if row['TRIP_GUID'] in trips.keys():
-                    trips[row['TRIP_GUID']]['activities'].append(record)
-
-        for trip in trips.keys():
+        for pairs in _joined_rows(self.tables[0], tripTable):
+            use_reports += 1
+            actCol = {}
+            for j, i in pairs:
+                actCol.setdefault(i, []).append(j)
+            actCol = ','.join(actCol[1]) if 1 in actCol else ''
+
+            row = dict(pairs)
+            record = [row['USELOCATION'],
+                      row['CLIENTSLOCATION'],
+                      row['CLIENTS16OLDER'],
+                      row['CLIENTS15YOUNGER'],
+                      actCol,
+                      row['CREATIONDATE'],
+                      row['REPORTERNAME']]
+            if row['TRIP_GUID'] in tripRecords:
+                tripRecords[row['TRIP_GUID']]['activities'].append(record)
+
+        for trip in tripRecords.keys():
             try:
-                trips[trip]['activities'] = sorted(trips[trip]['activities'], key=lambda x:x[0])
+                tripRecords[trip]['activities'] = sorted(tripRecords[trip]['activities'], key=lambda x:x[0])
             except Exception as e:
-                arcpy.AddError("ERROR: {}\nTRIPID {}: {}\nACTIVITY DATA: {}".format(e, trips[trip], trips[trip]['activities']))
+                arcpy.AddError("ERROR: {}\nTRIPID {}: {}\nACTIVITY DATA: {}".format(e, tripRecords[trip], tripRecords[trip]['activities']))
                 raise e
 
         arcpy.AddMessage("Processing {} use report records.".format(use_reports))
 
-        report = MendenhallDetail(businessname, startdate, enddate,
-                                 reporter, certification, savepath)
-
-        arcpy.AddMessage('Saving {}...'.format(report.savefile))
-        report.save_trips(trips)
-        
-class IcefieldDetail:
-
-    def __init__(self, business_name, startdate, enddate, reporter, certification, forestName, save_path):
-
-        self.row = 4
-        wbPath = r'{'ExamplePath'}\Reports\icefields_detail_template.xlsx'
-        wb = load_workbook(wbPath)
-
-        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
+        reports = [(businessname, (businessname, startdate, enddate, business['reporter'], business['certification'], savepath),
+                    business['trips'])
+                   for businessname, business in businesses.items()]
         savedates = str(int(startdate)) + "_" + str(int(enddate))
-        self.savefile = "Icefields_" + savedates + '_' + savebusiness + ".xlsx"
-        self.path = os.path.join(save_path, self.savefile)
+        save_reports(MendenhallDetail, reports, os.path.join(savepath, "MendenhallDetail_" + savedates + "_manifest.csv"), workers)
+
 
-        trip_style = NamedStyle('trip_style')
-        thin = Side(border_style='thin', color='000000')
-        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
-        wb.add_named_style(trip_style)
-
-        int_style = NamedStyle('int_style', number_format='0')
-        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        int_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(int_style)
-
-        coord_style = NamedStyle('coord_style', number_format='###.##0')
-        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        coord_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(coord_style)
-
-        float_style = NamedStyle('float_style', number_format='0.000')
-        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        float_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(float_style)
-
-        str_style = NamedStyle('str_style')
-        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        str_style.alignment = Alignment(horizontal='left', wrapText = True)
-        wb.add_named_style(str_style)
-
-        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
-        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        datetime_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(datetime_style)
-
-        self.styles = ['str_style', 'int_style', 'int_style', 'int_style', 'int_style', 'int_style', 'int_style', 'datetime_style', 'str_style']
-
-        ws = wb.active
-        ws['C2'] = certification
-        header1 = 'Business/Organization: {}\nOperating Season: {}-{}'.format(business_name, int(startdate),
-                                                                                                   int(enddate))
-        header2 = 'Icefields Actual Use Report \n{} National Forest'.format(forestName)
-        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
-        ws.firstHeader.left.text = header1
-        ws.firstFooter.left.text = footer
-        ws.oddHeader.left.text = header1
-        ws.evenHeader.left.text = header1
-        ws.oddFooter.left.text = footer
-        ws.evenFooter.left.text = footer
-        ws.firstHeader.right.text = header2
-        ws.oddHeader.right.text = header2
-        ws.evenHeader.right.text = header2
-        wb.save(self.path)
-
-    @contextmanager
-    def __worksheet(self):
-
-        wb = load_workbook(self.path)
-        ws = wb.active
-        try:
-            yield ws
-        finally:
-            wb.save(self.path)
-
-    def save_trips(self, trips):
-
-        with self.__worksheet() as ws:
-            for trip_guid in trips.keys():
-                self._add_trip(ws, **trips[trip_guid])
-
-    def _add_trip(self, ws, reportMonth, landMonth, clientMonth, activities):
-
-        # Skip to next page if trip records span page.
-        current_page_line = (self.row - 27) % 29 if self.row > 27 else self.row
-        current_page_line = 29 if not current_page_line else current_page_line
-        trip_end_line = current_page_line + len(activities)
-        if (self.row <= 27) and (trip_end_line > 27):
-            self.row += 28 - current_page_line
-        elif trip_end_line > 29:
-            self.row += 30 - current_page_line
-
-        for col in range(1, 9):
-            cell = ws.cell(row=self.row, column=col)
-            cell.style = 'trip_style'
-
-        ws.merge_cells('A{}:C{}'.format(self.row, self.row))
-        ws.merge_cells('D{}:E{}'.format(self.row, self.row))
-        ws.merge_cells('F{}:I{}'.format(self.row, self.row))
-        ws['A{}'.format(self.row)] = "Month: {}".format(reportMonth)
-        ws['D{}'.format(self.row)] = 'Landings: {}'.format(landMonth)
-        ws['F{}'.format(self.row)] = 'Clients: {}'.format(clientMonth)
-        self.row += 1
-        self._add_activities(ws, activities)
-
-    def _add_activities(self, worksheet, activity_records):
-
-        for record in activity_records:
-            for col, value in enumerate(record, 1):
-                cell = worksheet.cell(row=self.row, column=col)
-                cell.value = value
-                cell.style = self.styles[col-1]
-            self.row += 1
-            
 class IcefieldReport(object):
     def __init__(self):
         self.label = "Run Icefields Detail Report"
         self.canRunInBackground = False
 
+        connection = r'{'ExamplePath'}'
+        tables = ['ICEFIELD_ACTIVITY',
+                  'ICEFIELD_TRIPMONTH']
+        self.tables = [connection + table for table in tables]
+        self.connection = connection
+
 
 
 
     def getParameterInfo(self):
         # Define parameter definitions
         
-        connection = r'{'ExamplePath'}'
-        tables = ['ICEFIELD_ACTIVITY',
-                  'ICEFIELD_TRIPMONTH']
-        self.tables = [connection + table for table in tables]
-
-        sc = arcpy.da.SearchCursor(self.tables[0], "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        self.business_names = [row[0] for row in sc]
         self.parameters = self.getParameterInfo()
 
         self.whereClause = "ICEFIELD_TRIPMONTH.TRIP_GUID ="\
@@ -1251,10 +971,12 @@ class IcefieldReport(object):
             name="business",
             datatype="GPString",
             parameterType="Required",
-            direction="Input")
+            direction="Input",
+            multiValue=True)
 
         param0.filter.type = "ValueList"
-        param0.filter.list = self.business_names
+        # filled in by updateParameters
+        param0.filter.list = []
 
         param1  = arcpy.Parameter(
             displayName="that end between",
@@ -1284,7 +1006,16 @@ class IcefieldReport(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        param4 = arcpy.Parameter(
+            displayName="Reports to build at the same time",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input")
+
+        param4.value = REPORT_WORKERS
+
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
 
         return params
 
@@ -1292,86 +1023,88 @@ class IcefieldReport(object):
         return True
 
     def updateParameters(self, parameters):  # optional
+        fill_names(parameters[0], name_tables(self.connection, ['ICEFIELD']))
         return
 
     def updateMessages(self, parameters):  # optional
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
 
-        businessname = parameters[0].value
+    def _execute(self, parameters, messages):
+
+        businessnames = parameters[0].values
         startdate = parameters[1].value
         enddate = parameters[2].value
         savepath = parameters[3].value.value
+        workers = parameters[4].value or 1
 
-        arcpy.MakeQueryTable_management(self.tables, 'QueryTable', 'NO_KEY_FIELD', '', '', self.whereClause)
-
-        trips = OrderedDict()
-        reporter = None
-        certification = None
+        """Reads the trips of every business picked at once, then splits them up by business"""
+        businesses = OrderedDict((name, {'reporter': None, 'certification': None, 'trips': OrderedDict()}) for name in businessnames)
         forestName = 'Tongass'
-        query1 = "ICEFIELD_TRIPMONTH.BUSINESSNAME = '{}' AND ICEFIELD_TRIPMONTH.REPORTYEAR >= '{}' AND ICEFIELD_TRIPMONTH.REPORTYEAR <= '{}'".format(businessname, startdate, enddate)
-
-        with arcpy.da.SearchCursor(self.tables[-1], '*', query1) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                row = dict(zip(fields, row))
-                reporter = reporter or row['REPORTERNAME']
-                certification = certification or row['CERTIFICATION']
-                trips[row['TRIP_GUID']] = {'reportMonth' : row['REPORTMONTH'],
-                                            'landMonth' : row['LDNGMONTH'],
-                                            'clientMonth' : row['CLIENTMONTH'],
-                                            'activities': []}
+        years = "ICEFIELD_TRIPMONTH.REPORTYEAR >= '{}' AND ICEFIELD_TRIPMONTH.REPORTYEAR <= '{}'".format(startdate, enddate)
+        # every trip field, the query table used to carry them all onto the activity rows
+        tripTable = read_where_in(self.tables[-1], 'BUSINESSNAME', businessnames, where=years)
+
+        tripRecords = {}
+        for row in _records(tripTable):
+            if row['BUSINESSNAME'] not in businesses:
+                continue
+            business = businesses[row['BUSINESSNAME']]
+            business['reporter'] = business['reporter'] or row['REPORTERNAME']
+            business['certification'] = business['certification'] or row['CERTIFICATION']
+            business['trips'][row['TRIP_GUID']] = {'reportMonth' : row['REPORTMONTH'],
+                                                   'landMonth' : row['LDNGMONTH'],
+                                                   'clientMonth' : row['CLIENTMONTH'],
+                                                   'activities': []}
+            tripRecords[row['TRIP_GUID']] = business['trips'][row['TRIP_GUID']]
                 
         monthDict = {'January': 1, 'February':2, 'March':3, 'April':4, 'May':5, 'June':6, 'July':7, 'August':8, 'September':9, 'October':10, 'November':11, 'December':12}
         
-        
-        ordered_records = OrderedDict()
-        for key in sorted(trips, key=lambda x: monthDict[trips[x]['reportMonth']]):
-            ordered_records[key] = trips[key]
-        
-        trips = ordered_records                
+        for business in businesses.values():
+            trips = business['trips']
+            business['trips'] = OrderedDict((key, trips[key]) for key in sorted(trips, key=lambda x: monthDict[trips[x]['reportMonth']]))
 
 
-        if trips:
-            arcpy.AddMessage("Processing {} trip records...".format(len(trips)))
+        if tripRecords:
+            arcpy.AddMessage("Processing {} trip records...".format(len(tripRecords)))
         else:
             arcpy.AddWarning("No trips to report in date range.")
             return
 
-        query2 = "ICEFIELD_TRIPMONTH.BUSINESSNAME = '{}' AND ICEFIELD_TRIPMONTH.REPORTYEAR >= '{}' AND ICEFIELD_TRIPMONTH.REPORTYEAR <= '{}'".format(businessname, startdate, enddate)
         use_reports = 0
-        with arcpy.da.SearchCursor("QueryTable", '*', query2) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                use_reports += 1
-                row = dict(zip(fields, row))
-                record = [row['USELOCATION'],
-                          row['LDNGOPS'],
-                          row['LDNGGRATUITY'],
-                          row['LDNGPAIDCLIENTS'],
-                          row['CLIENTSGLACTREK'],
-                          row['CLIENTSDOGSLED'],
-                          row['CLIENTSHIKE'],
-                          row['CREATIONDATE'], 
-                          row['REPORTERNAME']]
-                if row['TRIP_GUID'] in trips.keys():
-                    trips[row['TRIP_GUID']]['activities'].append(record)
-
-        for trip in trips.keys():
+        for pairs in _joined_rows(self.tables[0], tripTable):
+            use_reports += 1
+            row = dict(pairs)
+            record = [row['USELOCATION'],
+                      row['LDNGOPS'],
+                      row['LDNGGRATUITY'],
+                      row['LDNGPAIDCLIENTS'],
+                      row['CLIENTSGLACTREK'],
+                      row['CLIENTSDOGSLED'],
+                      row['CLIENTSHIKE'],
+                      row['CREATIONDATE'], 
+                      row['REPORTERNAME']]
+            if row['TRIP_GUID'] in tripRecords:
+                tripRecords[row['TRIP_GUID']]['activities'].append(record)
+
+        for trip in tripRecords.keys():
             try:
-                trips[trip]['activities'] = sorted(trips[trip]['activities'], key=lambda x:x[0])
+                tripRecords[trip]['activities'] = sorted(tripRecords[trip]['activities'], key=lambda x:x[0])
             except Exception as e:
-                arcpy.AddError("ERROR: {}\nTRIPID {}: {}\nACTIVITY DATA: {}".format(e, trips[trip], trips[trip]['activities']))
+                arcpy.AddError("ERROR: {}\nTRIPID {}: {}\nACTIVITY DATA: {}".format(e, tripRecords[trip], tripRecords[trip]['activities']))
                 raise e
 
         arcpy.AddMessage("Processing {} use report records.".format(use_reports))
 
-        report = IcefieldDetail(businessname, startdate, enddate,
-                                 reporter, certification, forestName, savepath)
-
-        arcpy.AddMessage('Saving {}...'.format(report.savefile))
-        report.save_trips(trips)
+        reports = [(businessname, (businessname, startdate, enddate, business['reporter'], business['certification'],
+                                   forestName, savepath), business['trips'])
+                   for businessname, business in businesses.items()]
+        savedates = str(int(startdate)) + "_" + str(int(enddate))
+        save_reports(IcefieldDetail, reports, os.path.join(savepath, "Icefields_" + savedates + "_manifest.csv"), workers)
         
         
 class IcefieldSummary(object):
@@ -1392,11 +1125,16 @@ class IcefieldSummary(object):
             direction="Input")
         param0.filter.list = ["File System"]
 
-        params = [param0]
+        params = [param0, snapshot_parameter()]
 
         return params
     
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
         savepath = parameters[0].value.value        
         savedates = str(datetime.today().strftime('%m%d%Y'))
         savefile = "IcefieldsSummary_" + savedates +".xlsx"
@@ -1405,35 +1143,9 @@ class IcefieldSummary(object):
         endYear = str(datetime.today().year)
 
         connection = r'{'ExamplePath'}'
-        actTable = '{}ICEFIELD_ACTIVITY'.format(connection)
-        tripTable = '{}ICEFIELD_TRIPMONTH'.format(connection)
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames 
-        
-        query = "REPORTYEAR >= '{}' AND REPORTYEAR <= '{}'".format(startYear, endYear)
-        tripFields = getFieldNames(tripTable)
-        dataTrip = [row for row in arcpy.da.SearchCursor(tripTable, tripFields, where_clause=query)]
-        tripDF = pd.DataFrame(dataTrip, columns=tripFields)
-        
-        actFields = getFieldNames(actTable)
-        dataAct = [row for row in arcpy.da.SearchCursor(actTable, actFields)]
-        actDF = pd.DataFrame(dataAct, columns=actFields)
-        
-        allDF = actDF.merge(tripDF, how = 'inner', on = 'TRIP_GUID')
-
-        valColumns = [u'CLIENTSGLACTREK', u'CLIENTSDOGSLED', u'CLIENTSHIKE', u'CLIENTSHELITOURSLEGACY']
-        valLandings = [u'LDNGGRATUITY', u'LDNGPAIDCLIENTS']
-        allDF['ClientActTotal'] = allDF[valColumns].sum(axis=1)
-        allDF['LandingActTotal'] = allDF[valLandings].sum(axis=1)
-        
-        allDF.rename(columns={'BUSINESSNAME_x':'BUSINESSNAME'}, inplace=True)
-
-        pvt = pd.pivot_table(allDF, values=('ClientActTotal'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        pvtLand = pd.pivot_table(allDF, values=('LandingActTotal'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        pvtClientAll = pd.pivot_table(allDF, values=('ClientActTotal'), index=[u'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        pvtLandAll = pd.pivot_table(allDF, values=('LandingActTotal'), index=[u'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
+        """The tables, totals and pivots are in report_specs.ICEFIELD_SUMMARY"""
+        pivots = run_spec(ICEFIELD_SUMMARY, connection, {'startYear': startYear, 'endYear': endYear})
          
         """Write Pivot table and apply styles and formating"""
         writer_args = {
@@ -1487,13 +1199,9 @@ class IcefieldSummary(object):
                 for irow in range(min_row, max_row+1):
                 	for jcol in range(min_col, max_col+1):
                 		ws.cell(row =irow, column=jcol, value=None)       
-            for row in ws[value_cells]:
-                for cell in row:
-                    cell.style = value_style            
-            for cell in ws[index_column]:
-                cell.style = index_style                
-            for cell in ws[title_row]:
-                cell.style = title_style
+            style_range(ws, value_cells, value_style)
+            style_range(ws, index_column, index_style)
+            style_range(ws, title_row, title_style)
             header = headerString
             ws.oddHeader.left.text = header
             ws.oddHeader.left.size = 8
@@ -1502,20 +1210,10 @@ class IcefieldSummary(object):
         
         with pd.ExcelWriter(**writer_args) as xlsx:
             """All the variables needed to apply styles"""
-            pvtClientAll.to_excel(xlsx, 'Totals')
-            pvt.to_excel(xlsx, 'Clients')
-            pvtLand.to_excel(xlsx, 'Landings')
-            ws = xlsx.sheets['Clients']
-            wsLand = xlsx.sheets['Landings']
-            wsTotal = xlsx.sheets['Totals']
             date = datetime.today().strftime('%m/%d/%Y')
-            totalHead = 'Juneau/Skagway Icefields Summary Report\nTotal Clients and Landings (Revenue and Gratuity) for last 10 years\nReport Generated: {}'.format(date)
-            landHead = 'Juneau/Skagway Icefields Summary Report\nLandings (Revenue and Gratuity)\nReport Generated: {}'.format(date)
-            clientHead = 'Juneau/Skagway Icefields Summary Report\nClients (Revenue and Gratuity)\nReport Generated: {}'.format(date)
-            
-            excelUpdate(ws, clientHead)
-            excelUpdate(wsLand, landHead)
-            excelUpdate(wsTotal, totalHead)                    
+            for ws, options in write_sheets(xlsx, ICEFIELD_SUMMARY, pivots):
+                excelUpdate(ws, 'Juneau/Skagway Icefields Summary Report\n{}\nReport Generated: {}'.format(options['header'], date))
+            wsTotal = xlsx.sheets['Totals']                    
                             
             """Creates Formatting for Totals Sheet"""
             clientValue = 'B3:O13'
@@ -1533,7 +1231,7 @@ class IcefieldSummary(object):
             cellEnd = wsTotal.cell(row=(rowsTot+3), column=1)
             cellEnd.value = 'Total Landings'
                 
-            pvtLandAll.to_excel(xlsx, 'Totals', startrow=(rowsTot+3), startcol=0)
+            pivots['landingTotals'].to_excel(xlsx, 'Totals', startrow=(rowsTot+3), startcol=0)
             
             clientsTitle = '1'
             landTitle = '15'
@@ -1543,25 +1241,17 @@ class IcefieldSummary(object):
                 wsTotal.column_dimensions[i].width = 12.29
                 value_col += 1    
             
-            for row in wsTotal[clientValue]:
-                for cell in row:
-                    cell.style = value_style
+            style_range(wsTotal, clientValue, value_style)
                     
-            for row in wsTotal[landValue]:
-                for cell in row:
-                    cell.style = value_style
+            style_range(wsTotal, landValue, value_style)
                 
-            for cell in wsTotal[clientIndex]:
-                cell.style = title_style
+            style_range(wsTotal, clientIndex, title_style)
                 
-            for cell in wsTotal[landIndex]:
-                cell.style = title_style
+            style_range(wsTotal, landIndex, title_style)
                 
-            for cell in wsTotal[clientsTitle]:
-                cell.style = title_style    
+            style_range(wsTotal, clientsTitle, title_style)
             
-            for cell in wsTotal[landTitle]:
-                cell.style = title_style 
+            style_range(wsTotal, landTitle, title_style)
             
 class MendenhallSummary(object):
     """This tool summarizes the number of clients by location, by business for all Mendenhall activities for the year selected. It then breaks that out by month."""
@@ -1591,88 +1281,28 @@ class MendenhallSummary(object):
         endyear = int(datetime.today().year)
         param1.value = endyear
 
-        params = [param0, param1]
+        params = [param0, param1, snapshot_parameter()]
 
         return params
     
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
 
         savepath = parameters[0].value.value
         reportYr = parameters[1].value
         savedates = str(datetime.today().strftime('%m%d%Y'))
         savefile = "MendenhallSummary_" + savedates +".xlsx"
         fullpath = os.path.join(savepath, savefile)
-  
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames 
 
-        connection = r'{'ExamplePath'}'
-        mendTrip = '{}MENDENHALL_TRIPMONTH'.format(connection)
-        mendAct = '{}MENDENHALL_ACTIVITY'.format(connection)
-        
-        
-        query = "REPORTYEAR = {}".format(int(reportYr))
-        tripCol = getFieldNames(mendTrip)
-        mendTripSC = [row for row in arcpy.da.SearchCursor(mendTrip, tripCol, where_clause=query)]
-        mendTripDF = pd.DataFrame(mendTripSC, columns = tripCol)
-        
-        actCol = getFieldNames(mendAct)
-        mendActSC = [row for row in arcpy.da.SearchCursor(mendAct, actCol)]  
-        mendActDF = pd.DataFrame(mendActSC, columns = actCol)
-        
-        allDF = mendActDF.merge(mendTripDF, how = 'inner', on = "TRIP_GUID")
-        allDF.rename(columns={'BUSINESSNAME_x':'BUSINESSNAME'}, inplace=True)
-        
-        """This checks to see if there are trips by month. If there are a pivot table is created, if not a message is created that is then added to that month tab that there were zero trips"""
 
-        allMonths = allDF.empty
-        if allMonths == True:
-            allEmpty = 'There were no trips in {}'.format(reportYr)
-        else:
-            pvt = pd.pivot_table(allDF, values=('CLIENTSLOCATION'), index=['BUSINESSNAME', 'REPORTYEAR'], columns=['USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        
-        apr = allDF[allDF.REPORTMONTH =='April'].empty
-        if apr == True:
-            aprEmpty = 'There were no trips in April, {}'.format(reportYr)
-        else:
-            pvtApr = pd.pivot_table(allDF[allDF.REPORTMONTH == 'April'], values=('CLIENTSLOCATION'), index=['BUSINESSNAME', 'REPORTYEAR'], columns=['USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        
-        may = allDF[allDF.REPORTMONTH == 'May'].empty
-        if may == True:
-            mayEmpty = 'There were no trips in May, {}'.format(reportYr)
-        else:
-            pvtMay =  pd.pivot_table(allDF[allDF.REPORTMONTH == 'May'], values=('CLIENTSLOCATION'), index=['BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-
-        jun = allDF[allDF.REPORTMONTH == 'June'].empty
-        if jun == True:
-            junEmpty = 'There were no trips in June, {}'.format(reportYr)
-        else: 
-            pvtJun = pd.pivot_table(allDF[allDF.REPORTMONTH == 'June'], values=('CLIENTSLOCATION'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        
-        jul = allDF[allDF.REPORTMONTH == 'July'].empty
-        if jul == True:
-            julEmpty = 'There were no trips in July, {}'.format(reportYr)
-        else:
-            pvtJul = pd.pivot_table(allDF[allDF.REPORTMONTH == 'July'], values=('CLIENTSLOCATION'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-
-        aug = allDF[allDF.REPORTMONTH == 'August'].empty
-        if aug == True:
-            augEmpty = 'There were no trips in August, {}'.format(reportYr)
-        else:
-            pvtAug = pd.pivot_table(allDF[allDF.REPORTMONTH == 'August'], values=('CLIENTSLOCATION'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
+        connection = r'{'ExamplePath'}'
 
-        sept = allDF[allDF.REPORTMONTH == 'September'].empty
-        if sept == True:
-            septEmpty = 'There were no trips in September, {}'.format(reportYr)
-        else:
-            pvtSept = pd.pivot_table(allDF[allDF.REPORTMONTH == 'September'], values=('CLIENTSLOCATION'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')
-        
-        octo = allDF[allDF.REPORTMONTH == 'October'].empty
-        if octo == True:
-            octoEmpty = 'There were no trips in October, {}'.format(reportYr)
-        else:
-            pvtOct = pd.pivot_table(allDF[allDF.REPORTMONTH == 'October'], values=('CLIENTSLOCATION'), index=[u'BUSINESSNAME', 'REPORTYEAR'], columns=[u'USELOCATION'], aggfunc=np.sum, margins = True, dropna = True, margins_name = 'Total')        
+        """The totals and each month's pivot table are in report_specs.MENDENHALL_SUMMARY, a month with no trips gets a message on its tab instead"""
+        pivots = run_spec(MENDENHALL_SUMMARY, connection, {'reportYr': reportYr, 'year': int(reportYr)})
         
         """Write Pivot table and apply styles and formating"""
         writer_args = {
@@ -1730,13 +1360,9 @@ class MendenhallSummary(object):
                 i = get_column_letter(value_col)
                 ws.column_dimensions[i].width = 12.29
                 value_col += 1
-            for row in ws[value_cellsTot]:
-                for cell in row:
-                    cell.style = value_style
-            for cell in ws[index_column]:
-                cell.style = index_style                    
-            for cell in ws[title_row]:
-                cell.style = title_style
+            style_range(ws, value_cellsTot, value_style)
+            style_range(ws, index_column, index_style)
+            style_range(ws, title_row, title_style)
             header1 = 'Mendenhall Annual Use Summary Report\nReport Year: {}\nReport Generated: {}'.format(reportYr, date)
             ws.oddHeader.left.text = header1
             ws.oddHeader.left.size = 8
@@ -1748,202 +1374,28 @@ class MendenhallSummary(object):
 
         with pd.ExcelWriter(**writer_args) as xlsx:
             """Writes the pivot table or message to the excel workbook. If the pivot is written, all formatting is applied."""
-            
-            if allMonths == True:   
-                totDF = pd.DataFrame({'Message': [allEmpty]})
-                totDF.to_excel(xlsx, 'Totals')
-            else: 
-                pvt.to_excel(xlsx, 'Totals') 
-                wsTotals = xlsx.sheets['Totals']
-                excelUpdate(wsTotals)   
-                
-            if apr == True:
-                aprDF = pd.DataFrame({'Message': [aprEmpty]})
-                aprDF.to_excel(xlsx, 'April')               
-            else:
-                pvtApr.to_excel(xlsx, 'April')
-                wsApr = xlsx.sheets['April'] 
-                excelUpdate(wsApr) 
-                
-            if may == True:
-                mayDF = pd.DataFrame({'Message': [mayEmpty]})
-                mayDF.to_excel(xlsx, 'May')
-            else: 
-                pvtMay.to_excel(xlsx, 'May')
-                wsMay = xlsx.sheets['May'] 
-                excelUpdate(wsMay)
-            
-            if jun == True:
-                junDF = pd.DataFrame({'Message': [junEmpty]})
-                junDF.to_excel(xlsx, 'June')
-            else: 
-                pvtJun.to_excel(xlsx, 'June')
-                wsJun = xlsx.sheets['June'] 
-                excelUpdate(wsJun)
-                
-            if jul == True:
-                julDF = pd.DataFrame({'Message': [julEmpty]})
-                julDF.to_excel(xlsx, 'July')
-            else:
-                pvtJul.to_excel(xlsx, 'July')
-                wsJul = xlsx.sheets['July']   
-                excelUpdate(wsJul)
-
-            if aug == True:
-                augDF = pd.DataFrame({'Message': [augEmpty]})
-                augDF.to_excel(xlsx, 'August')
-            else:
-                pvtAug.to_excel(xlsx, 'August')
-                wsAug = xlsx.sheets['August']
-                excelUpdate(wsAug)
-                
-            if sept == True:
-                septDF = pd.DataFrame({'Message': [septEmpty]})
-                septDF.to_excel(xlsx, 'September')
-            else:
-                pvtSept.to_excel(xlsx, 'September')
-                wsSept = xlsx.sheets['September']  
-                excelUpdate(wsSept)
-
-            if octo == True:
-                octDF = pd.DataFrame({'Message': [octoEmpty]})
-                octDF.to_excel(xlsx, 'October')
-            else:
-                pvtOct.to_excel(xlsx, 'October')
-                wsOct = xlsx.sheets['October']  
-                excelUpdate(wsOct)                  
+            for ws, options in write_sheets(xlsx, MENDENHALL_SUMMARY, pivots):
+                excelUpdate(ws)
         return  
 
-class HeliskiDetail:
-
-    def __init__(self, business_name, startdate, enddate, reporter, certification, forestName, save_path):
-
-        self.row = 4
-        wbPath = r'{'ExamplePath'}\Reports\heliski_detail_template.xlsx'
-        wb = load_workbook(wbPath)
-
-        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
-        savedates = str((startdate.strftime("%Y%m%d"))) + "_" + str((enddate.strftime("%Y%m%d")))
-        self.savefile = "Heliski_" + savedates + '_' + savebusiness + ".xlsx"
-        self.path = os.path.join(save_path, self.savefile)
-
-        trip_style = NamedStyle('trip_style')
-        thin = Side(border_style='thin', color='000000')
-        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
-        wb.add_named_style(trip_style)
-
-        int_style = NamedStyle('int_style', number_format='0')
-        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        int_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(int_style)
-
-        coord_style = NamedStyle('coord_style', number_format='###.##0')
-        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        coord_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(coord_style)
-
-        float_style = NamedStyle('float_style', number_format='0.000')
-        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        float_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(float_style)
-
-        str_style = NamedStyle('str_style')
-        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        str_style.alignment = Alignment(horizontal='left', wrapText = True)
-        wb.add_named_style(str_style)
-
-        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
-        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        datetime_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(datetime_style)
-        
-        time_style = NamedStyle('time_style', number_format= 'h:mm' )
-        time_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-        time_style.alignment = Alignment(horizontal='center')
-        wb.add_named_style(time_style)        
-
-        self.styles = ['datetime_style', 'int_style', 'str_style', 'coord_style', 'coord_style', 'str_style', 'int_style', 'int_style', 'time_style', 'time_style', 'datetime_style', 'str_style']
-
-        ws = wb.active
-        ws['C2'] = certification
-        header1 = 'Business/Organization: {}\nOperating Season: {}-{}'.format(business_name, startdate.strftime('%Y-%m-%d'),
-                                                                                                   enddate.strftime('%Y-%m-%d'))
-        header2 = 'Heliski Actual Use Report \n{} National Forest'.format(forestName)
-        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
-        ws.firstHeader.left.text = header1
-        ws.firstFooter.left.text = footer
-        ws.oddHeader.left.text = header1
-        ws.evenHeader.left.text = header1
-        ws.oddFooter.left.text = footer
-        ws.evenFooter.left.text = footer
-        ws.firstHeader.right.text = header2
-        ws.oddHeader.right.text = header2
-        ws.evenHeader.right.text = header2
-        wb.save(self.path)
-
-    @contextmanager
-    def __worksheet(self):
-
-        wb = load_workbook(self.path)
-        ws = wb.active
-        try:
-            yield ws
-        finally:
-            wb.save(self.path)
-
-    def save_trips(self, trips):
-
-        with self.__worksheet() as ws:
-            for trip_guid in trips.keys():
-                self._add_trip(ws, **trips[trip_guid])
-
-    def _add_trip(self, ws, tripDate, activities):
-
-        # Skip to next page if trip records span page.
-        current_page_line = (self.row - 27) % 29 if self.row > 27 else self.row
-        current_page_line = 29 if not current_page_line else current_page_line
-        trip_end_line = current_page_line + len(activities)
-        if (self.row <= 27) and (trip_end_line > 27):
-            self.row += 28 - current_page_line
-        elif trip_end_line > 29:
-            self.row += 30 - current_page_line
-
-        for col in range(1, 13):
-            cell = ws.cell(row=self.row, column=col)
-            cell.style = 'trip_style'
-
-        self.row += 1
-        self._add_activities(ws, activities)
-
-    def _add_activities(self, worksheet, activity_records):
-
-        for record in activity_records:
-            for col, value in enumerate(record, 1):
-                cell = worksheet.cell(row=self.row, column=col)
-                cell.value = value
-                cell.style = self.styles[col-1]
-            self.row += 1
-
 
 class HeliskiReport(object):
     def __init__(self):
         self.label = "Run Heliski Detail Report"
         self.canRunInBackground = False
 
+        connection = r'{'ExamplePath'}'
+        tables = ['HELISKI_ACTIVITY',
+                  'HELISKI_TRIP']
+        self.tables = [connection + table for table in tables]
+        self.connection = connection
+
 
 
 
     def getParameterInfo(self):
         # Define parameter definitions
         
-        connection = r'{'ExamplePath'}'
-        tables = ['HELISKI_ACTIVITY',
-                  'HELISKI_TRIP']
-        self.tables = [connection + table for table in tables]
-
-        sc = arcpy.da.SearchCursor(self.tables[0], "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        self.business_names = [row[0] for row in sc]
         self.parameters = self.getParameterInfo()
 
         self.whereClause = "HELISKI_TRIP.TRIP_GUID ="\
@@ -1954,10 +1406,12 @@ class HeliskiReport(object):
             name="business",
             datatype="GPString",
             parameterType="Required",
-            direction="Input")
+            direction="Input",
+            multiValue=True)
 
         param0.filter.type = "ValueList"
-        param0.filter.list = self.business_names
+        # filled in by updateParameters
+        param0.filter.list = []
 
         param1  = arcpy.Parameter(
             displayName="that end between",
@@ -1985,7 +1439,16 @@ class HeliskiReport(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        param4 = arcpy.Parameter(
+            displayName="Reports to build at the same time",
+            name="workers",
+            datatype="GPLong",
+            parameterType="Optional",
+            direction="Input")
+
+        param4.value = REPORT_WORKERS
+
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
         
         return params
 
@@ -1993,91 +1456,96 @@ class HeliskiReport(object):
         return True
 
     def updateParameters(self, parameters):  # optional
+        fill_names(parameters[0], name_tables(self.connection, ['HELISKI']))
         return
 
     def updateMessages(self, parameters):  # optional
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
 
-        businessname = parameters[0].value
+    def _execute(self, parameters, messages):
+
+        businessnames = parameters[0].values
         startdate = parameters[1].value
         enddate = parameters[2].value
         savepath = parameters[3].value.value
-
-        arcpy.MakeQueryTable_management(self.tables, 'QueryTable', 'NO_KEY_FIELD', '', '', self.whereClause)
-
-        trips = OrderedDict()
-        reporter = None
-        certification = None
-        forestName = None
-        query1 = "HELISKI_TRIP.BUSINESSNAME = '{}' AND HELISKI_TRIP.TRIPDATE >= date '{}' AND HELISKI_TRIP.TRIPDATE <= date '{}'".format(businessname, startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
-
-        with arcpy.da.SearchCursor(self.tables[-1], '*', query1) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                row = dict(zip(fields, row))
-                reporter = reporter or row['REPORTERNAME']
-                certification = certification or row['CERTIFICATION']
-                forestName = forestName or row['FORESTNAME']
-                trips[row['TRIP_GUID']] = {'tripDate' : row['TRIPDATE'],
-                                                  'activities': []}
+        workers = parameters[4].value or 1
+
+        """Reads the trips of every business picked at once, then splits them up by business"""
+        businesses = OrderedDict((name, {'reporter': None, 'certification': None, 'forestName': None, 'trips': OrderedDict()})
+                                 for name in businessnames)
+        dates = "HELISKI_TRIP.TRIPDATE >= date '{}' AND HELISKI_TRIP.TRIPDATE <= date '{}'".format(startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
+        # every trip field, the query table used to carry them all onto the activity rows
+        tripTable = read_where_in(self.tables[-1], 'BUSINESSNAME', businessnames, where=dates)
+
+        tripRecords = {}
+        for row in _records(tripTable):
+            if row['BUSINESSNAME'] not in businesses:
+                continue
+            business = businesses[row['BUSINESSNAME']]
+            business['reporter'] = business['reporter'] or row['REPORTERNAME']
+            business['certification'] = business['certification'] or row['CERTIFICATION']
+            business['forestName'] = business['forestName'] or row['FORESTNAME']
+            business['trips'][row['TRIP_GUID']] = {'tripDate' : row['TRIPDATE'],
+                                                   'activities': []}
+            tripRecords[row['TRIP_GUID']] = business['trips'][row['TRIP_GUID']]
                      
-    
-        trips = OrderedDict(sorted(trips.items(), key=lambda x:(x[1]['tripDate'])))
+        for business in businesses.values():
+            business['trips'] = OrderedDict(sorted(business['trips'].items(), key=lambda x:(x[1]['tripDate'])))
 
-        if trips:
-            arcpy.AddMessage("Processing {} trip records...".format(len(trips)))
+        if tripRecords:
+            arcpy.AddMessage("Processing {} trip records...".format(len(tripRecords)))
         else:
             arcpy.AddWarning("No trips to report in date range.")
             return
 
-        query2 = "HELISKI_TRIP.BUSINESSNAME = '{}' AND HELISKI_TRIP.TRIPDATE >= date '{}' AND HELISKI_TRIP.TRIPDATE <= date '{}'".format(businessname, startdate.strftime('%Y-%m-%d'), enddate.strftime('%Y-%m-%d'))
         use_reports = 0
-        with arcpy.da.SearchCursor("QueryTable", '*', query2) as sc:
-            fields = [field.split('.')[-1] for field in sc.fields]
-            for row in sc:
-                use_reports += 1
-                row = dict(zip(fields, row))
-                enter = ()
-                if row['ENTERTIME'] is not None: 
-                    enter = datetime.strftime(row['ENTERTIME']+timedelta(days=365), '%H:%M')
-                else:
-                    enter = row['ENTERTIME']
-                depart = ()
-                if row['DEPARTTIME'] is not None:
-                    depart = datetime.strftime(row['DEPARTTIME']+timedelta(days=365), '%H:%M')
-                else:
-                    depart = row['DEPARTTIME']
-                record = [row['TRIPDATE'],
-                          row['TOTALCLIENTSONDAY'],
-                          row['USELOCATION'],
-                          row['LATITUDE'],
-                          row['LONGITUDE'],
-                          row['ACTIVITY'],
-                          row['CLIENTS_LOCATION'],
-                          row['HOURSSPENTONFS'],
-                          enter,
-                          depart, 
-                          row['CREATIONDATE'],
-                          row['REPORTERNAME']]
-                if row['TRIP_GUID'] in trips.keys():
-                    trips[row['TRIP_GUID']]['activities'].append(record)
-
-        for trip in trips.keys():
+        for pairs in _joined_rows(self.tables[0], tripTable):
+            use_reports += 1
+            row = dict(pairs)
+            enter = ()
+            if row['ENTERTIME'] is not None: 
+                enter = datetime.strftime(row['ENTERTIME']+timedelta(days=365), '%H:%M')
+            else:
+                enter = row['ENTERTIME']
+            depart = ()
+            if row['DEPARTTIME'] is not None:
+                depart = datetime.strftime(row['DEPARTTIME']+timedelta(days=365), '%H:%M')
+            else:
+                depart = row['DEPARTTIME']
+            record = [row['TRIPDATE'],
+                      row['TOTALCLIENTSONDAY'],
+                      row['USELOCATION'],
+                      row['LATITUDE'],
+                      row['LONGITUDE'],
+                      row['ACTIVITY'],
+                      row['CLIENTS_LOCATION'],
+                      row['HOURSSPENTONFS'],
+                      enter,
+                      depart, 
+                      row['CREATIONDATE'],
+                      row['REPORTERNAME']]
+            if row['TRIP_GUID'] in tripRecords:
+                tripRecords[row['TRIP_GUID']]['activities'].append(record)
+
+        for trip in tripRecords.keys():
             try:
-                trips[trip]['activities'] = sorted(trips[trip]['activities'], key=lambda x:x[0])
+                tripRecords[trip]['activities'] = sorted(tripRecords[trip]['activities'], key=lambda x:x[0])
             except Exception as e:
-                arcpy.AddError("ERROR: {}\nTRIPID: {}\nACTIVITY DATA: {}".format(e, trips[trip], trips[trip]['activities']))
+                arcpy.AddError("ERROR: {}\nTRIPID: {}\nACTIVITY DATA: {}".format(e, tripRecords[trip], tripRecords[trip]['activities']))
                 raise e
 
         arcpy.AddMessage("Processing {} use report records.".format(use_reports))
 
-        report = HeliskiDetail(businessname, startdate, enddate,
-                                 reporter, certification, forestName, savepath)
-
-        arcpy.AddMessage('Saving {}...'.format(report.savefile))
-        report.save_trips(trips)
+        reports = [(businessname, (businessname, startdate, enddate, business['reporter'], business['certification'],
+                                   business['forestName'], savepath), business['trips'])
+                   for businessname, business in businesses.items()]
+        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
+        save_reports(HeliskiDetail, reports, os.path.join(savepath, "Heliski_" + savedates + "_manifest.csv"), workers)
         
         
 class FiveYearSummary(object):
@@ -2086,46 +1554,22 @@ class FiveYearSummary(object):
         self.label = "Five Year Summary"
         self.description = ""
         self.canRunInBackground = False
-        
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['ACTIVITY', 'BIKING', 'BLACKBEAR', 'BROWNBEAR', 'BUSINESSNAME', 'CANOEING', 'CLIENTMONTH',
+                       'CLIENTNUMBER', 'CLIENTSDOGSLED', 'CLIENTSGLACTREK', 'CLIENTSHIKE', 'CLIENTSLOCATION',
+                       'CLIENTS_LOCATION', 'DALLSHEEP', 'DAYS_WOLF', 'DAYS_WTRFOWLSMALLGAME', 'DAY_GUID', 'DEER',
+                       'DISTRICTNAME', 'ELK', 'ENDDATE', 'FULLNAME', 'HIKING', 'HUNTERS', 'HUNTS', 'KAYAKING',
+                       'LDNGGRATUITY', 'LDNGOPS', 'LDNGPAIDCLIENTS', 'LOCATION_ID', 'MOOSE', 'MOUNTAINGOAT', 'RAFTING',
+                       'REPORTYEAR', 'SERVICE_DAYS_NONHUNTER', 'STOP_GUID', 'TOTALCLIENTSONDAY', 'TRIPDATE', 'TRIP_GUID',
+                       'USELOCATION', 'USE_AREA', 'VCTRANSPORT', 'ZONE_NAME']
 
+        # Connection the business picker's index reads the tables from
+        self.connection = r'{'ExamplePath'}'
 
 
     def getParameterInfo(self):
         """Define parameter definitions"""
         
-        self.heli = r'{'ExamplePath'}/HELISKI_TRIP'
-        self.ice = r'T{'ExamplePath'}/ICEFIELD_TRIPMONTH'
-        self.guide = r'{'ExamplePath'}/GUIDEDREC_DAY'
-        self.hunt = r'{'ExamplePath'}/HUNTING_DAY'
-        self.mend = r'{'ExamplePath'}/MENDENHALL_TRIPMONTH'
-        self.outfit = r'{'ExamplePath'}OUTFITTING_ACTIVITY'
-             
-       
-        sc = arcpy.da.SearchCursor(self.heli, "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        bus = [row[0] for row in sc]
-        
-        sc1 = arcpy.da.SearchCursor(self.ice, "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        bus1 = [row[0] for row in sc1]
-        
-        sc2 = arcpy.da.SearchCursor(self.guide, "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        bus2 = [row[0] for row in sc2]
-        
-        sc3 = arcpy.da.SearchCursor(self.hunt, "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        bus3 = [row[0] for row in sc3]
-        
-        sc4 = arcpy.da.SearchCursor(self.mend, "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        bus4 = [row[0] for row in sc4]
-        
-        sc5 = arcpy.da.SearchCursor(self.outfit, "BUSINESSNAME", sql_clause=("DISTINCT", "ORDER BY BUSINESSNAME"))
-        bus5 = [row[0] for row in sc5]
-        
-            
-        busList = bus1+bus2+bus3+bus4+bus+bus5   
-        
-        self.business_name = list(set(busList))
-         
-        self.business_name.sort()
-               
         self.parameters = self.getParameterInfo()        
 
         param0 = arcpy.Parameter(
@@ -2136,7 +1580,8 @@ class FiveYearSummary(object):
             direction="Input")
 
         param0.filter.type = "ValueList"
-        param0.filter.list = self.business_name
+        # filled in by updateParameters
+        param0.filter.list = []
 
         param1  = arcpy.Parameter(
             displayName="Start Year",
@@ -2167,7 +1612,7 @@ class FiveYearSummary(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        params = [param0, param1, param2, param3, snapshot_parameter()]
         
         return params
 
@@ -2179,6 +1624,7 @@ class FiveYearSummary(object):
         """Modify the values and properties of parameters before internal
         validation is performed.  This method is called whenever a parameter
         has been changed."""
+        fill_names(parameters[0], name_tables(self.connection))
         return
 
     def updateMessages(self, parameters):
@@ -2187,12 +1633,12 @@ class FiveYearSummary(object):
         return
 
     def execute(self, parameters, messages):
-        
-        """ Function to get list of field names in a table"""
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames
 
 
 
@@ -2220,14 +1666,8 @@ class FiveYearSummary(object):
 
         iceTrip = '{}ICEFIELD_TRIPMONTH'.format(connection) 
         iceAct = '{}ICEFIELD_ACTIVITY'.format(connection)
-        guideDay = '{}GUIDEDREC_DAY'.format(connection)
-        guideStop = '{}GUIDEDREC_STOP'.format(connection)
-        guideActivity = '{}GUIDEDREC_ACTIVITY'.format(connection)
         huntTrip = '{}HUNTING_TRIP'.format(connection)
         huntHunt = '{}HUNTING_HUNTER'.format(connection)
-        huntDay = '{}HUNTING_DAY'.format(connection)
-        huntStop = '{}HUNTING_STOP'.format(connection)
-        huntActivity = '{}HUNTING_ACTIVITY'.format(connection)
         heliTrip ='{}HELISKI_TRIP'.format(connection)
         heliActivity = 'HELISKI_ACTIVITY'.format(connection)
         mendTrip = 'MENDENHALL_TRIPMONTH'.format(connection)
@@ -2249,17 +1689,13 @@ class FiveYearSummary(object):
             
         """Creating Icefield dataframes and filtering data by the report timeframe and business name"""
 
-        iceTripCol = getFieldNames(iceTrip)
-        iceActCol = getFieldNames(iceAct)
         
         iceWhere = "REPORTYEAR>= {} AND REPORTYEAR<= {} AND BUSINESSNAME = '{}'".format(startYear, endYear, businessname)
-        iceTripData =[row for row in arcpy.da.SearchCursor(iceTrip, iceTripCol, where_clause=iceWhere)]
+        iceTripDF = read_table(iceTrip, self.fields, where=iceWhere)
         
         iceActWhere = "BUSINESSNAME = '{}'".format(businessname)
-        iceActData = [row for row in arcpy.da.SearchCursor(iceAct, iceActCol, where_clause=iceActWhere)]
+        iceActDF = read_table(iceAct, self.fields, where=iceActWhere)
 
-        iceTripDF =  pd.DataFrame(iceTripData, columns = iceTripCol)
-        iceActDF = pd.DataFrame(iceActData, columns = iceActCol)
         
         if (iceTripDF.empty == False):
             if (iceActDF.empty == False):
@@ -2267,75 +1703,37 @@ class FiveYearSummary(object):
         
         """Creating Guided Recreation DataFrames and filtering data by the report timeframe and business name"""
         
-        guideDayCol = getFieldNames(guideDay)
-        guideStopCol = getFieldNames(guideStop)
-        guideActCol = getFieldNames(guideActivity)
         
         guideWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND BUSINESSNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), businessname)
-        guideData = [row for row in arcpy.da.SearchCursor(guideDay, guideDayCol, where_clause=guideWhere)]
-        guideDayDF = pd.DataFrame(guideData, columns = guideDayCol)
-        
         guideStopWhere = "BUSINESSNAME = '{}'".format(businessname)
-        guideStopData = [row for row in arcpy.da.SearchCursor(guideStop, guideStopCol, where_clause=guideStopWhere)]
-        guideStopDF = pd.DataFrame(guideStopData, columns = guideStopCol)
-
-        guideActData =[row for row in arcpy.da.SearchCursor(guideActivity, guideActCol, where_clause=guideStopWhere)]  
-        guideActDF = pd.DataFrame(guideActData, columns = guideActCol)
-        
-        
-        if (guideDayDF.empty == False):
-            if (guideStopDF.empty ==False):
-                if (guideActDF.empty == False):
-                    guideDF1 = guideActDF.merge(guideStopDF, how = 'inner', on= 'STOP_GUID')
-                    guideDF = guideDF1.merge(guideDayDF, how = 'inner', on = 'DAY_GUID')
+        guideFacts = read_facts(connection, 'GUIDEDREC', self.fields, day_where=guideWhere, stop_where=guideStopWhere, act_where=guideStopWhere, location=True)
+        if (guideFacts.empty == False):
+            guideDF = guideFacts
         
         """Creating Hunting Data Frames to only get the non-hunting activities and filtering data by the report timeframe and business name"""        
 
-        huntDayCol = getFieldNames(huntDay)
-        huntStopCol = getFieldNames(huntStop)
-        huntActCol = getFieldNames(huntActivity)
     
 
         huntWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND BUSINESSNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), businessname)
-        huntDayData = [row for row in arcpy.da.SearchCursor(huntDay, huntDayCol, where_clause=huntWhere)]
-        huntDayDF = pd.DataFrame(huntDayData, columns = huntDayCol)
-        
         huntStopWhere = "BUSINESSNAME = '{}'".format(businessname)
-        huntStopData = [row for row in arcpy.da.SearchCursor(huntStop, huntStopCol, where_clause=huntStopWhere)]
-        huntStopDF = pd.DataFrame(huntStopData, columns = huntStopCol)
-        
         huntActWhere = "BUSINESSNAME = '{}'".format(businessname) 
-        huntActData =  [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol, where_clause=huntActWhere)]  
-        huntActDF = pd.DataFrame(huntActData, columns = huntActCol)
-        
-        if (huntDayDF.empty == False):
-            if (huntStopDF.empty == False):
-                if (huntActDF.empty == False):
-                    huntDF1 = huntActDF.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-                    huntDF = huntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')        
+        huntFacts = read_facts(connection, 'HUNTING', self.fields, day_where=huntWhere, stop_where=huntStopWhere, act_where=huntActWhere, location=True)
+        if (huntFacts.empty == False):
+            huntDF = huntFacts
 
         nonHuntWhere = "BUSINESSNAME = '{}'  AND SERVICE_DAYS_NONHUNTER > 0".format(businessname)
-        nonHuntData = [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol, where_clause=nonHuntWhere)]
-        nonHuntAct = pd.DataFrame(nonHuntData, columns = huntActCol)
-        
-        if (huntDayDF.empty == False):
-            if (huntStopDF.empty == False):
-                if (nonHuntAct.empty == False):
-                    nonHuntDF1 = nonHuntAct.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-                    nonHuntDF = nonHuntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')       
+        nonHuntFacts = read_facts(connection, 'HUNTING', self.fields, day_where=huntWhere, stop_where=huntStopWhere, act_where=nonHuntWhere, location=True)
+        if (nonHuntFacts.empty == False):
+            nonHuntDF = nonHuntFacts
 
         """Creating Hunting dataframes to get the count of hunts in the date range for the specific business name"""
 
-        huntCountCol = getFieldNames(huntTrip)
-        huntHuntCol = getFieldNames(huntHunt)
         
         huntCountWhere = "ENDDATE >= timestamp '{}' AND ENDDATE <= timestamp '{}' AND BUSINESSNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), businessname)          
-        huntCountData = [row for row in arcpy.da.SearchCursor(huntTrip, huntCountCol, where_clause=huntCountWhere)]            
-        huntTripDF = pd.DataFrame(huntCountData, columns = huntCountCol)
+        huntTripDF = read_table(huntTrip, self.fields, where=huntCountWhere)
         
         huntHuntWhere = "BUSINESSNAME = '{}'".format(businessname) 
-        huntHuntData = [row for row in arcpy.da.SearchCursor(huntHunt, huntHuntCol, where_clause=huntHuntWhere)]  
-        huntHuntDF = pd.DataFrame(huntHuntData, columns = huntHuntCol)  
+        huntHuntDF = read_table(huntHunt, self.fields, where=huntHuntWhere)
         
         if (huntTripDF.empty == False):
             if (huntHuntDF.empty == False):
@@ -2344,16 +1742,12 @@ class FiveYearSummary(object):
         
         """ Creating Heliski dataframes in the date range and for the specific business name"""
 
-        heliTripCol = getFieldNames(heliTrip)
-        heliActCol = getFieldNames(heliActivity)
 
         heliWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND BUSINESSNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), businessname)
-        heliData = [row for row in arcpy.da.SearchCursor(heliTrip, heliTripCol, where_clause=heliWhere)]
-        heliTripDF = pd.DataFrame(heliData, columns=heliTripCol)   
+        heliTripDF = read_table(heliTrip, self.fields, where=heliWhere)
         
         heliActWhere = "BUSINESSNAME = '{}'".format(businessname)
-        heliActData = [row for row in arcpy.da.SearchCursor(heliActivity, heliActCol, where_clause=heliActWhere)]
-        heliActDF = pd.DataFrame(heliActData, columns = heliActCol)
+        heliActDF = read_where_in(heliActivity, 'TRIP_GUID', heliTripDF['TRIP_GUID'], self.fields, where=heliActWhere)
         
         if (heliTripDF.empty == False):
             if (heliActDF.empty == False):
@@ -2362,17 +1756,13 @@ class FiveYearSummary(object):
         
         """Creating Mendenhall datafrmaes in the date range and for the specific business name"""
 
-        mendTripCol = getFieldNames(mendTrip)
-        mendActCol = getFieldNames(mendActivity)
         
         
         mendWhere = "REPORTYEAR >= {} AND REPORTYEAR <= {} AND BUSINESSNAME = '{}'".format(startYear, endYear, businessname)
-        mendData = [row for row in arcpy.da.SearchCursor(mendTrip, mendTripCol, where_clause=mendWhere)]
-        mendTripDF = pd.DataFrame(mendData, columns=mendTripCol)
+        mendTripDF = read_table(mendTrip, self.fields, where=mendWhere)
         
         mendActWhere = "BUSINESSNAME = '{}'".format(businessname)
-        mendActData = [row for row in arcpy.da.SearchCursor(mendActivity, mendActCol, where_clause=mendActWhere)]
-        mendActDF = pd.DataFrame(mendActData, columns=mendActCol) 
+        mendActDF = read_table(mendActivity, self.fields, where=mendActWhere)
         
         if (mendTripDF.empty == False):
             if (mendActDF.empty == False):
@@ -2380,16 +1770,9 @@ class FiveYearSummary(object):
         
         """Creating Outfitting data frame in the date range and for the specific business name"""
 
-        outfitCol = getFieldNames(outTable)
         outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND BUSINESSNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), businessname)
-        outfitData = [row for row in arcpy.da.SearchCursor(outTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)
-        
-               
+        outfitDF = read_table(outTable, self.fields, where=outfitWhere)
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames    
         
         """ Activity Dictionary to account for differences in the activity categories and what is listed in each of the datasets. """
         
@@ -2411,14 +1794,8 @@ class FiveYearSummary(object):
 
         """Creating Location dataframe. This will be joined to all the other dataframes so that we can get ancillary data, like ranger district"""
     
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
-        locDF['FULLNAME'].fillna(locDF['ZONE_NAME'], inplace=True)
-        locDF['USE_AREA'] = locDF['FULLNAME']
-        locDF['USE_AREA'].fillna('Use Area Unknown', inplace=True)
+        locDF = fill_locations(read_table(locTable, self.fields))
         locDF['USELOCATION'].str.upper()
-        locDF['DISTRICTNAME'].fillna('Ranger District Unknown', inplace = True)
         
         """ This takes the start year and end year parameters and reformats it so that it matches the date format in Guided Recreation and Hunting."""
         
@@ -2501,7 +1878,7 @@ class FiveYearSummary(object):
 
             
             guideDF['USELOCATION'].str.upper()
-            guideLoc = guideDF.merge(locDF, how = 'left', on = ['LOCATION_ID'])
+            guideLoc = with_location(guideDF, fill_locations)
 
             guideLoc.rename(columns={'USELOCATION_x':'USELOCATION'}, inplace=True)
             guideLoc['USELOCATION'].fillna('Use Location Other or Unknown', inplace = True)
@@ -2547,7 +1924,7 @@ class FiveYearSummary(object):
             huntDF['Year'] = huntDF['TRIPDATE'].dt.year           
             huntDF['USELOCATION'].str.upper()
 
-            huntLoc = huntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID']) 
+            huntLoc = with_location(huntDF, fill_locations)
             huntLoc.rename(columns={'USELOCATION_x':'USELOCATION'}, inplace=True)
             hunts = huntLoc[['Year', 'Activity2', 'HUNTERS', 'USE_AREA', 'USELOCATION', 'DISTRICTNAME', 'DAY_GUID','TOTALCLIENTSONDAY']].copy()
             
@@ -2555,7 +1932,7 @@ class FiveYearSummary(object):
                 nonHuntDF['Activity2'] = 'Remote Setting Nature Tour'            
                 nonHuntDF['Year'] = nonHuntDF['TRIPDATE'].dt.year            
                 nonHuntDF['USELOCATION'].str.upper()
-                nonHuntLoc = nonHuntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID'])
+                nonHuntLoc = with_location(nonHuntDF, fill_locations)
                 nonHuntLoc.rename(columns={'USELOCATION_x':'USELOCATION'}, inplace=True)
                 nonHuntOnly = nonHuntLoc[['Year', 'Activity2', 'SERVICE_DAYS_NONHUNTER', 'USE_AREA', 'USELOCATION', 'DISTRICTNAME', 'DAY_GUID','TOTALCLIENTSONDAY']].copy()            
                 huntAll = hunts.append(nonHuntOnly)
@@ -3099,13 +2476,10 @@ class FiveYearSummary(object):
             ws.oddFooter.left.text = footer
             
         def excelRow(ws, rows, styles):
-            for row in ws[rows]:
-                for cell in row:
-                    cell.style = styles
+            style_range(ws, rows, styles)
         
         def excelStyle(ws, cells, styles):
-            for cell in ws[cells]:
-                cell.style = styles
+            style_range(ws, cells, styles)
 
         def excelUpdate(ws):
             title_row = '1'
@@ -3193,6 +2567,10 @@ class RVD_Report(object):
         self.label = "Run NEPA Review-RVD Report"
         self.description = ""
         self.canRunInBackground = False
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['ACTIVITY', 'AREA', 'AREANUMBER', 'BUSINESSNAME', 'CLIENTNUMBER', 'CLIENTS', 'CLIENTS_LOCATION',
+                       'DATE', 'DAY_GUID', 'DISTRICTNAME', 'FULLNAME', 'HOURS', 'HOURSSPENTONFS', 'LOCATION_ID', 'RVD',
+                       'STOP_GUID', 'TOTALCLIENTSONDAY', 'TRIPDATE', 'TRIP_GUID', 'USELOCATION', 'USE_AREA', 'ZONE_NAME']
         
     def getParameterInfo(self):
         """Define parameter definitions"""
@@ -3233,7 +2611,7 @@ class RVD_Report(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        params = [param0, param1, param2, param3, snapshot_parameter()]
 
         return params
               
@@ -3253,6 +2631,11 @@ class RVD_Report(object):
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
         """The source code of the tool."""
         
 
@@ -3269,87 +2652,41 @@ class RVD_Report(object):
 
         connection = r'{'ExamplePath'}'
 
-        guideDay = '{}GUIDEDREC_DAY'.format(connection)
-        guideStop = '{}GUIDEDREC_STOP'.format(connection)
-        guideActivity = '{}GUIDEDREC_ACTIVITY'.format(connection)
-        huntDay = '{}HUNTING_DAY'.format(connection)
-        huntStop = '{}HUNTING_STOP'.format(connection)
-        huntActivity = '{}HUNTING_ACTIVITY'.format(connection)
         heliTrip ='{}HELISKI_TRIP'.format(connection)
         heliActivity = '{}HELISKI_ACTIVITY'.format(connection)
         outTable ='{}OUTFITTING_ACTIVITY'.format(connection)
         locTable = '{}LOCATION'.format(connection)
 
 
-          
-        def getFieldNames(shp):
-            fieldnames = [f.name for f in arcpy.ListFields(shp)]
-            return fieldnames
-
         
         """Creating Guided Recreation DataFrames and filtering data by the report timeframe and business name"""
         
-        guideDayCol = getFieldNames(guideDay)
-        guideStopCol = getFieldNames(guideStop)
-        guideActCol = getFieldNames(guideActivity)
         
         guideWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(startDate.strftime('%Y-%m-%d %H:%M:%S'), endDate.strftime('%Y-%m-%d %H:%M:%S'))
-        guideData = [row for row in arcpy.da.SearchCursor(guideDay, guideDayCol, where_clause=guideWhere)]
-        guideDayDF = pd.DataFrame(guideData, columns = guideDayCol)
-
-        guideStopData = [row for row in arcpy.da.SearchCursor(guideStop, guideStopCol)]
-        guideStopDF = pd.DataFrame(guideStopData, columns = guideStopCol)
-
-        guideActData =[row for row in arcpy.da.SearchCursor(guideActivity, guideActCol)]  
-        guideActDF = pd.DataFrame(guideActData, columns = guideActCol)
-        
-        
-        if (guideDayDF.empty == False):
-            if (guideStopDF.empty ==False):
-                if (guideActDF.empty == False):
-                    guideDF1 = guideActDF.merge(guideStopDF, how = 'inner', on= 'STOP_GUID')
-                    guideDF = guideDF1.merge(guideDayDF, how = 'inner', on = 'DAY_GUID')
+        guideFacts = read_facts(connection, 'GUIDEDREC', self.fields, day_where=guideWhere, location=True)
+        if (guideFacts.empty == False):
+            guideDF = guideFacts
 
         
         """Creating Hunting Data Frames to only get the non-hunting activities and filtering data by the report timeframe and business name"""        
 
-        huntDayCol = getFieldNames(huntDay)
-        huntStopCol = getFieldNames(huntStop)
-        huntActCol = getFieldNames(huntActivity)
     
 
         huntWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(startDate.strftime('%Y-%m-%d %H:%M:%S'), endDate.strftime('%Y-%m-%d %H:%M:%S'))
-        huntDayData = [row for row in arcpy.da.SearchCursor(huntDay, huntDayCol, where_clause=huntWhere)]
-        huntDayDF = pd.DataFrame(huntDayData, columns = huntDayCol)
-        
-        huntStopData = [row for row in arcpy.da.SearchCursor(huntStop, huntStopCol)]
-        huntStopDF = pd.DataFrame(huntStopData, columns = huntStopCol)
-
-
-        huntActData =  [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol)]  
-        huntActDF = pd.DataFrame(huntActData, columns = huntActCol)
-      
-        
-        if (huntDayDF.empty == False):
-            if (huntStopDF.empty == False):
-                if (huntActDF.empty == False):
-                    huntDF1 = huntActDF.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-                    huntDF = huntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')        
+        huntFacts = read_facts(connection, 'HUNTING', self.fields, day_where=huntWhere, location=True)
+        if (huntFacts.empty == False):
+            huntDF = huntFacts
     
 
         
         
         """ Creating Heliski dataframes in the date range and for the specific business name"""
 
-        heliTripCol = getFieldNames(heliTrip)
-        heliActCol = getFieldNames(heliActivity)
 
         heliWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(startDate.strftime('%Y-%m-%d %H:%M:%S'), endDate.strftime('%Y-%m-%d %H:%M:%S'))
-        heliData = [row for row in arcpy.da.SearchCursor(heliTrip, heliTripCol, where_clause=heliWhere)]
-        heliTripDF = pd.DataFrame(heliData, columns=heliTripCol)   
+        heliTripDF = read_table(heliTrip, self.fields, where=heliWhere)
 
-        heliActData = [row for row in arcpy.da.SearchCursor(heliActivity, heliActCol)]
-        heliActDF = pd.DataFrame(heliActData, columns = heliActCol)
+        heliActDF = read_where_in(heliActivity, 'TRIP_GUID', heliTripDF['TRIP_GUID'], self.fields)
         
         if (heliTripDF.empty == False):
             if (heliActDF.empty == False):
@@ -3358,10 +2695,8 @@ class RVD_Report(object):
         
         """Creating Outfitting data frame in the date range and for the specific business name"""
 
-        outfitCol = getFieldNames(outTable)
         outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(startDate.strftime('%Y-%m-%d %H:%M:%S'), endDate.strftime('%Y-%m-%d %H:%M:%S'))
-        outfitData = [row for row in arcpy.da.SearchCursor(outTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)
+        outfitDF = read_table(outTable, self.fields, where=outfitWhere)
 
         
         activities = {'Boating, Stand Up Paddle Boarding, Non-Motorized, Freshwater':'Boating (Non-Motorized, Freshwater)', 'Boating, Pack Rafting, Non-Motorized, Freshwater':'Boating (Non-Motorized, Freshwater)', 
@@ -3379,13 +2714,7 @@ class RVD_Report(object):
            'Visitor_Center_Transport':'Visitor Center (Begich Boggs, MGVC, SEADC)', 'Hunting, Black Bear ':'Hunting, Black Bear', 'Hunting, Dall Sheep ':'Hunting, Dall Sheep', 'Hunting, Waterfowl/Small game ':'Hunting, Waterfowl/Small game/Wolf',
            'Assigned Site' : 'Assigned Site', 'Minimum Fee': 'Minimum Fee', 'Hunting, Black Bear':'Hunting, Black Bear', 'Hunting, Waterfowl/Small game/Wolf - Service Day Rate':'Hunting, Waterfowl/Small game/Wolf'}
         
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
-        locDF['FULLNAME'].fillna(locDF['ZONE_NAME'], inplace=True)
-        locDF['USE_AREA'] = locDF['FULLNAME']
-        locDF['USE_AREA'].fillna('Use Area Unknown', inplace=True)
-        locDF['DISTRICTNAME'].fillna('Ranger District Unknown', inplace = True)
+        locDF = fill_locations(read_table(locTable, self.fields))
         locDF['USELOCATION'].str.upper()
 
        
@@ -3397,7 +2726,7 @@ class RVD_Report(object):
         else:
             guideDF['Activity2'] = guideDF['ACTIVITY'].map(activities)      
 
-            guideLoc = guideDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID'])
+            guideLoc = with_location(guideDF, fill_locations)
 
             guideFilter = guideLoc.loc[guideLoc['DISTRICTNAME'] == rangerDistrict]
 
@@ -3413,7 +2742,7 @@ class RVD_Report(object):
             huntDF['Activity2'] = huntDF['ACTIVITY'].map(activities)
             huntDF.rename(columns= {'CLIENTNUMBER': 'CLIENTS'}, inplace = True)  
             huntDF['USELOCATION'].str.upper()
-            huntLoc = huntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID'])
+            huntLoc = with_location(huntDF, fill_locations)
             huntFilter = huntLoc.loc[huntLoc['DISTRICTNAME'] == rangerDistrict]
             huntFilter.rename(columns= {'HOURSSPENTONFS': 'HOURS', 'AREANUMBER': 'AREA', 'BUSINESSNAME_x':'BUSINESS NAME', 'USELOCATION_x':'USELOCATION'}, inplace = True)            
             huntFilter['DATE'] = huntFilter['TRIPDATE'].dt.strftime('%m/%d/%Y')
@@ -3511,6 +2840,9 @@ class NEPAReview_Shoreline2(object):
         self.label = "Run NEPA Review-Shoreline II Report"
         self.description = ""
         self.canRunInBackground = False
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['CLIENTNUMBER', 'DAY_GUID', 'FULLNAME', 'LOCATION_ID', 'SEASON', 'STOP_GUID', 'TOTALCLIENTSONDAY',
+                       'TRIPDATE', 'USE', 'USELOCATION']
 
     def getParameterInfo(self):
         """Define parameter definitions"""
@@ -3545,7 +2877,7 @@ class NEPAReview_Shoreline2(object):
             direction="Input")
         param2.filter.list = ["File System"]
 
-        params = [param0, param1, param2]
+        params = [param0, param1, param2, snapshot_parameter()]
         return params
 
     def isLicensed(self):
@@ -3564,6 +2896,11 @@ class NEPAReview_Shoreline2(object):
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
         """This tool is sued to populate the Shoreline II Allocation status template. It calculates the number of clients by use are by season."""
         
         startYear = parameters[0].value
@@ -3581,11 +2918,7 @@ class NEPAReview_Shoreline2(object):
         savefile = "NEPAReview_Shoreline2" + "_" + start + "_" + end + ".xlsx"
         path = os.path.join(savepath, savefile)
         wb.save(path)
-        
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames
 
         """List of Full Name use areas that are in the Shoreline II area."""
         
@@ -3602,19 +2935,11 @@ class NEPAReview_Shoreline2(object):
 
         connection = r'{'ExamplePath'}'
         
-        guideDay = '{}GUIDEDREC_DAY'.format(connection)
-        guideStop = '{}GUIDEDREC_STOP'.format(connection)
-        guideActivity = '{}GUIDEDREC_ACTIVITY'.format(connection)
-        huntDay = '{}HUNTING_DAY'.format(connection)
-        huntStop = '{}HUNTING_STOP'.format(connection)
-        huntActivity = '{}HUNTING_ACTIVITY'.format(connection)
         outTable ='{}OUTFITTING_ACTIVITY'.format(connection)
         locTable = '{}LOCATION'.format(connection)
 
 
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
+        locDF = read_table(locTable, self.fields)
         locDF['USELOCATION'].str.upper()
 
 
@@ -3635,26 +2960,13 @@ class NEPAReview_Shoreline2(object):
         sure that sum is not greater than the total number of clinets on the day by use area and season. If the client number sum is greater than the total clents on the day, we use total clients on 
         the day. """
 
-        guideDayCol = getFieldNames(guideDay)
         guideDayWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        guideDayData = [row for row in arcpy.da.SearchCursor(guideDay, guideDayCol, where_clause=guideDayWhere)]
-        guideDayDF = pd.DataFrame(guideDayData, columns=guideDayCol)
-       
-        guideStopCol = getFieldNames(guideStop)
-        guideStopData = [row for row in arcpy.da.SearchCursor(guideStop, guideStopCol)]
-        guideStopDF = pd.DataFrame(guideStopData, columns = guideStopCol) 
-        
-        guideActCol = getFieldNames(guideActivity)
-        guideActData = [row for row in arcpy.da.SearchCursor(guideActivity, guideActCol)]
-        guideActDF = pd.DataFrame(guideActData, columns = guideActCol)
-
-        guideDF1 = guideActDF.merge(guideStopDF, how = 'inner', on= 'STOP_GUID')
-        guideDF = guideDF1.merge(guideDayDF, how = 'inner', on = 'DAY_GUID')                 
+        guideDF = read_facts(connection, 'GUIDEDREC', self.fields, day_where=guideDayWhere, location=True)
 
         
         guideDF['Year'] = guideDF['TRIPDATE'].dt.year            
         guideDF['USELOCATION'].str.upper()
-        guideLoc = guideDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID']) 
+        guideLoc = with_location(guideDF)
         
         guideLoc['keep'] = guideLoc['FULLNAME'].apply(lambda x: 'True' if x in shoreline2 else 'False')
         
@@ -3670,26 +2982,13 @@ class NEPAReview_Shoreline2(object):
 
 
         
-        huntDayCol = getFieldNames(huntDay)
         huntDayWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        huntDayData = [row for row in arcpy.da.SearchCursor(huntDay, huntDayCol, where_clause=huntDayWhere)]
-        huntDayDF = pd.DataFrame(huntDayData, columns=huntDayCol)
-       
-        huntStopCol = getFieldNames(huntStop)
-        huntStopData = [row for row in arcpy.da.SearchCursor(huntStop, huntStopCol)]  
-        huntStopDF = pd.DataFrame(huntStopData, columns = huntStopCol)
-        
-        huntActCol = getFieldNames(huntActivity)
-        huntActData = [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol)] 
-        huntActDF = pd.DataFrame(huntActData, columns = huntActCol)
-        
-        huntDF1 = huntActDF.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-        huntDF = huntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')
+        huntDF = read_facts(connection, 'HUNTING', self.fields, day_where=huntDayWhere, location=True)
         
         huntDF['Year'] = huntDF['TRIPDATE'].dt.year        
         
         huntDF['USELOCATION'].str.upper()
-        huntLoc = huntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID'])
+        huntLoc = with_location(huntDF)
         
         huntLoc['keep'] = huntLoc['FULLNAME'].apply(lambda x: 'True' if x in shoreline2 else 'False')
         
@@ -3703,10 +3002,8 @@ class NEPAReview_Shoreline2(object):
         
 
         
-        outfitCol = getFieldNames(outTable)
         outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        outfitData = [row for row in arcpy.da.SearchCursor(outTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)
+        outfitDF = read_table(outTable, self.fields, where=outfitWhere)
         outfitDF['Year'] = outfitDF['TRIPDATE'].dt.year
         outfitDF['USELOCATION'].str.upper()
         outfitLoc = outfitDF.merge(locDF, how = 'inner', on = ['LOCATION_ID', 'USELOCATION'])
@@ -4015,6 +3312,9 @@ class NEPAReview_KMRD(object):
         self.label = "Run NEPA Review-KMRD Allocation Report"
         self.description = ""
         self.canRunInBackground = False
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['CLIENTNUMBER', 'DAY_GUID', 'FULLNAME', 'LOCATION_ID', 'SEASON', 'STOP_GUID', 'TOTALCLIENTSONDAY',
+                       'TRIPDATE', 'USE', 'USELOCATION']
 
     def getParameterInfo(self):
         """Define parameter definitions"""
@@ -4049,7 +3349,7 @@ class NEPAReview_KMRD(object):
             direction="Input")
         param2.filter.list = ["File System"]
 
-        params = [param0, param1, param2]
+        params = [param0, param1, param2, snapshot_parameter()]
         return params
 
     def isLicensed(self):
@@ -4068,6 +3368,11 @@ class NEPAReview_KMRD(object):
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
         """This tool is sued to populate the KMRD Allocation status template. It calculates the number of clients by use are by season."""
         
         startYear = parameters[0].value
@@ -4088,20 +3393,10 @@ class NEPAReview_KMRD(object):
 
         connection = r'{'ExamplePath'}'
         
-        guideDay = '{}GUIDEDREC_DAY'.format(connection)
-        guideStop = '{}GUIDEDREC_STOP'.format(connection)
-        guideActivity = '{}GUIDEDREC_ACTIVITY'.format(connection)
-        huntDay = '{}HUNTING_DAY'.format(connection)
-        huntStop = '{}HUNTING_STOP'.format(connection)
-        huntActivity = '{}HUNTING_ACTIVITY'.format(connection)
         outTable ='{}OUTFITTING_ACTIVITY'.format(connection)
         locTable = '{}LOCATION'.format(connection)
 
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames
-
         """List of Full Name use areas that are in the Shoreline II area."""
 
         
@@ -4111,9 +3406,7 @@ class NEPAReview_KMRD(object):
                      'K28 NAHA BAY']
 
 
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
+        locDF = read_table(locTable, self.fields)
         locDF['USELOCATION'].str.upper()
 
 
@@ -4134,26 +3427,13 @@ class NEPAReview_KMRD(object):
         sure that sum is not greater than the total number of clinets on the day by use area and season. If the client number sum is greater than the total clents on the day, we use total clients on 
         the day. """
 
-        guideDayCol = getFieldNames(guideDay)
         guideDayWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        guideDayData = [row for row in arcpy.da.SearchCursor(guideDay, guideDayCol, where_clause=guideDayWhere)]
-        guideDayDF = pd.DataFrame(guideDayData, columns=guideDayCol)
-       
-        guideStopCol = getFieldNames(guideStop)
-        guideStopData = [row for row in arcpy.da.SearchCursor(guideStop, guideStopCol)]
-        guideStopDF = pd.DataFrame(guideStopData, columns = guideStopCol) 
-        
-        guideActCol = getFieldNames(guideActivity)
-        guideActData = [row for row in arcpy.da.SearchCursor(guideActivity, guideActCol)]
-        guideActDF = pd.DataFrame(guideActData, columns = guideActCol)
-
-        guideDF1 = guideActDF.merge(guideStopDF, how = 'inner', on= 'STOP_GUID')
-        guideDF = guideDF1.merge(guideDayDF, how = 'inner', on = 'DAY_GUID')                 
+        guideDF = read_facts(connection, 'GUIDEDREC', self.fields, day_where=guideDayWhere, location=True)
 
         guideDF['Year'] = guideDF['TRIPDATE'].dt.year
            
         guideDF['USELOCATION'].str.upper()
-        guideLoc = guideDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID']) 
+        guideLoc = with_location(guideDF)
         
         guideLoc['keep'] = guideLoc['FULLNAME'].apply(lambda x: 'True' if x in kmrd2 else 'False')
         
@@ -4166,25 +3446,12 @@ class NEPAReview_KMRD(object):
         guideRec = guideActGroup[['SEASON', 'FULLNAME', 'Year', 'USE']]
          
         
-        huntDayCol = getFieldNames(huntDay)
         huntDayWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        huntDayData = [row for row in arcpy.da.SearchCursor(huntDay, huntDayCol, where_clause=huntDayWhere)]
-        huntDayDF = pd.DataFrame(huntDayData, columns=huntDayCol)
-       
-        huntStopCol = getFieldNames(huntStop)
-        huntStopData = [row for row in arcpy.da.SearchCursor(huntStop, huntStopCol)]  
-        huntStopDF = pd.DataFrame(huntStopData, columns = huntStopCol)
-        
-        huntActCol = getFieldNames(huntActivity)
-        huntActData = [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol)] 
-        huntActDF = pd.DataFrame(huntActData, columns = huntActCol)
-        
-        huntDF1 = huntActDF.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-        huntDF = huntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')
+        huntDF = read_facts(connection, 'HUNTING', self.fields, day_where=huntDayWhere, location=True)
         huntDF['Year'] = huntDF['TRIPDATE'].dt.year        
       
         huntDF['USELOCATION'].str.upper()
-        huntLoc = huntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID'])
+        huntLoc = with_location(huntDF)
         
         huntLoc['keep'] = huntLoc['FULLNAME'].apply(lambda x: 'True' if x in kmrd2 else 'False')
         
@@ -4198,10 +3465,8 @@ class NEPAReview_KMRD(object):
         
 
         
-        outfitCol = getFieldNames(outTable)
         outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        outfitData = [row for row in arcpy.da.SearchCursor(outTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)
+        outfitDF = read_table(outTable, self.fields, where=outfitWhere)
         outfitDF['Year'] = outfitDF['TRIPDATE'].dt.year
         outfitDF['USELOCATION'].str.upper()
         outfitLoc = outfitDF.merge(locDF, how = 'inner', on = ['LOCATION_ID', 'USELOCATION'])
@@ -4378,7 +3643,7 @@ class ConfirmActualUse(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        params = [param0, param1, param2, param3, snapshot_parameter()]
         
         return params       
     
@@ -4398,6 +3663,11 @@ class ConfirmActualUse(object):
         return
 
     def execute(self, parameters, messages):
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
         """The source code of the tool."""
         
         forestname = parameters[0].value
@@ -4412,29 +3682,10 @@ class ConfirmActualUse(object):
         self.savefile = "ConfirmUseReportSummary_" + start + "_" + end + ".xlsx"
         self.path = os.path.join(savepath, self.savefile)
 
-
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames 
  
                 
         connection = r'{'ExamplePath'}'
 
-            
-        iceTable = '{}ICEFIELD_TRIPMONTH'.format(connection) 
-
-        guideTable = '{}GUIDEDREC_TRIP'.format(connection)
- 
-        huntTable = '{}HUNTING_TRIP'.format(connection)
-        
-        heliTable ='{}HELISKI_TRIP'.format(connection)
-
-        mendTable = '{}MENDENHALL_TRIPMONTH'.format(connection)
-
-        outfitTable ='{}OUTFITTING_ACTIVITY'.format(connection)
-
-
-
         startdate = '1980-01-01 00:00:00'
         st = datetime.strptime(startdate, '%Y-%m-%d %H:%M:%S')
         stReplace = st.replace(year = int(startYear))
@@ -4444,67 +3695,13 @@ class ConfirmActualUse(object):
         end = datetime.strptime(enddate, '%Y-%m-%d %H:%M:%S')
         endReplace = end.replace(year = int(endYear))   
 
-        iceCol = getFieldNames(iceTable)
-        iceWhere = "REPORTYEAR >= {} AND REPORTYEAR <= {}".format(startYear, endYear)
-        iceData =[row for row in arcpy.da.SearchCursor(iceTable, iceCol, where_clause=iceWhere)]
-        iceDF = pd.DataFrame(iceData, columns=iceCol)
-        iceDF['Year'] = iceDF['REPORTYEAR'] 
-        iceDF.loc[iceDF['NO_OPERATION'] == 'Yes', 'Number of Trips'] = 0.1
-        iceDF['Number of Trips'].fillna(1, inplace = True)
-
-        icePivot = pd.pivot_table(iceDF, index = ['BUSINESSNAME'], columns = ['Year'], values = ['Number of Trips'], aggfunc=np.sum, margins = False, dropna = False, margins_name = 'Total')
-
-                             
-        guideCol = getFieldNames(guideTable)
-        guideWhere = "STARTDATE >= timestamp '{}' AND ENDDATE <= timestamp '{}' AND FORESTNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), forestname)
-       
-        guideData = [row for row in arcpy.da.SearchCursor(guideTable, guideCol, where_clause=guideWhere)]
-        guideDF = pd.DataFrame(guideData, columns=guideCol)
-        
-        guideDF['Year'] = guideDF['STARTDATE'].dt.year
-        guideDF.loc[guideDF['NO_OPERATION'] == 'Yes', 'Number of Trips'] = 0.1
-        guideDF['Number of Trips'].fillna(1, inplace = True)
-        guidePivot = pd.pivot_table(guideDF, index = ['BUSINESSNAME'], columns = ['Year'], values = ['Number of Trips'], aggfunc=np.sum, margins = False, dropna = False, margins_name = 'Total')
-
-        
-        huntCol = getFieldNames(huntTable)
-        huntWhere = "STARTDATE >= timestamp '{}' AND ENDDATE <= timestamp '{}' AND FORESTNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), forestname)
-        huntData = [row for row in arcpy.da.SearchCursor(huntTable, huntCol, where_clause=huntWhere)]
-        huntDF = pd.DataFrame(huntData, columns=huntCol)
-        huntDF['Year'] = huntDF['STARTDATE'].dt.year
-        huntDF.loc[huntDF['NO_OPERATION'] == 'YES', 'Number of Trips'] = 0.1
-        huntDF['Number of Trips'].fillna(1, inplace = True)
-        huntPivot = pd.pivot_table(huntDF, index = ['BUSINESSNAME'], columns = ['Year'], values = ['Number of Trips'], aggfunc=np.sum, margins = False, dropna = False, margins_name = 'Total')        
-
-
-        heliCol = getFieldNames(heliTable)
-        heliWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND FORESTNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), forestname)
-        heliData = [row for row in arcpy.da.SearchCursor(heliTable, heliCol, where_clause=heliWhere)]
-        heliDF = pd.DataFrame(heliData, columns=heliCol) 
-        heliDF['Year'] = heliDF['TRIPDATE'].dt.year
-        heliDF.loc[heliDF['NO_OPERATION'] == 'Yes', 'Number of Trips'] = 0.1
-        heliDF['Number of Trips'].fillna(1, inplace = True) 
-        heliPivot = pd.pivot_table(heliDF, index = ['BUSINESSNAME'], columns = ['Year'], values = ['Number of Trips'], aggfunc=np.sum, margins = False, dropna = False, margins_name = 'Total')        
-
-       
-        mendCol = getFieldNames(mendTable)
-        mendWhere = "REPORTYEAR >= {} AND REPORTYEAR <= {}".format(startYear, endYear)
-        mendData = [row for row in arcpy.da.SearchCursor(mendTable, mendCol, where_clause=mendWhere)]
-        mendDF = pd.DataFrame(mendData, columns=mendCol)
-        mendDF['Year'] = mendDF['REPORTYEAR']
-        mendDF.loc[mendDF['NO_OPERATION'] == 'Yes', 'Number of Trips'] = 0.1
-        mendDF['Number of Trips'].fillna(1, inplace = True)  
-        mendPivot = pd.pivot_table(mendDF, index = ['BUSINESSNAME'], columns = ['Year'], values = ['Number of Trips'], aggfunc=np.sum, margins = False, dropna = False, margins_name = 'Total')        
-
-        
-        outfitCol = getFieldNames(outfitTable)
-        outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND FORESTNAME = '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), forestname)
-        outfitData = [row for row in arcpy.da.SearchCursor(outfitTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)
-        outfitDF['Year'] = outfitDF['TRIPDATE'].dt.year
-        outfitDF.loc[outfitDF['NO_OPERATION'] == 'Yes', 'Number of Trips'] = 0.1
-        outfitDF['Number of Trips'].fillna(1, inplace = True)  
-        outfitPivot = pd.pivot_table(outfitDF, index = ['BUSINESSNAME'], columns = ['Year'], values = ['Number of Trips'], aggfunc=np.sum, margins = False, dropna = False, margins_name = 'Total')
+        """The tables, trip counts and pivots of each sheet are in report_specs.CONFIRM_USE"""
+        specParams = {'forest': forestname,
+                      'startYear': startYear,
+                      'endYear': endYear,
+                      'start': stReplace.strftime('%Y-%m-%d %H:%M:%S'),
+                      'end': endReplace.strftime('%Y-%m-%d %H:%M:%S')}
+        pivots = run_spec(CONFIRM_USE, connection, specParams)
 
         
         writer_args = {
@@ -4541,33 +3738,13 @@ class ConfirmActualUse(object):
     
         with pd.ExcelWriter(**writer_args) as xlsx:
 
-            guidePivot.to_excel(xlsx, 'Guided Rec')
-            huntPivot.to_excel(xlsx, 'Guided Hunting')
-            outfitPivot.to_excel(xlsx, 'Outfitting')
-            heliPivot.to_excel(xlsx, 'Heliski')            
-            if forestname == 'Tongass':
-                icePivot.to_excel(xlsx, 'Icefield')
-                mendPivot.to_excel(xlsx, 'Mendenhall')
-                iceWS = xlsx.sheets['Icefield']
-                mendWS = xlsx.sheets['Mendenhall']
-
-
-            guideWS = xlsx.sheets['Guided Rec']
-            huntWS = xlsx.sheets['Guided Hunting']
-            outfitWS = xlsx.sheets['Outfitting']
-            heliWS = xlsx.sheets['Heliski']
-            
-      
+            sheets = write_sheets(xlsx, CONFIRM_USE, pivots)
 
-            
             def excelRow(ws, rows, styles):
-                for row in ws[rows]:
-                    for cell in row:
-                        cell.style = styles
+                style_range(ws, rows, styles)
             
             def excelStyle(ws, cells, styles):
-                for cell in ws[cells]:
-                    cell.style = styles
+                style_range(ws, cells, styles)
                     
             def noUse(ws):
                 for r in range(3,ws.max_row+1):
@@ -4601,23 +3778,9 @@ class ConfirmActualUse(object):
                 excelStyle(ws, title_row1, title_style) 
                 excelStyle(ws, title_row2, title_style)
                
-            def title(ws, datasetName):
-                ws.insert_rows(1, amount= 6)
-                title = 'Actual Use Report Submissions - Number of Trip Records Submitted by Year'
-                reportDate = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
-                forestTitle = 'Forest: {} National Forest'.format(forestname)
-                dataTitle = 'Dataset: {}'.format(datasetName)
-                ws['A1'] = title
-                ws['A1'].font = Font(name='Calibri', size=11, bold=True, color='000000')
-                ws['A1'].alignment = Alignment(horizontal='left', wrapText = True, vertical='center')
-                ws['A3'] = reportDate
-                ws['A4'] = forestTitle
-                ws['A5'] = dataTitle
-                ws.delete_rows(7, 1)
-                
-            def title1(ws, datasetName):
+            def title(ws, datasetName, records):
                 ws.insert_rows(1, amount= 6)
-                title = 'Actual Use Report Submissions - Number of Trip-Month Records Submitted by Year'
+                title = 'Actual Use Report Submissions - Number of {} Records Submitted by Year'.format(records)
                 reportDate = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
                 forestTitle = 'Forest: {} National Forest'.format(forestname)
                 dataTitle = 'Dataset: {}'.format(datasetName)
@@ -4628,29 +3791,12 @@ class ConfirmActualUse(object):
                 ws['A4'] = forestTitle
                 ws['A5'] = dataTitle
                 ws.delete_rows(7, 1)
-                    
-            wsLayout(guideWS)
-            wsLayout(huntWS)
-            wsLayout(outfitWS)
-            wsLayout(heliWS)
-            if forestname == 'Tongass':  
-                wsLayout(iceWS)
-                wsLayout(mendWS) 
-                        
-            noUse(guideWS)
-            noUse(heliWS)
-            noUse(outfitWS)
-            if forestname == 'Tongass':
-                noUse(iceWS)
-                noUse(mendWS)
-
-            title(guideWS, 'Guided Recreation')
-            title(huntWS, 'Guided Hunting')
-            title(outfitWS, 'Outfitting')
-            title(heliWS, 'Heliski')
-            if forestname == 'Tongass':
-                title1(iceWS, 'Icefields')
-                title1(mendWS, 'Mendenhall')
+
+            for ws, options in sheets:
+                wsLayout(ws)
+                if options.get('noUse'):
+                    noUse(ws)
+                title(ws, options['dataset'], options['records'])
             
         return
     
@@ -4660,6 +3806,10 @@ class WildernessSummary(object):
         self.label = "Run Wilderness Summary"
         self.description = ""
         self.canRunInBackground = False
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['ACTIVITY', 'CLIENTNUMBER', 'DAY_GUID', 'DISTRICTNAME', 'FORESTNAME', 'FULLNAME', 'LOCATION_ID',
+                       'MAXCLIENTS', 'SEASON', 'STOP_GUID', 'TOTALCLIENTSONDAY', 'TRIPDATE', 'TRIP_GUID', 'USELOCATION',
+                       'USE_AREA', 'WILDERNESSNAME', 'ZONE_NAME']
         self.params = self.getParameterInfo()
         
     def getParameterInfo(self):
@@ -4708,7 +3858,7 @@ class WildernessSummary(object):
             direction="Input")
         param3.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3]
+        params = [param0, param1, param2, param3, snapshot_parameter()]
         
         return params
 
@@ -4726,12 +3876,12 @@ class WildernessSummary(object):
         return
 
     def execute(self, parameters, messages):
-        
-        """ Function to get list of field names in a table"""
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames
             
            
 
@@ -4758,15 +3908,7 @@ class WildernessSummary(object):
         
         connection = r'{'ExamplePath'}'
 
-        guideTrip = '{}GUIDEDREC_TRIP'.format(connection)
-        guideDay = '{}GUIDEDREC_DAY'.format(connection)
-        guideStop = '{}GUIDEDREC_STOP'.format(connection)
-        guideActivity = '{}GUIDEDREC_ACTIVITY'.format(connection)
-        huntTrip = '{}HUNTING_TRIP'.format(connection)
         huntHunt = '{}HUNTING_HUNTER'.format(connection)
-        huntDay = '{}HUNTING_DAY'.format(connection)
-        huntStop = '{}HUNTING_STOP'.format(connection)
-        huntActivity = '{}HUNTING_ACTIVITY'.format(connection)
         outTable ='{}OUTFITTING_ACTIVITY'.format(connection)
         locTable = '{}LOCATION'.format(connection)
         
@@ -4785,78 +3927,29 @@ class WildernessSummary(object):
         
         """Creating Guided Recreation DataFrames and filtering data by the report timeframe"""
         
-        guideTripCol = getFieldNames(guideTrip)
-        guideDayCol = getFieldNames(guideDay)
-        guideStopCol = getFieldNames(guideStop)
-        guideActCol = getFieldNames(guideActivity)        
  
-        guideTripData = [row for row in arcpy.da.SearchCursor(guideTrip, guideTripCol)]   
-        guideTripDF = pd.DataFrame(guideTripData, columns = guideTripCol)
-
         guideWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        guideData = [row for row in arcpy.da.SearchCursor(guideDay, guideDayCol, where_clause=guideWhere)]
-        guideDayDF = pd.DataFrame(guideData, columns = guideDayCol)
-
-        guideStopData = [row for row in arcpy.da.SearchCursor(guideStop, guideStopCol)]
-        guideStopDF = pd.DataFrame(guideStopData, columns = guideStopCol)
-
-        guideActData =[row for row in arcpy.da.SearchCursor(guideActivity, guideActCol)]  
-        guideActDF = pd.DataFrame(guideActData, columns = guideActCol)
-        
-        
-        if (guideDayDF.empty == False):
-            if (guideStopDF.empty ==False):
-                if (guideActDF.empty == False):
-                    if (guideTripDF. empty == False): 
-                        guideDF1 = guideActDF.merge(guideStopDF, how = 'inner', on= 'STOP_GUID')
-                        guideDF2 = guideDF1.merge(guideDayDF, how = 'inner', on = 'DAY_GUID')
-                        guideDF = guideDF2.merge(guideTripDF, how='inner', on='TRIP_GUID')
+        guideFacts = read_facts(connection, 'GUIDEDREC', self.fields, day_where=guideWhere, trip=True, location=True)
+        if (guideFacts.empty == False):
+            guideDF = guideFacts
         
         """Creating Hunting Data Frames and filtering data by the report timeframe"""        
 
-        huntTripCol = getFieldNames(huntTrip)
-        huntDayCol = getFieldNames(huntDay)
-        huntStopCol = getFieldNames(huntStop)
-        huntActCol = getFieldNames(huntActivity)
     
-        huntTripData = [row for row in arcpy.da.SearchCursor(huntTrip, huntTripCol)]  
-        huntTripDF = pd.DataFrame(huntTripData, columns = huntTripCol)
-        
-
         huntWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        huntDayData = [row for row in arcpy.da.SearchCursor(huntDay, huntDayCol, where_clause=huntWhere)]
-        huntDayDF = pd.DataFrame(huntDayData, columns = huntDayCol)
-
-        huntStopData = [row for row in arcpy.da.SearchCursor(huntStop, huntStopCol)]
-        huntStopDF = pd.DataFrame(huntStopData, columns = huntStopCol)
-         
-        huntActData =  [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol)]  
-        huntActDF = pd.DataFrame(huntActData, columns = huntActCol)
-        
-        if (huntDayDF.empty == False):
-            if (huntStopDF.empty == False):
-                if (huntActDF.empty == False):
-                    huntDF1 = huntActDF.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-                    huntDF2 = huntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')
-                    huntDF = huntDF2.merge(huntTripDF, how = 'inner', on = 'TRIP_GUID')
+        huntFacts = read_facts(connection, 'HUNTING', self.fields, day_where=huntWhere, trip=True, location=True)
+        if (huntFacts.empty == False):
+            huntDF = huntFacts
                                            
         
         """Creating Outfitting data frame in the date range"""
 
-        outfitCol = getFieldNames(outTable)
         outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        outfitData = [row for row in arcpy.da.SearchCursor(outTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)        
+        outfitDF = read_table(outTable, self.fields, where=outfitWhere)
 
 
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
-        locDF['FULLNAME'].fillna(locDF['ZONE_NAME'], inplace=True)
-        locDF['USE_AREA'] = locDF['FULLNAME']
-        locDF['USE_AREA'].fillna('Use Area Unknown', inplace=True)
+        locDF = fill_locations(read_table(locTable, self.fields))
         locDF['USELOCATION'].str.upper()
-        locDF['DISTRICTNAME'].fillna('Ranger District Unknown', inplace = True)
         
         
         """ Activity Dictionary to account for differences in the activity categories and what is listed in each of the datasets. """
@@ -4898,7 +3991,7 @@ class WildernessSummary(object):
 
             
             guideDF['USELOCATION'].str.upper()
-            guideLoc = guideDF.merge(locDF, how = 'left', on = ['LOCATION_ID'])
+            guideLoc = with_location(guideDF, fill_locations)
 
             guideLoc.rename(columns={'USELOCATION_x':'USELOCATION', 'MAXCLIENTS':'Total Clients', 'CLIENTNUMBER':'Activity Client Number'}, inplace=True)
             guide = guideLoc[['Activity2', 'Year', 'FORESTNAME', 'DISTRICTNAME', 'Total Clients', 'USELOCATION', 'TRIP_GUID', 'Activity Client Number', 'WILDERNESSNAME', 'SEASON']].copy() 
@@ -4913,7 +4006,7 @@ class WildernessSummary(object):
             huntDF['Year'] = huntDF['TRIPDATE'].dt.year           
             huntDF['USELOCATION'].str.upper()
 
-            huntLoc = huntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID']) 
+            huntLoc = with_location(huntDF, fill_locations)
             huntLoc.rename(columns={'USELOCATION_x':'USELOCATION', 'MAXCLIENTS':'Total Clients', 'CLIENTNUMBER':'Activity Client Number'}, inplace=True)
             hunt = huntLoc[['Activity2', 'Year', 'FORESTNAME', 'DISTRICTNAME', 'Total Clients', 'USELOCATION', 'TRIP_GUID', 'Activity Client Number', 'WILDERNESSNAME', 'SEASON']].copy()
             
@@ -5003,13 +4096,10 @@ class WildernessSummary(object):
             ws.oddFooter.left.text = footer
             
         def excelRow(ws, rows, styles):
-            for row in ws[rows]:
-                for cell in row:
-                    cell.style = styles
+            style_range(ws, rows, styles)
         
         def excelStyle(ws, cells, styles):
-            for cell in ws[cells]:
-                cell.style = styles
+            style_range(ws, cells, styles)
 
         def excelUpdate(ws):
             title_row = '1'
@@ -5090,6 +4180,9 @@ class HeliskiSummary(object):
         self.label = "Run Heliski Summary"
         self.description = ""
         self.canRunInBackground = False
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['ACTIVITY', 'CLIENTS_LOCATION', 'DISTRICTNAME', 'FORESTNAME', 'FULLNAME', 'LOCATION_ID',
+                       'TOTALCLIENTSONDAY', 'TRIPDATE', 'TRIP_GUID', 'USELOCATION', 'USE_AREA', 'ZONE_NAME']
         self.params = self.getParameterInfo()
         
     def getParameterInfo(self):
@@ -5147,7 +4240,7 @@ class HeliskiSummary(object):
             direction="Input")
         param4.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3, param4]
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
         
         return params
 
@@ -5179,12 +4272,12 @@ class HeliskiSummary(object):
 		return
 
     def execute(self, parameters, messages):
-        
-        """ Function to get list of field names in a table"""
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames
             
            
 
@@ -5227,24 +4320,18 @@ class HeliskiSummary(object):
                     
         """ Creating Heliski dataframes in the date range and for the specific business name"""
 
-        heliTripCol = getFieldNames(heliTrip)
-        heliActCol = getFieldNames(heliActivity)
 
         heliWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        heliData = [row for row in arcpy.da.SearchCursor(heliTrip, heliTripCol, where_clause=heliWhere)]
-        heliTripDF = pd.DataFrame(heliData, columns=heliTripCol)   
+        heliTripDF = read_table(heliTrip, self.fields, where=heliWhere)
 
-        heliActData = [row for row in arcpy.da.SearchCursor(heliActivity, heliActCol)]
-        heliActDF = pd.DataFrame(heliActData, columns = heliActCol)
+        heliActDF = read_where_in(heliActivity, 'TRIP_GUID', heliTripDF['TRIP_GUID'], self.fields)
         
         if (heliTripDF.empty == False):
             if (heliActDF.empty == False):
                 heliDF = heliActDF.merge(heliTripDF, how = 'inner', on='TRIP_GUID')
         
 
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
+        locDF = read_table(locTable, self.fields)
         locDF['FULLNAME'].fillna(locDF['ZONE_NAME'], inplace=True)
         locDF['USE_AREA'] = locDF['FULLNAME']
         locDF['USE_AREA'].fillna('Use Area Unknown', inplace=True)
@@ -5343,13 +4430,10 @@ class HeliskiSummary(object):
             ws.oddFooter.left.text = footer
             
         def excelRow(ws, rows, styles):
-            for row in ws[rows]:
-                for cell in row:
-                    cell.style = styles
+            style_range(ws, rows, styles)
         
         def excelStyle(ws, cells, styles):
-            for cell in ws[cells]:
-                cell.style = styles
+            style_range(ws, cells, styles)
 
         def excelUpdate(ws):
             title_row = '1'
@@ -5417,6 +4501,12 @@ class VisitationSummary(object):
         self.label = "Run Visitation Summary"
         self.description = ""
         self.canRunInBackground = False
+        # Fields this report uses, the table reads only pull these
+        self.fields = ['ACTIVITY', 'BIKING', 'CANOEING', 'CLIENTMONTH', 'CLIENTNUMBER', 'CLIENTSDOGSLED',
+                       'CLIENTSGLACTREK', 'CLIENTSHIKE', 'CLIENTSLOCATION', 'CLIENTS_LOCATION', 'DAY_GUID', 'DISTRICTNAME',
+                       'FORESTNAME', 'FULLNAME', 'HIKING', 'KAYAKING', 'LDNGGRATUITY', 'LDNGOPS', 'LDNGPAIDCLIENTS',
+                       'LOCATION_ID', 'MAXCLIENTS', 'RAFTING', 'REPORTYEAR', 'STOP_GUID', 'TOTALCLIENTSONDAY',
+                       'TOTCLIENTSALLZONES', 'TRIPDATE', 'TRIP_GUID', 'USELOCATION', 'USE_AREA', 'VCTRANSPORT', 'ZONE_NAME']
         self.params = self.getParameterInfo()
         
     def getParameterInfo(self):
@@ -5474,7 +4564,7 @@ class VisitationSummary(object):
             direction="Input")
         param4.filter.list = ["File System"]
 
-        params = [param0, param1, param2, param3, param4]
+        params = [param0, param1, param2, param3, param4, snapshot_parameter()]
         
         return params
 
@@ -5505,12 +4595,12 @@ class VisitationSummary(object):
         return
 
     def execute(self, parameters, messages):
-        
-        """ Function to get list of field names in a table"""
+        """Runs the report off the snapshot folder in the last parameter, SDE when it is left empty"""
+        with use_snapshot(parameters[-1].valueAsText):
+            self._execute(parameters, messages)
+
+    def _execute(self, parameters, messages):
 
-        def getFieldNames(shp):
-                fieldnames = [f.name for f in arcpy.ListFields(shp)]
-                return fieldnames
             
            
 
@@ -5546,15 +4636,7 @@ class VisitationSummary(object):
 
         iceTrip = '{}ICEFIELD_TRIPMONTH'.format(connection) 
         iceAct = '{}ICEFIELD_ACTIVITY'.format(connection)
-        guideTrip = '{}GUIDEDREC_TRIP'.format(connection)
-        guideDay = '{}GUIDEDREC_DAY'.format(connection)
-        guideStop = '{}GUIDEDREC_STOP'.format(connection)
-        guideActivity = '{}GUIDEDREC_ACTIVITY'.format(connection)
-        huntTrip = '{}HUNTING_TRIP'.format(connection)
         huntHunt = '{}HUNTING_HUNTER'.format(connection)
-        huntDay = '{}HUNTING_DAY'.format(connection)
-        huntStop = '{}HUNTING_STOP'.format(connection)
-        huntActivity = '{}HUNTING_ACTIVITY'.format(connection)
         heliTrip ='{}HELISKI_TRIP'.format(connection)
         heliActivity = '{}HELISKI_ACTIVITY'.format(connection)
         mendTrip = '{}MENDENHALL_TRIPMONTH'.format(connection)
@@ -5576,17 +4658,13 @@ class VisitationSummary(object):
             
         """Creating Icefield dataframes and filtering data by the report timeframe and business name"""
 
-        iceTripCol = getFieldNames(iceTrip)
-        iceActCol = getFieldNames(iceAct)
         
         iceWhere = "REPORTYEAR>= {} AND REPORTYEAR<= {}".format(startYear, endYear)
-        iceTripData =[row for row in arcpy.da.SearchCursor(iceTrip, iceTripCol, where_clause=iceWhere)]
+        iceTripDF = read_table(iceTrip, self.fields, where=iceWhere)
 
         iceActWhere = "FORESTNAME IN {}".format(allForests) 
-        iceActData = [row for row in arcpy.da.SearchCursor(iceAct, iceActCol, where_clause = iceActWhere)]
+        iceActDF = read_where_in(iceAct, 'TRIP_GUID', iceTripDF['TRIP_GUID'], self.fields, where=iceActWhere)
 
-        iceTripDF =  pd.DataFrame(iceTripData, columns = iceTripCol)
-        iceActDF = pd.DataFrame(iceActData, columns = iceActCol)
         
         if (iceTripDF.empty == False):
             if (iceActDF.empty == False):
@@ -5594,76 +4672,31 @@ class VisitationSummary(object):
         
         """Creating Guided Recreation DataFrames and filtering data by the report timeframe and business name"""
         
-        guideTripCol = getFieldNames(guideTrip)
-        guideDayCol = getFieldNames(guideDay)
-        guideStopCol = getFieldNames(guideStop)
-        guideActCol = getFieldNames(guideActivity)
         
-        guideTripWhere = "FORESTNAME IN {}".format(allForests) 
-        guideTripData = [row for row in arcpy.da.SearchCursor(guideTrip, guideTripCol, where_clause=guideTripWhere)]   
-        guideTripDF = pd.DataFrame(guideTripData, columns = guideTripCol)
-
         guideWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        guideData = [row for row in arcpy.da.SearchCursor(guideDay, guideDayCol, where_clause=guideWhere)]
-        guideDayDF = pd.DataFrame(guideData, columns = guideDayCol)
-
         guideStopWhere = "FORESTNAME IN {}".format(allForests) 
-        guideStopData = [row for row in arcpy.da.SearchCursor(guideStop, guideStopCol)]
-        guideStopDF = pd.DataFrame(guideStopData, columns = guideStopCol)
-
-        guideActData =[row for row in arcpy.da.SearchCursor(guideActivity, guideActCol)]  
-        guideActDF = pd.DataFrame(guideActData, columns = guideActCol)
-        
-        
-        if (guideDayDF.empty == False):
-            if (guideStopDF.empty ==False):
-                if (guideActDF.empty == False):
-                    if (guideTripDF. empty == False): 
-                        guideDF1 = guideActDF.merge(guideStopDF, how = 'inner', on= 'STOP_GUID')
-                        guideDF2 = guideDF1.merge(guideDayDF, how = 'inner', on = 'DAY_GUID')
-                        guideDF = guideDF2.merge(guideTripDF, how='inner', on='TRIP_GUID')
+        guideTripWhere = "FORESTNAME IN {}".format(allForests) 
+        guideFacts = read_facts(connection, 'GUIDEDREC', self.fields, day_where=guideWhere, trip_where=guideTripWhere, trip=True, location=True)
+        if (guideFacts.empty == False):
+            guideDF = guideFacts
         
         """Creating Hunting Data Frames to only get the non-hunting activities and filtering data by the report timeframe and business name"""        
 
-        huntTripCol = getFieldNames(huntTrip)
-        huntDayCol = getFieldNames(huntDay)
-        huntStopCol = getFieldNames(huntStop)
-        huntActCol = getFieldNames(huntActivity)
     
-        huntTripWhere = "FORESTNAME IN {}".format(allForests) 
-        huntTripData = [row for row in arcpy.da.SearchCursor(huntTrip, huntTripCol, where_clause=huntTripWhere)]  
-        huntTripDF = pd.DataFrame(huntTripData, columns = huntTripCol)
-        
-
         huntWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}'".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'))
-        huntDayData = [row for row in arcpy.da.SearchCursor(huntDay, huntDayCol, where_clause=huntWhere)]
-        huntDayDF = pd.DataFrame(huntDayData, columns = huntDayCol)
-
-        huntStopData = [row for row in arcpy.da.SearchCursor(huntStop, huntStopCol)]
-        huntStopDF = pd.DataFrame(huntStopData, columns = huntStopCol)
-         
-        huntActData =  [row for row in arcpy.da.SearchCursor(huntActivity, huntActCol)]  
-        huntActDF = pd.DataFrame(huntActData, columns = huntActCol)
-        
-        if (huntDayDF.empty == False):
-            if (huntStopDF.empty == False):
-                if (huntActDF.empty == False):
-                    huntDF1 = huntActDF.merge(huntStopDF, how = 'inner', on = 'STOP_GUID')
-                    huntDF2 = huntDF1.merge(huntDayDF, how= 'inner', on = 'DAY_GUID')
-                    huntDF = huntDF2.merge(huntTripDF, how = 'inner', on = 'TRIP_GUID')
+        huntTripWhere = "FORESTNAME IN {}".format(allForests) 
+        huntFacts = read_facts(connection, 'HUNTING', self.fields, day_where=huntWhere, trip_where=huntTripWhere, trip=True, location=True)
+        if (huntFacts.empty == False):
+            huntDF = huntFacts
                                            
         
         """ Creating Heliski dataframes in the date range and for the specific business name"""
 
-        heliTripCol = getFieldNames(heliTrip)
-        heliActCol = getFieldNames(heliActivity)
 
         heliWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND FORESTNAME IN {}".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), allForests)
-        heliData = [row for row in arcpy.da.SearchCursor(heliTrip, heliTripCol, where_clause=heliWhere)]
-        heliTripDF = pd.DataFrame(heliData, columns=heliTripCol)   
+        heliTripDF = read_table(heliTrip, self.fields, where=heliWhere)
         
-        heliActData = [row for row in arcpy.da.SearchCursor(heliActivity, heliActCol)]
-        heliActDF = pd.DataFrame(heliActData, columns = heliActCol)
+        heliActDF = read_where_in(heliActivity, 'TRIP_GUID', heliTripDF['TRIP_GUID'], self.fields)
         
         if (heliTripDF.empty == False):
             if (heliActDF.empty == False):
@@ -5672,17 +4705,13 @@ class VisitationSummary(object):
         
         """Creating Mendenhall datafrmaes in the date range and for the specific business name"""
 
-        mendTripCol = getFieldNames(mendTrip)
-        mendActCol = getFieldNames(mendActivity)
         
         
         mendWhere = "REPORTYEAR >= {} AND REPORTYEAR <= {}".format(startYear, endYear)
-        mendData = [row for row in arcpy.da.SearchCursor(mendTrip, mendTripCol, where_clause=mendWhere)]
-        mendTripDF = pd.DataFrame(mendData, columns=mendTripCol)
+        mendTripDF = read_table(mendTrip, self.fields, where=mendWhere)
 
         mendActWhere = "FORESTNAME IN {}".format(allForests) 
-        mendActData = [row for row in arcpy.da.SearchCursor(mendActivity, mendActCol, where_clause=mendActWhere)]
-        mendActDF = pd.DataFrame(mendActData, columns=mendActCol) 
+        mendActDF = read_where_in(mendActivity, 'TRIP_GUID', mendTripDF['TRIP_GUID'], self.fields, where=mendActWhere)
         
         if (mendTripDF.empty == False):
             if (mendActDF.empty == False):
@@ -5690,20 +4719,12 @@ class VisitationSummary(object):
         
         """Creating Outfitting data frame in the date range and for the specific business name"""
 
-        outfitCol = getFieldNames(outTable)
         outfitWhere = "TRIPDATE >= timestamp '{}' AND TRIPDATE <= timestamp '{}' AND FORESTNAME IN {}".format(stReplace.strftime('%Y-%m-%d %H:%M:%S'), endReplace.strftime('%Y-%m-%d %H:%M:%S'), allForests)
-        outfitData = [row for row in arcpy.da.SearchCursor(outTable, outfitCol, where_clause=outfitWhere)]
-        outfitDF = pd.DataFrame(outfitData, columns=outfitCol)        
+        outfitDF = read_table(outTable, self.fields, where=outfitWhere)
 
 
-        locCol = getFieldNames(locTable)
-        locData =[row for row in arcpy.da.SearchCursor(locTable, locCol)]
-        locDF = pd.DataFrame(locData, columns = locCol)
-        locDF['FULLNAME'].fillna(locDF['ZONE_NAME'], inplace=True)
-        locDF['USE_AREA'] = locDF['FULLNAME']
-        locDF['USE_AREA'].fillna('Use Area Unknown', inplace=True)
+        locDF = fill_locations(read_table(locTable, self.fields))
         locDF['USELOCATION'].str.upper()
-        locDF['DISTRICTNAME'].fillna('Ranger District Unknown', inplace = True)
         
         
         """ Activity Dictionary to account for differences in the activity categories and what is listed in each of the datasets. """
@@ -5769,7 +4790,7 @@ class VisitationSummary(object):
 
             
             guideDF['USELOCATION'].str.upper()
-            guideLoc = guideDF.merge(locDF, how = 'left', on = ['LOCATION_ID'])
+            guideLoc = with_location(guideDF, fill_locations)
 
             guideLoc.rename(columns={'USELOCATION_x':'USELOCATION', 'MAXCLIENTS':'Total Clients', 'CLIENTNUMBER':'Activity Client Number'}, inplace=True)
             guide = guideLoc[['Activity2', 'Year', 'FORESTNAME', 'DISTRICTNAME', 'Total Clients', 'USELOCATION', 'TRIP_GUID', 'Activity Client Number']].copy() 
@@ -5784,7 +4805,7 @@ class VisitationSummary(object):
             huntDF['Year'] = huntDF['TRIPDATE'].dt.year           
             huntDF['USELOCATION'].str.upper()
 
-            huntLoc = huntDF.merge(locDF, how = 'left', left_on = ['LOCATION_ID'], right_on = ['LOCATION_ID']) 
+            huntLoc = with_location(huntDF, fill_locations)
             huntLoc.rename(columns={'USELOCATION_x':'USELOCATION', 'MAXCLIENTS':'Total Clients', 'CLIENTNUMBER':'Activity Client Number'}, inplace=True)
             hunt = huntLoc[['Activity2', 'Year', 'FORESTNAME', 'DISTRICTNAME', 'Total Clients', 'USELOCATION', 'TRIP_GUID', 'Activity Client Number']].copy()
             
@@ -5912,13 +4933,10 @@ class VisitationSummary(object):
             ws.oddFooter.left.text = footer
             
         def excelRow(ws, rows, styles):
-            for row in ws[rows]:
-                for cell in row:
-                    cell.style = styles
+            style_range(ws, rows, styles)
         
         def excelStyle(ws, cells, styles):
-            for cell in ws[cells]:
-                cell.style = styles
+            style_range(ws, cells, styles)
 
         def excelUpdate(ws):
             title_row = '1'
@@ -5994,4 +5012,69 @@ class VisitationSummary(object):
             
         return      
 
+class SnapshotExport(object):
+    """ This tool copies the report tables out of SDE into a folder of parquet files, split up by year.
+    The summary reports can then be pointed at the folder with their 'Read from snapshot folder' parameter.
+    Run nightly with 'Only pull rows changed since the last export' to keep the folder current, old
+    seasons rarely change so only the new/edited rows get read."""
+
+    def __init__(self):
+        self.label = "Export Report Snapshot"
+        self.description = "Writes the Outfitter/Guide report tables to a local snapshot folder so the summary " + \
+                           "reports can be run without reading SDE."
+        self.canRunInBackground = False
+
+    def getParameterInfo(self):
+
+        param0 = arcpy.Parameter(
+            displayName="Snapshot folder",
+            name="snapshot_folder",
+            datatype="DEFolder",
+            parameterType="Required",
+            direction="Input")
+        param0.filter.list = ["File System"]
+
+        param1 = arcpy.Parameter(
+            displayName="Tables",
+            name="tables",
+            datatype="GPString",
+            parameterType="Optional",
+            direction="Input",
+            multiValue=True)
+        param1.filter.type = "ValueList"
+        param1.filter.list = list(SNAPSHOT_TABLES)
+
+        param2 = arcpy.Parameter(
+            displayName="Only pull rows changed since the last export",
+            name="incremental",
+            datatype="GPBoolean",
+            parameterType="Optional",
+            direction="Input")
+        param2.value = True
+
+        params = [param0, param1, param2]
+        return params
+
+    def isLicensed(self):
+        """Set whether tool is licensed to execute."""
+        return True
+
+    def updateParameters(self, parameters):
+        return
+
+    def updateMessages(self, parameters):
+        return
+
+    def execute(self, parameters, messages):
+        folder = parameters[0].valueAsText
+        tables = parameters[1].values
+        incremental = bool(parameters[2].value)
+
+        connection = r'{'ExamplePath'}'
+        manifest = export_snapshot(connection, folder, tables, incremental)
+        # the joined Guided Rec/Hunting activity tables most of the summaries read
+        build_facts(folder)
+
+        arcpy.AddMessage("Snapshot of {} tables saved to {}".format(len(manifest['tables']), folder))
+        return
 
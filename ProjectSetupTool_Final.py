@@ -67,6 +67,8 @@ import csv
 import sys
 import time
 
+from project_setup import config_tasks, run_tasks, merge_outputs, report_tasks, clear_scratch, bounded_by, output_extent, measure
+
 #Set user set environments from the tool
 #Need project folder location, name of project gdb, project area boundary
 folder_loc = arcpy.GetParameterAsText(0)  #root project folder location
@@ -136,11 +138,6 @@ arcpy.env.outputCoordinateSystem = sr
 pabSym = r"{'ExamplePath'}\NEPA_SOP\Project Boundary.lyr"
 pab_symbology = pabSym
 
-# acres/miles calculations
-acExpress = """!Shape.area@acres!"""
-miExpress = """!Shape.length@miles!"""
-
-
 if region == "Region01" : nhdFlow = r"{'ExamplePath'}\edw_sde_default_as_myself.sde\S_R01.Hydrography\S_R01.NHDFlowline";
 elif region == "Region02" : nhdFlow = r"{'ExamplePath'}\edw_sde_default_as_myself.sde\S_R02.Hydrography\S_R02.NHDFlowline";   
 elif region == "Region03" : nhdFlow = r"{'ExamplePath'}\edw_sde_default_as_myself.sde\S_R03.Hydrography\S_R03.NHDFlowline";
@@ -175,33 +172,6 @@ vegTbl = r"{'ExamplePath'}\edw_sde_default_as_myself.sde\S_USA.NRIS_VegCharacter
 
 #-----------------------------Functions----------------------------------------
 
-def pabClip(fc, dataset, outFC, project_area_bound, fullpath):
-    """
-    Clip features to PAB and save to feature dataset
-    """
-
-    arcpy.Clip_analysis(fc, project_area_bound, os.path.join(fullpath, dataset, outFC))
-
-
-
-def pabSelect(fc, feature_dataset, outFC, project_area_bound, fullpath):
-    """
-    Select features that intersect the PAB and save to new file in feature dataset
-    reworked to remove globals and use fc basename for temp layer file
-    """
-    temp_lyr = "{}_temp".format(os.path.basename(fc).split('.')[-1])
-    output_file = os.path.join(fullpath, feature_dataset, outFC)
-
-    arcpy.MakeFeatureLayer_management(project_area_bound, "PAB_Lyr")
-    arcpy.MakeFeatureLayer_management(fc, temp_lyr)
-
-    # input_layer, overlap_type, select_features
-    intersect = arcpy.SelectLayerByLocation_management(temp_lyr, 'INTERSECT', "PAB_Lyr")
-    arcpy.CopyFeatures_management(intersect, output_file)
-
-    return output_file
-
-
 def applyLayer(outDS, outFC, sym, fullpath, df, folder_loc):
     """
     apply symbology from sample and save output layer file
@@ -269,30 +239,6 @@ def updateLayer(outDS, outFC, sym, fullpath, df, folder_loc, mxd):
 
 
 
-def get_new_extent(extent, current_spatial_ref, new_spatial_ref):
-    """
-    convert extent from current spatial reference
-    to new spatial reference using extent 
-    returns space separated string
-      MinX MinY MaxX MaxY
-    """
-    extent_split = extent.split(' ')
-    
-    new_min_point = arcpy.PointGeometry(
-            arcpy.Point(extent_split[0], extent_split[1]), 
-                       current_spatial_ref).projectAs(new_spatial_ref)
-    
-    new_max_point = arcpy.PointGeometry(
-            arcpy.Point(extent_split[2], extent_split[3]), 
-                       current_spatial_ref).projectAs(new_spatial_ref)
-    
-    new_extent = "{0} {1} {2} {3}".format(new_min_point.firstPoint.X, 
-                  new_min_point.firstPoint.Y, 
-                  new_max_point.firstPoint.X, 
-                  new_max_point.firstPoint.Y)
-    
-    return new_extent
-
 def infraRds(con, decom, ex, plan, fullpath, pabUnion, roads, roadSym, mxd, folder_path):
     """
     create infra roads layers
@@ -308,31 +254,15 @@ def infraRds(con, decom, ex, plan, fullpath, pabUnion, roads, roadSym, mxd, fold
     
     road_two_four = os.path.join(fullpath, "Transportation", "Two_FourDigitRoads")
     
-    # should set the extent variable to limit roads being merged
-    # but need to check spatial references first, and manage extent later
-    original_extent = arcpy.env.extent
-    
     pab_union_sr = arcpy.Describe(pabUnion).spatialReference
-    roads_sr = arcpy.Describe(con).spatialReference
     
     arcpy.env.outputCoordinateSystem = pab_union_sr
     
-    pab_describe = arcpy.Describe(pabUnion)
-    pab_extent = "{0} {1} {2} {3}".format(pab_describe.extent.XMin,
-                      pab_describe.extent.YMin,
-                      pab_describe.extent.XMax,
-                      pab_describe.extent.YMax)
-    
-    if pab_union_sr.factoryCode != roads_sr.factoryCode:
-        new_extent = get_new_extent(pab_extent, pab_union_sr, roads_sr)
-        arcpy.env.extent = new_extent
-    else:
-        arcpy.env.extent = pab_extent    
-    
-    rdFC = arcpy.Merge_management([con, decom, ex, plan], road_merge)
+    # limit the roads being merged to the PAB union's envelope
+    # extent is reset to original after, should only need it for merge
+    with bounded_by(output_extent(pabUnion, pab_union_sr)):
+        rdFC = arcpy.Merge_management([con, decom, ex, plan], road_merge)
     
-    # reset extent to original, should only need it for merge
-    arcpy.env.extent = original_extent    
     
     rdLnEventTable = arcpy.TableSelect_analysis(rdFC, road_event_table)
     rdFeat = arcpy.LocateFeaturesAlongRoutes_lr(pabUnion, roads, "RTE_CN", "0 Meters", 
@@ -569,16 +499,17 @@ def listFcsInGDB(fullpath):
             yield os.path.join(arcpy.env.workspace, fds, fc)
 
 
-def process_data(config_file, project_area_bound, fullpath, df, folder_loc, mxd):
+def process_data(config_files, project_area_bound, fullpath, df, folder_loc, mxd):
     """
-    read the config file and write out the project data
+    read the config files and write out the project data
     clip data
     select by location
     apply symbology & save layer file
-    runs the functions
-        pabClip
-        pabSelect
-        update_symbology
+    the clips and selects run on worker processes (project_setup), each
+    into its own scratch gdb, and are copied into the project gdb when
+    they're all done, the symbology is applied here since it needs the mxd
+    project_area_bound has to be a feature class, not a layer in the map
+    returns the outputs written, they already have their acres/miles
 
     fields required in the config file
         layer_source     - full path to surce data
@@ -589,51 +520,23 @@ def process_data(config_file, project_area_bound, fullpath, df, folder_loc, mxd)
         select_symbology - layer file for updating select symbology or blank
 
     """
-    with open(config_file) as csvfile:
-        reader = csv.DictReader(csvfile)
+    tasks = config_tasks(config_files, project_area_bound,
+                         arcpy.env.outputCoordinateSystem.exportToString(),
+                         arcpy.env.scratchFolder)
+    results = run_tasks(tasks)
+    written = merge_outputs(results, fullpath)
 
-        for row in reader:
-            try:
-                src_data = row['layer_source']
-                feature_dataset = row['feature_dataset']
-
-                arcpy.AddMessage("Processing {}".format(os.path.basename(src_data)))
-
-                # create output files if names are present in the csv
-                if row['clip_output']:
-                    pabClip(src_data, feature_dataset, row['clip_output'],
-                            project_area_bound, fullpath)
-                    arcpy.AddMessage("Finished Clip ")
-
-                if row['select_output']:
-                    pabSelect(src_data, feature_dataset, row['select_output'],
-                              project_area_bound, fullpath)
-                    arcpy.AddMessage("Finished Select")
-
-                # add layer files if source is present
-                if row['clip_symbology']:
-                    apply_symbology(feature_dataset, row['clip_output'],
-                                    row['clip_symbology'], fullpath,
-                                    df, folder_loc, mxd)
-                    arcpy.AddMessage("Apply Clipped Symbology")
-
-                if row['select_symbology']:
-                    apply_symbology(feature_dataset, row['select_output'],
-                                    row['select_symbology'], fullpath,
-                                    df, folder_loc, mxd)
-                    arcpy.AddMessage("Apply Select Symbology")
-
-#                if row['add_map']: 
-#                    lyr = arcpy.mapping.Layer(os.path.join(fullpath, feature_dataset, row['clip_output']))
-#                    arcpy.mapping.AddLayer(df, lyr, "AUTO_ARRANGE")
-#                    arcpy.AddMessage("Added to Map")
-
-
-            except:
-                arcpy.AddWarning("--- Unable to process dataset")
-                arcpy.AddWarning("error: {}".format(sys.exc_info()[0]))
+    # add layer files if source is present
+    for result in results:
+        if result['symbology'] and result['merged']:
+            apply_symbology(result['feature_dataset'], result['output'],
+                            result['symbology'], fullpath,
+                            df, folder_loc, mxd)
 
-    return
+    report_tasks(results)
+    clear_scratch(results)
+
+    return written
 
 def add_general_lyr(lyr_file_path, project_folder):
     """
@@ -792,14 +695,11 @@ pab_union = create_pab_union(os.path.join(fullpath, "Transportation"),
 
 #--------------------- process the config files -------------------
 
-# process the CSA config file
-arcpy.AddMessage("Reading data from config file")
-process_data(config_file_extra1, project_area_bound, fullpath, df, folder_loc, mxd)
-
-
-# process other config files if selected
-if config_file_extra2:
-    process_data(config_file_extra2, project_area_bound, fullpath, df, folder_loc, mxd)
+# process the CSA config file and the other config file if selected
+# rows of both are run together, clipped to the PAB copied to the project gdb
+arcpy.AddMessage("Reading data from config files")
+config_outputs = process_data([f for f in (config_file_extra1, config_file_extra2) if f],
+                              os.path.join(fullpath, "Project", pabName), fullpath, df, folder_loc, mxd)
 
 
 # extra steps not in the config
@@ -851,19 +751,16 @@ except:
 #--------------- add acres/miles fields and calculate ---------------
 arcpy.AddMessage("Calculating Acres and Miles")
 
-fcs = listFcsInGDB(fullpath)
+# the config outputs were measured on the workers before they were copied in,
+# the rest get one cursor pass each here, they're in the map so it's done in process
+measured = set(fc.lower() for fc in config_outputs)
 
-for fc in fcs:
-    desc = arcpy.Describe(fc)
-    if desc.shapeType == "Polygon":
-        arcpy.AddField_management(fc, "Project_Acres", "FLOAT")
-        arcpy.CalculateField_management(fc, "Project_Acres", acExpress, "PYTHON")
-    elif desc.shapeType == "Polyline":
-        arcpy.AddField_management(fc, "Project_Miles", "FLOAT")
-        arcpy.CalculateField_management(fc, "Project_Miles", miExpress, "PYTHON")
+for fc in listFcsInGDB(fullpath):
+    if fc.lower() in measured:
+        continue
 
     # delete empty datasets
-    if int(arcpy.GetCount_management(fc).getOutput(0)) == 0:
+    if measure(fc) == 0:
         arcpy.Delete_management(fc)
         arcpy.AddMessage('{} has been deleted because it contains no features.'.format(fc))
 
@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the config rows of the NEPA project setup tools.
+
+process_data used to clip or select the config rows from SDE one after the
+other. The rows don't depend on each other, so run_tasks hands them to a
+set of worker processes. Each worker writes to its own scratch file gdb so
+no two processes ever write to one gdb, and merge_outputs copies what they
+made into the project gdb at the end. The symbology, layer files and map
+stay in the tool's process since they need the mxd. A source with nothing
+inside the PAB's envelope is skipped before it's clipped, and an output with
+no features isn't copied in, so neither gets a layer file or metadata.
+
+The workers are python(w).exe processes running project_setup_worker.py,
+which only imports this module. A multiprocessing pool would start them by
+importing the tool script again as their main module, and with no
+__main__ guard in the scripts the whole setup (parameters, folders, the
+gdb) would run again in every worker. Tasks go to the workers and results
+come back as lines of JSON over their stdin and stdout.
+
+@author: kmmiles
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+try:
+    from Queue import Queue, Empty
+except ImportError:
+    from queue import Queue, Empty
+
+import arcpy
+
+
+# Worker processes for the config rows, 1 runs them in the tool's own process
+SETUP_WORKERS = 4
+
+# Script the worker processes run, and what its result lines start with so
+# they can be told apart from anything else a worker prints
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'project_setup_worker.py')
+RESULT_PREFIX = 'SETUP_RESULT '
+
+# Points along each edge of an envelope when it's projected
+EXTENT_DENSIFY = 16
+
+# Field each shape type's measure goes in, the shape token it's read from, the
+# square or linear meters in an acre or mile and the power the units are raised
+# to, and the expression CalculateField uses when the spatial reference isn't projected
+MEASURES = {'Polygon': ('Project_Acres', 'SHAPE@AREA', 4046.8564224, 2, "!Shape.area@acres!"),
+            'Polyline': ('Project_Miles', 'SHAPE@LENGTH', 1609.344, 1, "!Shape.length@miles!")}
+
+# Spatial reference of each source read, a source is only described once a session
+_spatial_refs = {}
+
+
+def pabClip(fc, dataset, outFC, project_area_bound, fullpath):
+    """
+    Clip features to PAB and save to feature dataset
+    """
+    arcpy.Clip_analysis(fc, project_area_bound, os.path.join(fullpath, dataset, outFC))
+
+
+def pabSelect(fc, feature_dataset, outFC, project_area_bound, fullpath):
+    """
+    Select features that intersect the PAB and save to new file in feature dataset
+    reworked to remove globals and use fc basename for temp layer file
+    """
+    temp_lyr = "{}_temp".format(os.path.basename(fc).split('.')[-1])
+    output_file = os.path.join(fullpath, feature_dataset, outFC)
+
+    arcpy.MakeFeatureLayer_management(project_area_bound, "PAB_Lyr")
+    arcpy.MakeFeatureLayer_management(fc, temp_lyr)
+
+    # input_layer, overlap_type, select_features
+    intersect = arcpy.SelectLayerByLocation_management(temp_lyr, 'INTERSECT', "PAB_Lyr")
+    arcpy.CopyFeatures_management(intersect, output_file)
+
+    return output_file
+
+
+def get_new_extent(extent, current_spatial_ref, new_spatial_ref):
+    """
+    convert extent from current spatial reference
+    to new spatial reference using extent 
+    projects EXTENT_DENSIFY points along each edge, not only the min and max
+    corners, the edges bend and rotate in the new spatial reference and the
+    two corners alone can leave part of the area outside
+    returns space separated string
+      MinX MinY MaxX MaxY
+    """
+    xmin, ymin, xmax, ymax = [float(value) for value in extent.split(' ')]
+
+    points = arcpy.Array()
+    for step in range(EXTENT_DENSIFY):
+        along = float(step) / EXTENT_DENSIFY
+        points.add(arcpy.Point(xmin + (xmax - xmin) * along, ymin))
+        points.add(arcpy.Point(xmax, ymin + (ymax - ymin) * along))
+        points.add(arcpy.Point(xmax - (xmax - xmin) * along, ymax))
+        points.add(arcpy.Point(xmin, ymax - (ymax - ymin) * along))
+
+    # one projection for all of them
+    new_envelope = arcpy.Multipoint(points, current_spatial_ref).projectAs(new_spatial_ref).extent
+
+    new_extent = "{0} {1} {2} {3}".format(new_envelope.XMin,
+                  new_envelope.YMin,
+                  new_envelope.XMax,
+                  new_envelope.YMax)
+    
+    return new_extent
+
+
+def spatial_reference(dataset):
+    """
+    spatial reference of a dataset, described the first time it's asked for
+    """
+    if dataset not in _spatial_refs:
+        _spatial_refs[dataset] = arcpy.Describe(dataset).spatialReference
+    return _spatial_refs[dataset]
+
+
+def _sr_key(spatial_ref):
+    # custom spatial references have no factory code
+    return spatial_ref.factoryCode or spatial_ref.exportToString()
+
+
+def boundary_extents(boundary, sources):
+    """
+    envelope of the boundary in each source's spatial reference, source -> a
+    MinX MinY MaxX MaxY string for has_features
+    the boundary is described once and its envelope projected once for each
+    spatial reference, however many sources share it
+    a source that can't be described gets None and is read without an extent
+    """
+    boundary_describe = arcpy.Describe(boundary)
+    boundary_sr = boundary_describe.spatialReference
+    boundary_extent = "{0} {1} {2} {3}".format(boundary_describe.extent.XMin,
+                                               boundary_describe.extent.YMin,
+                                               boundary_describe.extent.XMax,
+                                               boundary_describe.extent.YMax)
+
+    projected = {_sr_key(boundary_sr): boundary_extent}
+    extents = {}
+    for source in sources:
+        try:
+            source_sr = spatial_reference(source)
+        except Exception:
+            extents[source] = None
+            continue
+        if _sr_key(source_sr) not in projected:
+            projected[_sr_key(source_sr)] = get_new_extent(boundary_extent, boundary_sr, source_sr)
+        extents[source] = projected[_sr_key(source_sr)]
+    return extents
+
+
+def output_extent(boundary, spatial_ref):
+    """
+    envelope of the boundary in the output coordinate system, the
+    MinX MinY MaxX MaxY string arcpy.env.extent takes
+    the environment reads bare extent coordinates in
+    arcpy.env.outputCoordinateSystem, not in the source's spatial reference
+    spatial_ref is the output coordinate system, or its string as the workers get it
+    """
+    if not isinstance(spatial_ref, arcpy.SpatialReference):
+        spatial_ref_string = spatial_ref
+        spatial_ref = arcpy.SpatialReference()
+        spatial_ref.loadFromString(spatial_ref_string)
+    boundary_describe = arcpy.Describe(boundary)
+    boundary_extent = "{0} {1} {2} {3}".format(boundary_describe.extent.XMin,
+                                               boundary_describe.extent.YMin,
+                                               boundary_describe.extent.XMax,
+                                               boundary_describe.extent.YMax)
+    if _sr_key(boundary_describe.spatialReference) == _sr_key(spatial_ref):
+        return boundary_extent
+    return get_new_extent(boundary_extent, boundary_describe.spatialReference, spatial_ref)
+
+
+@contextmanager
+def bounded_by(extent):
+    """
+    sets arcpy.env.extent to an envelope (output_extent) while the block
+    runs, so the tools only read the source's features near the boundary,
+    not all of a national layer, and puts the extent back after
+    nothing outside the envelope can touch the boundary, the outputs are the same
+    the envelope has to be in arcpy.env.outputCoordinateSystem
+    """
+    original_extent = arcpy.env.extent
+    if extent:
+        arcpy.env.extent = extent
+    try:
+        yield
+    finally:
+        arcpy.env.extent = original_extent
+
+
+def has_features(source, extent, spatial_ref):
+    """
+    whether any of the source's features intersect an envelope (boundary_extents)
+    a select by location against the envelope only has to look at the source's
+    spatial index, so a source with nothing near the project is found without
+    reading or clipping any of it
+    spatial_ref is the source's spatial reference as a string, it's passed to the workers
+    """
+    xmin, ymin, xmax, ymax = [float(value) for value in extent.split(' ')]
+    envelope_sr = arcpy.SpatialReference()
+    envelope_sr.loadFromString(spatial_ref)
+    envelope = arcpy.Polygon(arcpy.Array([arcpy.Point(xmin, ymin), arcpy.Point(xmin, ymax),
+                                          arcpy.Point(xmax, ymax), arcpy.Point(xmax, ymin)]), envelope_sr)
+
+    check_lyr = "{}_check".format(os.path.basename(source).split('.')[-1])
+    arcpy.MakeFeatureLayer_management(source, check_lyr)
+    try:
+        arcpy.SelectLayerByLocation_management(check_lyr, 'INTERSECT', envelope)
+        return int(arcpy.GetCount_management(check_lyr).getOutput(0)) > 0
+    finally:
+        arcpy.Delete_management(check_lyr)
+
+
+def measure(fc):
+    """
+    adds Project_Acres to a polygon class or Project_Miles to a line class and
+    fills it in one pass of an UpdateCursor, counting the features as it goes
+    same values as CalculateField with !Shape.area@acres! / !Shape.length@miles!
+    returns the number of features, 0 for an empty class
+    """
+    describe = arcpy.Describe(fc)
+    if describe.shapeType not in MEASURES:
+        with arcpy.da.SearchCursor(fc, ["OID@"]) as cursor:
+            return sum(1 for row in cursor)
+
+    field, token, meters, power, expression = MEASURES[describe.shapeType]
+    if field not in [f.name for f in describe.fields]:
+        arcpy.AddField_management(fc, field, "FLOAT")
+
+    spatial_ref = describe.spatialReference
+    if spatial_ref.type != "Projected":
+        # no linear unit to convert from, leave it to CalculateField
+        arcpy.CalculateField_management(fc, field, expression, "PYTHON")
+        return int(arcpy.GetCount_management(fc).getOutput(0))
+
+    # the spatial reference's units to acres or miles
+    factor = spatial_ref.metersPerUnit ** power / meters
+    features = 0
+    with arcpy.da.UpdateCursor(fc, [token, field]) as cursor:
+        for row in cursor:
+            row[1] = None if row[0] is None else row[0] * factor
+            cursor.updateRow(row)
+            features += 1
+    return features
+
+
+def config_tasks(config_files, project_area_bound, sr, scratch_folder):
+    """
+    one task for each clip_output and select_output of the config files, in file order
+    project_area_bound has to be a feature class path, the workers can't see the map's layers
+    """
+    tasks = []
+    for config_file in config_files:
+        with open(config_file) as csvfile:
+            reader = csv.DictReader(csvfile)
+            for row in reader:
+                for kind in ('clip', 'select'):
+                    if not row['{}_output'.format(kind)]:
+                        continue
+                    tasks.append({'id': len(tasks),
+                                  'label': "{} row {}".format(os.path.basename(config_file), reader.line_num),
+                                  'kind': kind,
+                                  'source': row['layer_source'],
+                                  'feature_dataset': row['feature_dataset'],
+                                  'output': row['{}_output'.format(kind)],
+                                  'symbology': row['{}_symbology'.format(kind)],
+                                  'pab': project_area_bound,
+                                  'sr': sr,
+                                  'scratch_folder': scratch_folder})
+
+    # worked out here once so the workers don't describe or project anything
+    # the environment's extent is in the output coordinate system, the
+    # has_features check's envelope in the source's spatial reference
+    extent = output_extent(project_area_bound, sr) if tasks else None
+    source_extents = boundary_extents(project_area_bound, set(task['source'] for task in tasks))
+    for task in tasks:
+        task['source_extent'] = source_extents[task['source']]
+        task['source_sr'] = spatial_reference(task['source']).exportToString() if task['source_extent'] else None
+        # a source that can't be described is read without an extent
+        task['extent'] = extent if task['source_extent'] else None
+    return tasks
+
+
+def _scratch_gdb(scratch_folder):
+    """ this process's scratch gdb, made when its first row runs"""
+    gdb = os.path.join(scratch_folder, "setup_{}.gdb".format(os.getpid()))
+    if not arcpy.Exists(gdb):
+        arcpy.CreateFileGDB_management(scratch_folder, os.path.basename(gdb))
+    return gdb
+
+
+def _error():
+    return traceback.format_exception_only(*sys.exc_info()[:2])[-1].strip()
+
+
+def run_task(task):
+    """
+    clip or select one config output into this process's scratch gdb
+    returns the task with the scratch output, the seconds it took and the error if it failed
+    """
+    start = time.time()
+    result = dict(task, gdb=None, scratch=None, features=None, skipped=False, merged=False, error=None)
+    try:
+        # a worker starts with the default environment
+        arcpy.env.overwriteOutput = True
+        arcpy.env.outputCoordinateSystem = task['sr']
+
+        # nothing near the project, no clip, no output, no layer file or metadata
+        if task['source_extent'] and not has_features(task['source'], task['source_extent'], task['source_sr']):
+            result.update(features=0, skipped=True, seconds=time.time() - start)
+            return result
+
+        gdb = result['gdb'] = _scratch_gdb(task['scratch_folder'])
+        # the id keeps outputs with the same name in different config files apart
+        name = "{}_{}".format(task['output'], task['id'])
+        with bounded_by(task['extent']):
+            if task['kind'] == 'clip':
+                pabClip(task['source'], '', name, task['pab'], gdb)
+            else:
+                pabSelect(task['source'], '', name, task['pab'], gdb)
+        result['scratch'] = os.path.join(gdb, name)
+        # measured here, at the same time as the other workers' outputs
+        result['features'] = measure(result['scratch'])
+    except Exception:
+        result['error'] = _error()
+    result['seconds'] = time.time() - start
+    return result
+
+
+def _python():
+    """ python(w).exe to start the workers with, ArcMap's executable is ArcMap.exe"""
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        return sys.executable
+    return os.path.join(sys.exec_prefix, 'pythonw.exe')
+
+
+def _feed(worker, pending, finished):
+    """
+    hands tasks to one worker process until there are none left or the worker stops
+    """
+    while True:
+        try:
+            task = pending.get_nowait()
+        except Empty:
+            return
+        try:
+            worker.stdin.write(json.dumps(task) + '\n')
+            worker.stdin.flush()
+            line = worker.stdout.readline()
+            while line and not line.startswith(RESULT_PREFIX):
+                line = worker.stdout.readline()
+        except (IOError, OSError):
+            line = ''
+        if not line:
+            finished.put(dict(task, gdb=None, scratch=None, features=None, skipped=False, merged=False,
+                              error="The worker process stopped", seconds=0.0))
+            return
+        finished.put(json.loads(line[len(RESULT_PREFIX):]))
+
+
+def run_tasks(tasks, workers=SETUP_WORKERS):
+    """
+    runs the tasks on worker processes, returns the results in task order
+    """
+    workers = max(1, min(workers, multiprocessing.cpu_count(), len(tasks)))
+    arcpy.AddMessage("Processing {} config outputs with {} worker(s)".format(len(tasks), workers))
+    if workers == 1:
+        results = []
+        for task in tasks:
+            results.append(run_task(task))
+            _finished(results[-1], len(results), len(tasks))
+        return results
+
+    pending = Queue()
+    for task in tasks:
+        pending.put(task)
+    finished = Queue()
+    devnull = open(os.devnull, 'w')
+    processes = []
+    threads = []
+    results = []
+    try:
+        for i in range(workers):
+            worker = subprocess.Popen([_python(), WORKER_SCRIPT], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=devnull, universal_newlines=True)
+            processes.append(worker)
+            thread = threading.Thread(target=_feed, args=(worker, pending, finished))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+
+        # the messages are only added from here, arcpy's messages aren't for other threads
+        while len(results) < len(tasks):
+            try:
+                result = finished.get(timeout=1)
+            except Empty:
+                if any(thread.is_alive() for thread in threads) or not finished.empty():
+                    continue
+                break
+            results.append(result)
+            _finished(result, len(results), len(tasks))
+
+        # every worker stopped with tasks still waiting
+        while not pending.empty():
+            task = pending.get_nowait()
+            results.append(dict(task, gdb=None, scratch=None, features=None, skipped=False, merged=False,
+                                error="No worker process was left to run it", seconds=0.0))
+            _finished(results[-1], len(results), len(tasks))
+    finally:
+        # the workers have to be gone before their scratch gdbs are read
+        for worker in processes:
+            try:
+                worker.stdin.close()
+            except (IOError, OSError):
+                pass
+        for worker in processes:
+            worker.wait()
+        devnull.close()
+    return sorted(results, key=lambda result: result['id'])
+
+
+def _status(result):
+    if result['error']:
+        return "Failed"
+    if result['skipped']:
+        return "Skipped, no features near the project"
+    if not result['features']:
+        return "No features"
+    return "Finished"
+
+
+def _finished(result, done, total):
+    arcpy.AddMessage("({}/{}) {} {} - {} ({:.1f}s)".format(
+        done, total, result['kind'], os.path.basename(result['source']), _status(result), result['seconds']))
+
+
+def merge_outputs(results, fullpath):
+    """
+    copy the scratch outputs into their feature datasets in the project gdb
+    empty outputs are left out instead of being copied in and deleted later
+    returns the paths written, already measured
+    """
+    written = []
+    for result in results:
+        if not result['scratch'] or not result['features']:
+            continue
+        start = time.time()
+        output = os.path.join(fullpath, result['feature_dataset'], result['output'])
+        try:
+            arcpy.CopyFeatures_management(result['scratch'], output)
+            result['merged'] = True
+            written.append(output)
+        except Exception:
+            result['error'] = _error()
+        result['seconds'] += time.time() - start
+    return written
+
+
+def report_tasks(results):
+    """
+    time each output took, slowest first, and the ones that failed
+    """
+    arcpy.AddMessage("Config outputs by time:")
+    for result in sorted(results, key=lambda result: -result['seconds']):
+        arcpy.AddMessage("  {:>7.1f}s  {:<6} {} -> {}\\{}  {}".format(
+            result['seconds'], result['kind'], os.path.basename(result['source']),
+            result['feature_dataset'], result['output'], _status(result)))
+
+    failed = [result for result in results if result['error']]
+    for result in failed:
+        arcpy.AddWarning("--- Unable to process {} ({} {})".format(os.path.basename(result['source']),
+                                                                  result['label'], result['kind']))
+        arcpy.AddWarning("error: {}".format(result['error']))
+    empty = [result for result in results if not result['error'] and not result['features']]
+    arcpy.AddMessage("{} of {} config outputs written, {} had no features in the project area".format(
+        len([result for result in results if result['merged']]), len(results), len(empty)))
+
+
+def clear_scratch(results):
+    """
+    delete the workers' scratch gdbs
+    """
+    for gdb in set(result['gdb'] for result in results if result['gdb']):
+        try:
+            arcpy.Delete_management(gdb)
+        except Exception:
+            arcpy.AddWarning("Couldn't delete scratch gdb {}".format(gdb))
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Worker process for project_setup.run_tasks.
+
+Reads one JSON task per line from stdin, runs it and writes the result back
+as one JSON line starting with project_setup.RESULT_PREFIX. It stops when
+stdin is closed. Only project_setup is imported, never the tool scripts.
+
+@author: kmmiles
+"""
+
+import json
+import sys
+
+import project_setup
+
+
+def main():
+    for line in iter(sys.stdin.readline, ''):
+        if not line.strip():
+            continue
+        result = project_setup.run_task(json.loads(line))
+        sys.stdout.write(project_setup.RESULT_PREFIX + json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
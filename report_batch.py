@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Batch runs of the detail reports, one workbook per business.
+
+The tool reads its tables once for every business picked and splits the
+trips up by business. save_reports hands them to render_reports, which
+builds the workbooks on a pool of worker processes (openpyxl is pure
+python, threads wouldn't help), and write_manifest lists what was saved.
+The report classes are in report_details so the workers can import them.
+
+ArcGIS Pro runs the tools inside ArcGISPro.exe, so the pool is started on
+the python interpreter that ships with it. A report the pool couldn't
+build, e.g. because the worker couldn't import the report class, is built
+here in the tool's own process instead.
+
+@author: kmmiles
+"""
+
+import csv
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import arcpy
+
+
+# Report workbooks built at the same time by default
+REPORT_WORKERS = 4
+
+
+def render_report(report_class, args, trips):
+    """ Builds and saves one detail report, gives back the path it was saved to"""
+    report = report_class(*args)
+    report.save_trips(trips)
+    return report.path
+
+
+def _use_python():
+    """ Points multiprocessing at python(w).exe when the tool is running inside ArcGIS Pro"""
+    if not os.path.basename(sys.executable).lower().startswith('python'):
+        multiprocessing.set_executable(os.path.join(sys.exec_prefix, 'pythonw.exe'))
+
+
+def _counts(trips):
+    return len(trips), sum(len(trip['activities']) for trip in trips.values())
+
+
+def render_reports(jobs, workers=REPORT_WORKERS):
+    """ Builds the reports of a batch run.
+
+    jobs    - list of (business, report class, constructor arguments, trips)
+    workers - reports built at the same time, one at a time in this process when 1
+
+    Gives back a result for each business: its file, trip and activity counts and status.
+    """
+    results = OrderedDict()
+    for business, report_class, args, trips in jobs:
+        trip_count, activity_count = _counts(trips)
+        results[business] = {'business': business, 'file': '', 'trips': trip_count,
+                             'activities': activity_count, 'status': 'not run', 'message': ''}
+
+    def done(business, path):
+        results[business].update({'file': os.path.basename(path), 'status': 'saved'})
+        arcpy.AddMessage('Saved {}'.format(os.path.basename(path)))
+
+    if workers > 1 and len(jobs) > 1:
+        _use_python()
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(business, pool.submit(render_report, report_class, args, trips))
+                           for business, report_class, args, trips in jobs]
+                for business, future in futures:
+                    try:
+                        done(business, future.result())
+                    except Exception as e:
+                        results[business]['message'] = str(e)
+        except Exception as e:
+            arcpy.AddWarning("The report workers stopped ({}), building the rest one at a time".format(e))
+
+    for business, report_class, args, trips in jobs:
+        if results[business]['status'] == 'saved':
+            continue
+        if results[business]['message']:
+            arcpy.AddWarning("{} wasn't built by the workers ({}), building it here".format(business, results[business]['message']))
+        try:
+            done(business, render_report(report_class, args, trips))
+            results[business]['message'] = ''
+        except Exception as e:
+            arcpy.AddError("ERROR: {} report failed: {}".format(business, e))
+            results[business].update({'status': 'failed', 'message': str(e)})
+    return list(results.values())
+
+
+def save_reports(report_class, reports, manifest, workers=REPORT_WORKERS):
+    """ Saves the detail report of each business a tool read the trips of.
+
+    reports  - list of (business, constructor arguments, trips)
+    manifest - csv the batch is listed in when there is more than one business
+
+    A single business is saved here the way the tools always did. Businesses without trips
+    only get a line in the manifest.
+    """
+    if len(reports) == 1:
+        business, args, trips = reports[0]
+        report = report_class(*args)
+        arcpy.AddMessage('Saving {}...'.format(report.savefile))
+        report.save_trips(trips)
+        return
+
+    jobs = [(business, report_class, args, trips) for business, args, trips in reports if trips]
+    skipped = [business for business, args, trips in reports if not trips]
+    arcpy.AddMessage('Saving {} reports, {} businesses had no trips in the date range...'.format(len(jobs), len(skipped)))
+    results = render_reports(jobs, workers)
+    write_manifest(manifest, results, skipped)
+    arcpy.AddMessage('Listed the reports in {}'.format(manifest))
+
+
+def write_manifest(path, results, skipped=()):
+    """ CSV of the batch: one line per business with the file saved for it, or why there isn't one"""
+    rows = list(results) + [{'business': business, 'file': '', 'trips': 0, 'activities': 0,
+                             'status': 'no trips', 'message': ''} for business in skipped]
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, ['business', 'file', 'trips', 'activities', 'status', 'message'])
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
@@ -0,0 +1,623 @@
+# -*- coding: utf-8 -*-
+"""
+Shared table reads for the Outfitter/Guide report toolbox
+(MultiDatabase_CombinedReportOutput.py)
+
+The report tools used to each pull tables with
+    [row for row in arcpy.da.SearchCursor(table, getFieldNames(table))]
+and then copy the list of tuples into a DataFrame. Everything goes through
+read_table now, which reads the cursor in chunks and builds typed columns
+so a multi-year run doesn't hold every row twice.
+
+Reads are kept in a session cache (TableCache) so running several reports
+back to back only goes to SDE once per table. Call invalidate() after
+editing the data.
+
+export_snapshot writes the report tables out to a folder of parquet files,
+one per table and year, and with use_snapshot(folder): points read_table and
+read_where_in at it so the reports can be run without going to SDE. Run it
+with incremental=True to only pull what changed since the last export.
+
+The business, location, activity, forest and district names are kept as
+pandas categoricals (CATEGORY_FIELDS) sharing one dictionary per field
+across every table, read_table(categories=True) hands them back that way.
+
+Every read runs its cursor on the calling thread. arcpy doesn't say its
+cursors are thread safe, and the cursors opened on one .sde file share
+that workspace's connection. So read_where_in queries its batches one at
+a time unless the caller passes workers > 1. Only do that against a
+workspace where concurrent cursors have been checked to work. The cache
+and the category dictionary are only touched from the calling thread.
+
+@author: kmmiles
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import arcpy
+
+import report_sql
+
+
+# Rows pulled off the cursor at a time before they are turned into columns
+CHUNK_SIZE = 50000
+
+# Oracle won't take more than 1000 values in one IN list
+IN_LIST_SIZE = 1000
+
+# Field types the reports never use and a DataFrame can't hold
+SKIP_TYPES = ('Geometry', 'Blob', 'Raster')
+
+# numpy types for the esri field types that map cleanly, everything else stays object
+FIELD_DTYPES = {'Double': 'float64',
+                'Single': 'float64',
+                'Integer': 'int64',
+                'SmallInteger': 'int64',
+                'BigInteger': 'int64',
+                'OID': 'int64',
+                'Date': 'datetime64[ns]'}
+
+# Session cache limits: total DataFrame memory kept and how long a read stays good
+CACHE_BUDGET = 1024 * 1024 * 1024
+CACHE_TTL = 30 * 60
+
+# Tables export_snapshot writes and where each one gets the year it is partitioned by:
+# a date/year field, (key field, parent table) to take the year of the parent row, or
+# None for tables that aren't split by year. Parents come before their children.
+SNAPSHOT_TABLES = OrderedDict([('GUIDEDREC_TRIP', 'STARTDATE'),
+                               ('GUIDEDREC_DAY', 'TRIPDATE'),
+                               ('GUIDEDREC_STOP', ('DAY_GUID', 'GUIDEDREC_DAY')),
+                               ('GUIDEDREC_ACTIVITY', ('STOP_GUID', 'GUIDEDREC_STOP')),
+                               ('HUNTING_TRIP', 'STARTDATE'),
+                               ('HUNTING_HUNTER', ('TRIP_GUID', 'HUNTING_TRIP')),
+                               ('HUNTING_DAY', 'TRIPDATE'),
+                               ('HUNTING_STOP', ('DAY_GUID', 'HUNTING_DAY')),
+                               ('HUNTING_ACTIVITY', ('STOP_GUID', 'HUNTING_STOP')),
+                               ('HELISKI_TRIP', 'TRIPDATE'),
+                               ('HELISKI_ACTIVITY', ('TRIP_GUID', 'HELISKI_TRIP')),
+                               ('ICEFIELD_TRIPMONTH', 'REPORTYEAR'),
+                               ('ICEFIELD_ACTIVITY', ('TRIP_GUID', 'ICEFIELD_TRIPMONTH')),
+                               ('MENDENHALL_TRIPMONTH', 'REPORTYEAR'),
+                               ('MENDENHALL_ACTIVITY', ('TRIP_GUID', 'MENDENHALL_TRIPMONTH')),
+                               ('OUTFITTING_ACTIVITY', 'TRIPDATE'),
+                               ('LOCATION', None)])
+
+SNAPSHOT_MANIFEST = 'snapshot.json'
+
+# Creation and editor tracking dates an incremental snapshot refresh goes by
+WATERMARK_FIELDS = ('CREATIONDATE', 'CREATED_DATE', 'LAST_EDITED_DATE', 'EDITDATE')
+
+# Text fields with a few hundred names repeated over every row, stored as categoricals
+CATEGORY_FIELDS = ('BUSINESSNAME', 'USELOCATION', 'ACTIVITY', 'FORESTNAME', 'DISTRICTNAME')
+
+
+class TableCache(object):
+    """ Keeps the tables read in this ArcGIS session so a second report doesn't go back to SDE
+    for the same rows. The .pyt imports this module once, so the cache lives as long as the
+    session does.
+
+    Entries are keyed by (table, columns, where). A read for fewer columns is answered from a
+    cached read of the same table and where with more columns, with the repeated rows dropped
+    again for a DISTINCT read. Least recently used entries are
+    dropped once the frames go over budget bytes, and anything older than ttl seconds is
+    read again. Reads hand back copies since the reports change their frames in place.
+    """
+
+    def __init__(self, budget=CACHE_BUDGET, ttl=CACHE_TTL):
+        self.budget = budget
+        self.ttl = ttl
+        self.enabled = True
+        self.entries = OrderedDict()
+        self.fields = {}
+        self.size = 0
+
+    def get(self, table, names, where, distinct=False):
+        """ Cached read of the table and where that has the columns in names, or whatever
+        columns were kept when names is None"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        for key in list(self.entries):
+            frame, stamp, size = self.entries[key]
+            if now - stamp > self.ttl:
+                self._drop(key)
+            elif key[0] == table and key[2] == where and (names is None or set(names) <= set(key[1])):
+                self.entries.move_to_end(key)
+                if names is None:
+                    return frame.copy()
+                frame = frame[list(names)]
+                if distinct and set(names) != set(key[1]):
+                    # fewer columns of a DISTINCT read repeat where the columns left out differed
+                    frame = frame.drop_duplicates().reset_index(drop=True)
+                return frame.copy()
+        return None
+
+    def put(self, table, names, where, frame):
+        if not self.enabled:
+            return
+        key = (table, tuple(names), where)
+        if key in self.entries:
+            self._drop(key)
+        size = int(frame.memory_usage(deep=True).sum())
+        if size > self.budget:
+            return
+        self.entries[key] = (frame.copy(), time.time(), size)
+        self.size += size
+        while self.size > self.budget:
+            self._drop(next(iter(self.entries)))
+
+    def list_fields(self, table):
+        if not self.enabled:
+            return _list_fields(table)
+        if table not in self.fields:
+            self.fields[table] = _list_fields(table)
+        return self.fields[table]
+
+    def invalidate(self, table=None):
+        """ Drops everything, or just the reads of one table (matched on the table name, so
+        GUIDEDREC_DAY drops the reads through any connection)"""
+        if table is None:
+            self.entries.clear()
+            self.fields.clear()
+            self.size = 0
+            return
+        name = table_name(table)
+        for key in [key for key in self.entries if table_name(key[0]) == name]:
+            self._drop(key)
+        for key in [key for key in self.fields if table_name(key) == name]:
+            del self.fields[key]
+
+    def _drop(self, key):
+        self.size -= self.entries.pop(key)[2]
+
+
+def table_name(table):
+    """ Unqualified upper case name of a table path, .../x.sde/OWNER.GUIDEDREC_DAY -> GUIDEDREC_DAY"""
+    return table.replace('\\', '/').split('/')[-1].split('.')[-1].upper()
+
+
+def _list_fields(table):
+    return [(f.name, f.type) for f in arcpy.ListFields(table) if f.type not in SKIP_TYPES]
+
+
+cache = TableCache()
+
+# Snapshot folder and manifest the reads come from, nothing set reads from SDE
+snapshot = {'folder': None, 'manifest': None}
+
+# Sorted names seen so far for each of CATEGORY_FIELDS, shared by every table read
+categories = {}
+
+
+def invalidate(table=None):
+    """ Drops cached reads after the data has been edited (BusinessXlsUpdater)"""
+    cache.invalidate(table)
+
+
+def list_fields(table):
+    """ List of (field name, field type) in a table, without shape/blob fields"""
+    if snapshot['folder']:
+        return [tuple(field) for field in _snapshot_table(table)['fields']]
+    return cache.list_fields(table)
+
+
+def _columns(chunk, names, types):
+    """ Turns a chunk of cursor rows into a dictionary of typed numpy columns"""
+    columns = {}
+    for name, values in zip(names, zip(*chunk)):
+        dtype = FIELD_DTYPES.get(types.get(name))
+        if dtype == 'datetime64[ns]':
+            columns[name] = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce').values
+        elif dtype and None in values:
+            # same as pandas: integer columns with nulls come back as float
+            columns[name] = np.array([np.nan if v is None else v for v in values], dtype='float64')
+        elif dtype:
+            columns[name] = np.array(values, dtype=dtype)
+        else:
+            columns[name] = np.array(values, dtype=object)
+    return columns
+
+
+def category_dtype(field):
+    """ The shared categorical dtype of one of CATEGORY_FIELDS"""
+    return pd.CategoricalDtype(categories.get(field.upper(), []))
+
+
+def encode(frame):
+    """ Turns the CATEGORY_FIELDS columns of a frame into categoricals on the shared
+    dictionary. New names are added to it in sorted order, so the same name always sorts
+    the same way and frames read at different times concat and merge as categoricals."""
+    for column in frame.columns:
+        field = column.upper()
+        if field not in CATEGORY_FIELDS:
+            continue
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        known = categories.get(field, [])
+        new = set(values.dropna().unique()) - set(known)
+        if new:
+            categories[field] = sorted(set(known) | new)
+        frame[column] = values.astype(category_dtype(field))
+    return frame
+
+
+def _resolve(table, fields):
+    """ Works out the cursor fields, column names and field types for a read"""
+    types = dict(list_fields(table))
+    if fields is None:
+        fields = list(types)
+    else:
+        wanted = set(field.upper() for field in fields)
+        fields = [name for name in types if name.split('.')[-1].upper() in wanted]
+    names = [field.split('.')[-1] for field in fields]
+    types = {name.split('.')[-1]: ftype for name, ftype in types.items()}
+    return fields, names, types
+
+
+def _read_frames(table, fields, names, types, where, sql_clause=(None, None), chunk_size=CHUNK_SIZE):
+    """ Yields a DataFrame per chunk of cursor rows"""
+    with arcpy.da.SearchCursor(table, fields, where_clause=where, sql_clause=sql_clause) as sc:
+        while True:
+            chunk = list(islice(sc, chunk_size))
+            if not chunk:
+                break
+            yield pd.DataFrame(_columns(chunk, names, types), columns=names)
+
+
+def _concat(frames, names):
+    if not frames:
+        return pd.DataFrame(columns=names)
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _source(table):
+    """ What reads of a table are cached under, so SDE and snapshot reads don't mix"""
+    if snapshot['folder']:
+        return os.path.join(snapshot['folder'], table_name(table))
+    return table
+
+
+def read_table(table, fields=None, where=None, sql_clause=(None, None), chunk_size=CHUNK_SIZE, use_cache=True,
+               categories=False):
+    """ Reads a table into a DataFrame.
+
+    fields     - list of fields the report uses, all readable fields when None. Fields the
+                 table doesn't have are skipped, so a report can hand the same list to
+                 every table it reads
+    where      - where clause handed to the cursor so the filtering happens in the database
+    sql_clause - prefix/postfix clause handed to the cursor, e.g. ("DISTINCT", None)
+    use_cache  - answer from / keep the read in the session cache
+    categories - hand CATEGORY_FIELDS back as categoricals, for reports that only group and
+                 pivot on them. Left as text by default.
+
+    Column names are the unqualified field names (GUIDEDREC_DAY.TRIPDATE comes back as TRIPDATE)
+    """
+    fields, names, types = _resolve(table, fields)
+    where_key = (where, tuple(sql_clause))
+    source = _source(table)
+    distinct = bool(sql_clause[0]) and sql_clause[0].strip().upper() == 'DISTINCT'
+    frame = cache.get(source, names, where_key, distinct) if use_cache else None
+    if frame is None:
+        if snapshot['folder']:
+            frame = _snapshot_sql(_snapshot_read(table, names, where), names, sql_clause)
+        else:
+            frame = _concat(list(_read_frames(table, fields, names, types, where, sql_clause, chunk_size)), names)
+        if use_cache:
+            cache.put(source, names, where_key, frame)
+    return encode(frame) if categories else frame
+
+
+def _sql_value(value):
+    if isinstance(value, str):
+        return "'{}'".format(value.replace("'", "''"))
+    return str(value)
+
+
+def in_clauses(key, values, where=None, size=IN_LIST_SIZE):
+    """ Where clauses for "key IN (...)" over the values, size values at a time, AND'd with where"""
+    values = pd.unique(pd.Series(list(values), dtype=object).dropna())
+    for i in range(0, len(values), size):
+        clause = "{} IN ({})".format(key, ','.join(_sql_value(value) for value in values[i:i + size]))
+        yield "({}) AND {}".format(where, clause) if where else clause
+
+
+def read_where_in(table, key, values, fields=None, where=None, batch_size=None, workers=1, use_cache=True,
+                  categories=False):
+    """ Reads the rows of a table whose key field is in values, e.g. the GUIDEDREC_STOP rows for
+    the DAY_GUIDs already read from GUIDEDREC_DAY. Lets the child tables be filtered in the
+    database instead of reading the whole table and merging most of it away.
+
+    batch_size - values per IN list, IN_LIST_SIZE when None
+    workers    - number of batches to query at the same time on threads sharing the
+                 workspace's connection, opt-in (see the module notes), one at a time by default
+    use_cache  - answer from / keep the read in the session cache
+    categories - hand CATEGORY_FIELDS back as categoricals, see read_table
+
+    No values means no query and an empty frame. Rows come back in batch order.
+    """
+    fields, names, types = _resolve(table, fields)
+    clauses = list(in_clauses(key, values, where, batch_size or IN_LIST_SIZE))
+    # the IN lists can be huge, so the cache key is a digest of them
+    where_key = (where, key, hashlib.sha1('|'.join(clauses).encode('utf-8')).hexdigest())
+    source = _source(table)
+    if use_cache:
+        frame = cache.get(source, names, where_key)
+        if frame is not None:
+            return encode(frame) if categories else frame
+
+    if snapshot['folder']:
+        values = pd.Series(list(values), dtype=object).dropna()
+        frame = _snapshot_read(table, names + [key], where)
+        frame = frame.loc[frame[key].isin(values).values, names].reset_index(drop=True)
+        if use_cache:
+            cache.put(source, names, where_key, frame)
+        return encode(frame) if categories else frame
+
+    def read_batch(clause):
+        return list(_read_frames(table, fields, names, types, clause))
+
+    if workers > 1 and len(clauses) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(read_batch, clauses))
+    else:
+        batches = [read_batch(clause) for clause in clauses]
+    frame = _concat([frame for batch in batches for frame in batch], names)
+    if use_cache:
+        cache.put(source, names, where_key, frame)
+    return encode(frame) if categories else frame
+
+
+@contextmanager
+def use_snapshot(folder=None):
+    """ Points read_table/read_where_in at a folder written by export_snapshot for the
+    with block, SDE when folder is None. The where clauses the reports pass are run on the
+    snapshot with report_sql. Whatever was read from before is put back on the way out, so
+    a tool that fails can't leave the next one reading an old snapshot."""
+    previous = dict(snapshot)
+    manifest = None
+    if folder:
+        path = os.path.join(folder, SNAPSHOT_MANIFEST)
+        if not os.path.exists(path):
+            raise IOError("{} isn't a report snapshot, run the snapshot export first".format(folder))
+        with open(path) as f:
+            manifest = json.load(f)
+    snapshot['folder'] = folder or None
+    snapshot['manifest'] = manifest
+    if manifest:
+        arcpy.AddMessage("Reading from the snapshot taken {}".format(manifest['exported']))
+    try:
+        yield
+    finally:
+        snapshot.update(previous)
+
+
+def snapshot_parameter():
+    """ Optional last parameter of the report tools that read through here"""
+    param = arcpy.Parameter(
+        displayName="Read from snapshot folder",
+        name="snapshot_folder",
+        datatype="DEFolder",
+        parameterType="Optional",
+        direction="Input")
+    param.filter.list = ["File System"]
+    return param
+
+
+def _snapshot_table(table):
+    name = table_name(table)
+    tables = snapshot['manifest']['tables']
+    if name not in tables:
+        raise KeyError("{} isn't in the snapshot at {}".format(name, snapshot['folder']))
+    return tables[name]
+
+
+def snapshot_partitions(info, tree, field):
+    """ Year files of a snapshot table a parsed where clause can match, going by the bounds it
+    puts on the year field"""
+    return report_sql.prune(info['partitions'], tree, field)
+
+
+def snapshot_files(folder, name, partitions, columns=None):
+    """ Reads the year files of a snapshot table"""
+    folder = os.path.join(folder, name)
+    frames = [pd.read_parquet(os.path.join(folder, 'YEAR={}'.format(p), 'part-0.parquet'), columns=columns)
+              for p in partitions]
+    return _concat(frames, columns)
+
+
+def _snapshot_read(table, names, where):
+    """ Rows of a snapshot table matching where, only opening the year files the clause
+    can match"""
+    info = _snapshot_table(table)
+    tree = report_sql.parse(where)
+    partitions = snapshot_partitions(info, tree, info['year'] if isinstance(info['year'], str) else None)
+    wanted = set(name.upper() for name in names) | report_sql.columns(tree)
+    columns = [name for name, ftype in info['fields'] if name.upper() in wanted]
+    frame = report_sql.where(snapshot_files(snapshot['folder'], table_name(table), partitions, columns), tree)
+    return frame[list(dict.fromkeys(names))].reset_index(drop=True)
+
+
+def _snapshot_sql(frame, names, sql_clause):
+    """ The DISTINCT / ORDER BY parts of a cursor sql_clause"""
+    prefix, postfix = sql_clause
+    if prefix and prefix.strip().upper() == 'DISTINCT':
+        frame = frame.drop_duplicates().reset_index(drop=True)
+    if postfix and postfix.strip().upper().startswith('ORDER BY'):
+        by = [field.strip().split('.')[-1] for field in postfix.strip()[8:].split(',')]
+        frame = frame.sort_values(by).reset_index(drop=True)
+    return frame
+
+
+def _snapshot_years(frame, year, parents):
+    """ Year of each row, from its own field or the parent row's year"""
+    if year is None:
+        return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+    if isinstance(year, str):
+        values = frame[year]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            years = values.dt.year
+        else:
+            years = pd.to_numeric(values, errors='coerce')
+    else:
+        lookup = parents[year]
+        years = frame[year[0]].map(lookup[~lookup.index.duplicated()])
+    return years.map(lambda y: None if pd.isnull(y) else str(int(y)))
+
+
+def _snapshot_key(names, types):
+    """ Field a snapshot matches rows on: the GlobalID, or the ObjectID for tables without one"""
+    for name in names:
+        if name.upper() == 'GLOBALID':
+            return name
+    for name in names:
+        if types[name] == 'OID':
+            return name
+    return None
+
+
+def _snapshot_frame(folder, info):
+    """ Everything in a table's snapshot and the year file each row came from"""
+    frames, years = [], []
+    for p in info['partitions']:
+        frame = pd.read_parquet(os.path.join(folder, 'YEAR={}'.format(p), 'part-0.parquet'))
+        frames.append(frame)
+        years += [p] * len(frame)
+    return _concat(frames, [name for name, ftype in info['fields']]), np.array(years, dtype=object)
+
+
+def watermark(frame, marks):
+    """ Latest creation/edit date in a table, as the text the next refresh puts in its where clause"""
+    latest = [frame[mark].max() for mark in marks] if len(frame) else []
+    latest = [value for value in latest if not pd.isnull(value)]
+    return max(latest).strftime('%Y-%m-%d %H:%M:%S') if latest else None
+
+
+def write_partitions(out, frame, years, touched=None):
+    """ Writes a table's year files, all of them or just the touched years. Gives back the
+    years the table has files for."""
+    if touched is None:
+        if os.path.exists(out):
+            shutil.rmtree(out)
+        # an empty table still gets a file so the snapshot keeps its columns
+        touched = set(years) or set(['none'])
+    for year in sorted(touched):
+        path = os.path.join(out, 'YEAR={}'.format(year))
+        rows = frame.loc[years == year]
+        if rows.empty and len(frame):
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            continue
+        if not os.path.exists(path):
+            os.makedirs(path)
+        rows.reset_index(drop=True).to_parquet(os.path.join(path, 'part-0.parquet'), index=False)
+    return sorted(set(years)) or ['none']
+
+
+def _refresh_rows(table, fields, names, types, out, info, key, marks):
+    """ A table's snapshot rows brought up to date: the rows created/edited since the watermark
+    replace their old copies, and rows deleted from SDE are dropped by anti-joining the
+    snapshot keys to the keys still in SDE.
+
+    Gives back the rows (kept rows first), the year files the kept rows were in and the
+    years of the rows that were replaced or deleted."""
+    old, old_years = _snapshot_frame(out, info)
+    current = _concat(list(_read_frames(table, [fields[names.index(key)]], [key], types, None)), [key])[key]
+    where = ' OR '.join("{} >= timestamp '{}'".format(mark, info['watermark']) for mark in marks)
+    changed = _concat(list(_read_frames(table, fields, names, types, where)), names)
+    gone = ~old[key].isin(current).values
+    keep = ~gone & ~old[key].isin(changed[key]).values
+    arcpy.AddMessage("{} rows changed and {} deleted since {}".format(len(changed), int(gone.sum()), info['watermark']))
+    frame = pd.concat([old.loc[keep, names], changed], ignore_index=True)
+    return frame, old_years[keep], set(old_years[~keep])
+
+
+def export_snapshot(connection, folder, tables=None, incremental=False):
+    """ Writes the report tables to folder as parquet,
+        folder/GUIDEDREC_DAY/YEAR=2021/part-0.parquet
+    with snapshot.json listing the fields, years, row counts and watermark of each table.
+    tables      - names out of SNAPSHOT_TABLES, all of them when None. A child table's parent is
+                  read too if it isn't in the list, it is needed for the years.
+    incremental - only read the rows created or edited since the last export and drop the
+                  ones deleted since, rewriting just the year files that changed. Tables
+                  without a watermark yet, or whose fields changed, are exported in full.
+    """
+    tables = [name.upper() for name in tables] if tables else list(SNAPSHOT_TABLES)
+    needed = []
+    for name in tables:
+        chain = []
+        while name and name not in needed and name not in chain:
+            chain.insert(0, name)
+            year = SNAPSHOT_TABLES[name]
+            name = year[1] if isinstance(year, tuple) else None
+        needed += chain
+    needed = [name for name in SNAPSHOT_TABLES if name in needed]
+    if incremental:
+        # the parents are needed for the children's years and a refresh of them is cheap
+        tables = needed
+
+    path = os.path.join(folder, SNAPSHOT_MANIFEST)
+    manifest = {'tables': {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+
+    parents = {}
+    for name in needed:
+        table = '{}{}'.format(connection, name)
+        out = os.path.join(folder, name)
+        fields, names, types = _resolve(table, None)
+        key = _snapshot_key(names, types)
+        marks = [field for field in names if field.upper() in WATERMARK_FIELDS and types[field] == 'Date']
+        info = manifest['tables'].get(name, {})
+        layout = [[n, types[n]] for n in names]
+        refresh = (incremental and key and marks and info.get('watermark') and info.get('key') == key and
+                   info.get('fields') == layout and os.path.exists(out))
+        if refresh:
+            arcpy.AddMessage("Refreshing {}...".format(name))
+            frame, kept_years, touched = _refresh_rows(table, fields, names, types, out, info, key, marks)
+        else:
+            arcpy.AddMessage("Reading {}...".format(name))
+            frame = _concat(list(_read_frames(table, fields, names, types, None)), names)
+        years = _snapshot_years(frame, SNAPSHOT_TABLES[name], parents).fillna('none').values
+        # children look their year up by their key into this table
+        for child_key, parent in [year for year in SNAPSHOT_TABLES.values() if isinstance(year, tuple)]:
+            if parent == name:
+                parents[(child_key, parent)] = pd.Series(years, index=frame[child_key].values).replace('none', np.nan)
+        if name not in tables:
+            continue
+
+        if refresh and len(frame):
+            # rows whose year moved (or whose parent's did) leave one file and go to another
+            kept = len(kept_years)
+            moved = kept_years != years[:kept]
+            touched |= set(kept_years[moved]) | set(years[:kept][moved]) | set(years[kept:])
+            partitions = write_partitions(out, frame, years, touched)
+        else:
+            partitions = write_partitions(out, frame, years)
+        manifest['tables'][name] = {'fields': layout,
+                                    'year': SNAPSHOT_TABLES[name],
+                                    'partitions': partitions,
+                                    'rows': len(frame),
+                                    'key': key,
+                                    'watermark': watermark(frame, marks) or info.get('watermark'),
+                                    'exported': time.strftime('%Y-%m-%d %H:%M:%S')}
+        arcpy.AddMessage("{} has {} rows in {} year files".format(name, len(frame), len(partitions)))
+
+    manifest['exported'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    invalidate()
+    return manifest
@@ -0,0 +1,547 @@
+# -*- coding: utf-8 -*-
+"""
+The detail report workbooks, one per business, filled in from the trips the
+report tools in MultiDatabase_CombinedReportOutput.pyt read.
+
+They live outside the .pyt so report_batch can build them on worker
+processes, a worker can import this module but not the toolbox.
+
+@author: kmmiles
+"""
+
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+from openpyxl import load_workbook
+from openpyxl.styles import NamedStyle, Alignment, PatternFill, Border, Side
+
+from report_styles import style_range, write_row
+from report_layout import FIRST_PAGE_ROWS, PAGE_ROWS, trip_rows, add_page_breaks
+
+
+class GuidedRecDetail:
+
+    def __init__(self, business_name, startdate, enddate, certification, save_path):
+
+        self.row = 4
+        # rows on the first printed page of the template and on each page after it
+        self.page_rows = (FIRST_PAGE_ROWS, PAGE_ROWS)
+        wb_path = r'{'ExamplePath'}\guided_rec_detail_template.xlsx'
+        wb = load_workbook(wb_path)
+
+        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
+        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
+        self.savefile = "GuidedRecDetail_" + savedates + '_' + savebusiness + ".xlsx"
+        self.path = os.path.join(save_path, self.savefile)
+
+        trip_style = NamedStyle('trip_style')
+        thin = Side(border_style='thin', color='000000')
+        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
+        wb.add_named_style(trip_style)
+
+        int_style = NamedStyle('int_style', number_format='0')
+        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        int_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(int_style)
+
+        coord_style = NamedStyle('coord_style', number_format='###.##0')
+        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        coord_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(coord_style)
+
+        float_style = NamedStyle('float_style', number_format='0.00')
+        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        float_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(float_style)
+
+        str_style = NamedStyle('str_style')
+        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        str_style.alignment = Alignment(horizontal='left')
+        wb.add_named_style(str_style)
+
+        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
+        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        datetime_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(datetime_style)
+
+        self.styles = ['datetime_style', 'int_style', 'str_style', 'coord_style',
+                       'coord_style', 'str_style', 'int_style', 'int_style',
+                       'int_style', 'float_style', 'datetime_style']
+
+        ws = wb.active
+        ws['C2'] = certification
+        header = 'Business/Organization: {}\nOperating Season: {}'.format(business_name, enddate.strftime('%Y'))
+        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
+        ws.firstHeader.left.text = header
+        ws.firstFooter.left.text = footer
+        ws.oddHeader.left.text = header
+        ws.evenHeader.left.text = header
+        ws.oddFooter.left.text = footer
+        ws.evenFooter.left.text = footer
+        # the workbook stays open for save_trips, the template is read once and the report saved once
+        self.wb = wb
+
+    @contextmanager
+    def __worksheet(self):
+
+        ws = self.wb.active
+        try:
+            yield ws
+        finally:
+            self.wb.save(self.path)
+
+    def save_trips(self, trips):
+
+        with self.__worksheet() as ws:
+            # trips are moved to the next page rather than split across two
+            starts, end = trip_rows([len(trips[trip_guid]['activities']) for trip_guid in trips.keys()], self.row, 1, *self.page_rows)
+            for trip_guid, start in zip(trips.keys(), starts):
+                self.row = start
+                self._add_trip(ws, **trips[trip_guid])
+            add_page_breaks(ws, end - 1, *self.page_rows)
+
+    def _add_trip(self, ws, startdate, enddate, tripclients, category, submitter, activities):
+
+        style_range(ws, 'A{0}:J{0}'.format(self.row), 'trip_style')
+
+        ws.merge_cells('A{}:C{}'.format(self.row, self.row))
+        ws.merge_cells('D{}:E{}'.format(self.row, self.row))
+        ws.merge_cells('F{}:G{}'.format(self.row, self.row))
+        ws.merge_cells('H{}:J{}'.format(self.row, self.row))
+        ws['A{}'.format(self.row)] = "Trip Dates: {}-{}".format(startdate.strftime('%m/%d/%Y'),
+                                                                enddate.strftime('%m/%d/%Y'))
+        ws['D{}'.format(self.row)] = 'Clients on Trip: {}'.format(tripclients)
+        ws['F{}'.format(self.row)] = 'Category: {}'.format(category)
+        ws['H{}'.format(self.row)] = 'By: {}, {}'.format(submitter[0], submitter[1].strftime('%m/%d/%Y'))
+        self.row += 1
+        self._add_activities(ws, activities)
+
+    def _add_activities(self, worksheet, activity_records):
+
+        for record in activity_records:
+            write_row(worksheet, self.row, record, self.styles)
+            self.row += 1
+
+
+class OutfittingDetail:
+
+    def __init__(self, business_name, startdate, enddate, reporter, certification, forestName, save_path):
+
+        self.row = 4
+        # rows on the first printed page of the template and on each page after it
+        self.page_rows = (FIRST_PAGE_ROWS, PAGE_ROWS)
+        wbPath = r'{'ExamplePath'}\Reports\outfitting_detail_template.xlsx'
+        wb = load_workbook(wbPath)
+
+        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
+        savedates = startdate.strftime("%Y%m%d") + "_" + enddate.strftime("%Y%m%d")
+        self.savefile = "OutfittingDetail_" + savedates + '_' + savebusiness + ".xlsx"
+        self.path = os.path.join(save_path, self.savefile)
+
+        trip_style = NamedStyle('trip_style')
+        thin = Side(border_style='thin', color='000000')
+        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+#        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
+        wb.add_named_style(trip_style)
+
+        int_style = NamedStyle('int_style', number_format='0')
+        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        int_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(int_style)
+
+        coord_style = NamedStyle('coord_style', number_format='###.##0')
+        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        coord_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(coord_style)
+
+        float_style = NamedStyle('float_style', number_format='0.000')
+        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        float_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(float_style)
+
+        str_style = NamedStyle('str_style')
+        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        str_style.alignment = Alignment(horizontal='left', wrapText = True)
+        wb.add_named_style(str_style)
+
+        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
+        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        datetime_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(datetime_style)
+
+        currancy_style = NamedStyle('curr_style', number_format=('#,##0.00'))
+        currancy_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        currancy_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(currancy_style)
+        
+        
+        self.styles = ['datetime_style', 'int_style', 'str_style',
+                       'str_style', 'datetime_style', 'str_style']
+
+        ws = wb.active
+        ws['C2'] = certification
+        header1 = 'Business/Organization: {}\nOperating Season: {}'.format(business_name,  enddate.strftime('%Y'))
+        
+        header2 = 'Outfitting Actual Use Report \n{} National Forest'.format(forestName) 
+        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
+        ws.firstHeader.left.text = header1
+        ws.firstFooter.left.text = footer
+        ws.firstHeader.right.text = header2
+        ws.oddHeader.left.text = header1
+        ws.evenHeader.left.text = header1
+        ws.oddFooter.left.text = footer
+        ws.evenFooter.left.text = footer
+        ws.oddHeader.right.text = header2
+        ws.evenHeader.right.text = header2
+        # the workbook stays open for save_trips, the template is read once and the report saved once
+        self.wb = wb
+        
+    @contextmanager
+    def __worksheet(self):
+    
+        ws = self.wb.active
+        try:
+            yield ws
+        finally:
+            self.wb.save(self.path)
+    
+    def save_trips(self, trips):
+    
+        with self.__worksheet() as ws:
+            # trips are moved to the next page rather than split across two
+            starts, end = trip_rows([len(trips[trip]['activities']) for trip in trips.keys()], self.row, 0, *self.page_rows)
+            for trip, start in zip(trips.keys(), starts):
+                self.row = start
+                self._add_trip(ws, **trips[trip])
+            add_page_breaks(ws, end - 1, *self.page_rows)
+                
+    def _add_trip(self, ws, tripDate, activities):
+
+        style_range(ws, 'A{0}:E{0}'.format(self.row), 'trip_style')
+
+
+#        self.row += 1
+        self._add_activities(ws, activities)
+
+    def _add_activities(self, worksheet, activity_records):
+
+        for record in activity_records:
+            write_row(worksheet, self.row, record, self.styles)
+            self.row += 1
+
+
+class MendenhallDetail:
+
+    def __init__(self, business_name, startdate, enddate, reporter, certification, save_path):
+
+        self.row = 4
+        # rows on the first printed page of the template and on each page after it
+        self.page_rows = (FIRST_PAGE_ROWS, PAGE_ROWS)
+        wbPath = r'{'ExamplePath'}\Reports\mendenhall_detail_template.xlsx'
+        wb = load_workbook(wbPath)
+
+        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
+        savedates = str(int(startdate)) + "_" + str(int(enddate))
+        self.savefile = "MendenhallDetail_" + savedates + '_' + savebusiness + ".xlsx"
+        self.path = os.path.join(save_path, self.savefile)
+
+        trip_style = NamedStyle('trip_style')
+        thin = Side(border_style='thin', color='000000')
+        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
+        wb.add_named_style(trip_style)
+
+        int_style = NamedStyle('int_style', number_format='0')
+        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        int_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(int_style)
+
+        coord_style = NamedStyle('coord_style', number_format='###.##0')
+        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        coord_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(coord_style)
+
+        float_style = NamedStyle('float_style', number_format='0.000')
+        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        float_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(float_style)
+
+        str_style = NamedStyle('str_style')
+        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        str_style.alignment = Alignment(horizontal='left', wrapText = True)
+        wb.add_named_style(str_style)
+
+        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
+        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        datetime_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(datetime_style)
+
+        self.styles = ['str_style', 'int_style',
+                       'int_style', 'int_style', 'str_style', 'datetime_style', 'str_style']
+
+        ws = wb.active
+        ws['C2'] = certification
+        header = 'Business/Organization: {}\nOperating Season: {} - {}'.format(business_name, int(startdate),
+                                                                                                   int(enddate))
+        footer = 'Report Generated: {}\n*None is not zero. It means that no data was collected.'.format(datetime.today().strftime('%m/%d/%Y'))
+        ws.firstHeader.left.text = header
+        ws.firstFooter.left.text = footer
+        ws.oddHeader.left.text = header
+        ws.evenHeader.left.text = header
+        ws.oddFooter.left.text = footer
+        ws.evenFooter.left.text = footer
+        # the workbook stays open for save_trips, the template is read once and the report saved once
+        self.wb = wb
+
+    @contextmanager
+    def __worksheet(self):
+
+        ws = self.wb.active
+        try:
+            yield ws
+        finally:
+            self.wb.save(self.path)
+
+    def save_trips(self, trips):
+
+        with self.__worksheet() as ws:
+            # trips are moved to the next page rather than split across two
+            starts, end = trip_rows([len(trips[trip_guid]['activities']) for trip_guid in trips.keys()], self.row, 1, *self.page_rows)
+            for trip_guid, start in zip(trips.keys(), starts):
+                self.row = start
+                self._add_trip(ws, **trips[trip_guid])
+            add_page_breaks(ws, end - 1, *self.page_rows)
+
+    def _add_trip(self, ws, reportMonth, tripMonth, clientMonth, sum16up, sum15down, activities):
+
+        style_range(ws, 'A{0}:F{0}'.format(self.row), 'trip_style')
+
+        ws.merge_cells('B{}:C{}'.format(self.row, self.row))
+        ws.merge_cells('F{}:G{}'.format(self.row, self.row))
+
+        
+        ws['A{}'.format(self.row)] = "Month: {}".format(reportMonth)
+        ws['B{}'.format(self.row)] = 'Trips Per Month: {}'.format(tripMonth)
+        ws['D{}'.format(self.row)] = 'Clients: {}'.format(clientMonth)
+        ws['E{}'.format(self.row)] = 'Clients > 16: {}'.format(sum16up)
+        ws['F{}'.format(self.row)] = 'Clients < 15: {}'.format(sum15down)
+        self.row += 1
+        self._add_activities(ws, activities)
+
+    def _add_activities(self, worksheet, activity_records):
+
+        for record in activity_records:
+            write_row(worksheet, self.row, record, self.styles)
+            self.row += 1
+
+
+class IcefieldDetail:
+
+    def __init__(self, business_name, startdate, enddate, reporter, certification, forestName, save_path):
+
+        self.row = 4
+        # rows on the first printed page of the template and on each page after it
+        self.page_rows = (FIRST_PAGE_ROWS, PAGE_ROWS)
+        wbPath = r'{'ExamplePath'}\Reports\icefields_detail_template.xlsx'
+        wb = load_workbook(wbPath)
+
+        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
+        savedates = str(int(startdate)) + "_" + str(int(enddate))
+        self.savefile = "Icefields_" + savedates + '_' + savebusiness + ".xlsx"
+        self.path = os.path.join(save_path, self.savefile)
+
+        trip_style = NamedStyle('trip_style')
+        thin = Side(border_style='thin', color='000000')
+        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
+        wb.add_named_style(trip_style)
+
+        int_style = NamedStyle('int_style', number_format='0')
+        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        int_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(int_style)
+
+        coord_style = NamedStyle('coord_style', number_format='###.##0')
+        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        coord_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(coord_style)
+
+        float_style = NamedStyle('float_style', number_format='0.000')
+        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        float_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(float_style)
+
+        str_style = NamedStyle('str_style')
+        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        str_style.alignment = Alignment(horizontal='left', wrapText = True)
+        wb.add_named_style(str_style)
+
+        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
+        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        datetime_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(datetime_style)
+
+        self.styles = ['str_style', 'int_style', 'int_style', 'int_style', 'int_style', 'int_style', 'int_style', 'datetime_style', 'str_style']
+
+        ws = wb.active
+        ws['C2'] = certification
+        header1 = 'Business/Organization: {}\nOperating Season: {}-{}'.format(business_name, int(startdate),
+                                                                                                   int(enddate))
+        header2 = 'Icefields Actual Use Report \n{} National Forest'.format(forestName)
+        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
+        ws.firstHeader.left.text = header1
+        ws.firstFooter.left.text = footer
+        ws.oddHeader.left.text = header1
+        ws.evenHeader.left.text = header1
+        ws.oddFooter.left.text = footer
+        ws.evenFooter.left.text = footer
+        ws.firstHeader.right.text = header2
+        ws.oddHeader.right.text = header2
+        ws.evenHeader.right.text = header2
+        # the workbook stays open for save_trips, the template is read once and the report saved once
+        self.wb = wb
+
+    @contextmanager
+    def __worksheet(self):
+
+        ws = self.wb.active
+        try:
+            yield ws
+        finally:
+            self.wb.save(self.path)
+
+    def save_trips(self, trips):
+
+        with self.__worksheet() as ws:
+            # trips are moved to the next page rather than split across two
+            starts, end = trip_rows([len(trips[trip_guid]['activities']) for trip_guid in trips.keys()], self.row, 1, *self.page_rows)
+            for trip_guid, start in zip(trips.keys(), starts):
+                self.row = start
+                self._add_trip(ws, **trips[trip_guid])
+            add_page_breaks(ws, end - 1, *self.page_rows)
+
+    def _add_trip(self, ws, reportMonth, landMonth, clientMonth, activities):
+
+        style_range(ws, 'A{0}:H{0}'.format(self.row), 'trip_style')
+
+        ws.merge_cells('A{}:C{}'.format(self.row, self.row))
+        ws.merge_cells('D{}:E{}'.format(self.row, self.row))
+        ws.merge_cells('F{}:I{}'.format(self.row, self.row))
+        ws['A{}'.format(self.row)] = "Month: {}".format(reportMonth)
+        ws['D{}'.format(self.row)] = 'Landings: {}'.format(landMonth)
+        ws['F{}'.format(self.row)] = 'Clients: {}'.format(clientMonth)
+        self.row += 1
+        self._add_activities(ws, activities)
+
+    def _add_activities(self, worksheet, activity_records):
+
+        for record in activity_records:
+            write_row(worksheet, self.row, record, self.styles)
+            self.row += 1
+
+
+class HeliskiDetail:
+
+    def __init__(self, business_name, startdate, enddate, reporter, certification, forestName, save_path):
+
+        self.row = 4
+        # rows on the first printed page of the template and on each page after it
+        self.page_rows = (FIRST_PAGE_ROWS, PAGE_ROWS)
+        wbPath = r'{'ExamplePath'}\Reports\heliski_detail_template.xlsx'
+        wb = load_workbook(wbPath)
+
+        savebusiness = re.sub(r'[^A-Za-z0-9]+', '', business_name.title())
+        savedates = str((startdate.strftime("%Y%m%d"))) + "_" + str((enddate.strftime("%Y%m%d")))
+        self.savefile = "Heliski_" + savedates + '_' + savebusiness + ".xlsx"
+        self.path = os.path.join(save_path, self.savefile)
+
+        trip_style = NamedStyle('trip_style')
+        thin = Side(border_style='thin', color='000000')
+        trip_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        trip_style.fill = PatternFill("solid", fgColor="AAAAAA")
+        wb.add_named_style(trip_style)
+
+        int_style = NamedStyle('int_style', number_format='0')
+        int_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        int_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(int_style)
+
+        coord_style = NamedStyle('coord_style', number_format='###.##0')
+        coord_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        coord_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(coord_style)
+
+        float_style = NamedStyle('float_style', number_format='0.000')
+        float_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        float_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(float_style)
+
+        str_style = NamedStyle('str_style')
+        str_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        str_style.alignment = Alignment(horizontal='left', wrapText = True)
+        wb.add_named_style(str_style)
+
+        datetime_style = NamedStyle('datetime_style', number_format='MM/DD/YY')
+        datetime_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        datetime_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(datetime_style)
+        
+        time_style = NamedStyle('time_style', number_format= 'h:mm' )
+        time_style.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        time_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(time_style)        
+
+        self.styles = ['datetime_style', 'int_style', 'str_style', 'coord_style', 'coord_style', 'str_style', 'int_style', 'int_style', 'time_style', 'time_style', 'datetime_style', 'str_style']
+
+        ws = wb.active
+        ws['C2'] = certification
+        header1 = 'Business/Organization: {}\nOperating Season: {}-{}'.format(business_name, startdate.strftime('%Y-%m-%d'),
+                                                                                                   enddate.strftime('%Y-%m-%d'))
+        header2 = 'Heliski Actual Use Report \n{} National Forest'.format(forestName)
+        footer = 'Report Generated: {}'.format(datetime.today().strftime('%m/%d/%Y'))
+        ws.firstHeader.left.text = header1
+        ws.firstFooter.left.text = footer
+        ws.oddHeader.left.text = header1
+        ws.evenHeader.left.text = header1
+        ws.oddFooter.left.text = footer
+        ws.evenFooter.left.text = footer
+        ws.firstHeader.right.text = header2
+        ws.oddHeader.right.text = header2
+        ws.evenHeader.right.text = header2
+        # the workbook stays open for save_trips, the template is read once and the report saved once
+        self.wb = wb
+
+    @contextmanager
+    def __worksheet(self):
+
+        ws = self.wb.active
+        try:
+            yield ws
+        finally:
+            self.wb.save(self.path)
+
+    def save_trips(self, trips):
+
+        with self.__worksheet() as ws:
+            # trips are moved to the next page rather than split across two
+            starts, end = trip_rows([len(trips[trip_guid]['activities']) for trip_guid in trips.keys()], self.row, 1, *self.page_rows)
+            for trip_guid, start in zip(trips.keys(), starts):
+                self.row = start
+                self._add_trip(ws, **trips[trip_guid])
+            add_page_breaks(ws, end - 1, *self.page_rows)
+
+    def _add_trip(self, ws, tripDate, activities):
+
+        style_range(ws, 'A{0}:L{0}'.format(self.row), 'trip_style')
+
+        self.row += 1
+        self._add_activities(ws, activities)
+
+    def _add_activities(self, worksheet, activity_records):
+
+        for record in activity_records:
+            write_row(worksheet, self.row, record, self.styles)
+            self.row += 1
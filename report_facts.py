@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Joined activity tables for the Guided Recreation and Hunting reports.
+
+Most of the summary reports rebuild the same chain for both programs,
+    ACTIVITY.merge(STOP, on='STOP_GUID').merge(DAY, on='DAY_GUID').merge(TRIP, on='TRIP_GUID')
+and then joins the LOCATION table onto it for the ranger district, use area
+and full name. build_facts joins it once per program, with the LOCATION
+attributes, into FACT_GUIDEDREC / FACT_HUNTING in the report snapshot and
+read_facts answers the reports from those. Without a snapshot the tables are
+read from SDE and merged, and the merged frame is kept in the report_data
+session cache so the next report asking for the same rows doesn't merge them
+again. The tools can't write to SDE, so the fact tables only exist in a
+snapshot.
+
+The fact tables keep every column under its table, DAY.TRIPDATE,
+STOP.USELOCATION, LOCATION.FULLNAME... read_facts hands back the same
+columns (and the same _x/_y names) the report's own merges would have.
+read_facts(location=True) carries the location columns along as
+LOCATION.<field>, out of the way of the report's own columns, and
+with_location turns them into what the report's
+    .merge(locDF, how='left', on='LOCATION_ID')
+gave.
+
+@author: kmmiles
+"""
+
+import json
+import os
+import time
+
+import pandas as pd
+import arcpy
+
+import report_sql
+from report_data import (FIELD_DTYPES, SNAPSHOT_MANIFEST, read_table, read_where_in, snapshot, cache,
+                         snapshot_files, snapshot_partitions, write_partitions, invalidate, encode)
+
+
+# Tables of each program from the activity up, and the key each one joins on to the one below
+FACT_CHAINS = {'GUIDEDREC': [('ACTIVITY', None), ('STOP', 'STOP_GUID'), ('DAY', 'DAY_GUID'), ('TRIP', 'TRIP_GUID')],
+               'HUNTING': [('ACTIVITY', None), ('STOP', 'STOP_GUID'), ('DAY', 'DAY_GUID'), ('TRIP', 'TRIP_GUID')]}
+
+# Field the fact tables are split into year files by
+FACT_YEAR = 'DAY.TRIPDATE'
+
+# Key the LOCATION table is joined on, and what read_facts puts in front of its columns
+LOCATION_KEY = 'LOCATION_ID'
+LOCATION_PREFIX = 'LOCATION.'
+
+
+def fact_name(program):
+    return 'FACT_{}'.format(program)
+
+
+def _levels(program, trip):
+    chain = FACT_CHAINS[program]
+    return chain if trip else chain[:-1]
+
+
+def _chain(frames, keys):
+    """ The merges the reports do, activity first and an inner join to each table above it"""
+    frame = frames[0]
+    for right, key in zip(frames[1:], keys[1:]):
+        frame = frame.merge(right, how='inner', on=key)
+    return frame
+
+
+def build_facts(folder, programs=None):
+    """ Joins each program's snapshot tables into its fact table, FACT_<program>/YEAR=<year>,
+    split up by the day's TRIPDATE. Trips and locations are left joined so a row is kept
+    when they are missing, read_facts(trip=True) drops those the way the inner merge does.
+    Run after export_snapshot, the tables come from the snapshot not SDE."""
+    path = os.path.join(folder, SNAPSHOT_MANIFEST)
+    with open(path) as f:
+        manifest = json.load(f)
+    tables = manifest['tables']
+
+    for program in programs or sorted(FACT_CHAINS):
+        chain = FACT_CHAINS[program]
+        names = ['{}_{}'.format(program, level) for level, key in chain]
+        if not all(name in tables for name in names + ['LOCATION']):
+            arcpy.AddWarning("{} isn't built, the snapshot is missing some of its tables".format(fact_name(program)))
+            continue
+        arcpy.AddMessage("Building {}...".format(fact_name(program)))
+
+        fields = []
+        frame = None
+        for (level, key), name in zip(chain, names):
+            table = snapshot_files(folder, name, tables[name]['partitions'])
+            table.columns = ['{}.{}'.format(level, column) for column in table.columns]
+            fields += [['{}.{}'.format(level, n), t] for n, t in tables[name]['fields']]
+            if frame is None:
+                frame = table
+            else:
+                below = [lower for lower, k in chain if '{}.{}'.format(lower, key) in frame.columns][-1]
+                frame = frame.merge(table, how='left' if level == 'TRIP' else 'inner',
+                                    left_on='{}.{}'.format(below, key), right_on='{}.{}'.format(level, key))
+
+        located = [column for column in frame.columns if column.endswith('.' + LOCATION_KEY)]
+        if located:
+            location = snapshot_files(folder, 'LOCATION', tables['LOCATION']['partitions'])
+            location.columns = [LOCATION_PREFIX + column for column in location.columns]
+            # one location per row, a repeated LOCATION_ID would repeat the activities
+            location = location.drop_duplicates(LOCATION_PREFIX + LOCATION_KEY)
+            fields += [[LOCATION_PREFIX + n, t] for n, t in tables['LOCATION']['fields']]
+            frame = frame.merge(location, how='left', left_on=located[0], right_on=LOCATION_PREFIX + LOCATION_KEY)
+
+        years = frame[FACT_YEAR].dt.year.map(lambda y: 'none' if pd.isnull(y) else str(int(y))).values
+        partitions = write_partitions(os.path.join(folder, fact_name(program)), frame.reset_index(drop=True), years)
+        tables[fact_name(program)] = {'fields': fields,
+                                      'year': FACT_YEAR,
+                                      'partitions': partitions,
+                                      'rows': len(frame),
+                                      'exported': time.strftime('%Y-%m-%d %H:%M:%S')}
+        arcpy.AddMessage("{} has {} rows in {} year files".format(fact_name(program), len(frame), len(partitions)))
+
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    invalidate()
+
+
+def _layout(program, fields, info, trip):
+    """ Works out the columns of the report's merge and which fact column each one comes from.
+    Follows the pandas merge naming: the key is kept once from the left, other columns in
+    both get _x (left) and _y (right)."""
+    wanted = set(field.upper() for field in fields)
+    layout = None
+    for level, key in _levels(program, trip):
+        columns = [(name.split('.', 1)[1], name) for name, ftype in info['fields']
+                   if name.startswith(level + '.') and name.split('.', 1)[1].upper() in wanted]
+        if layout is None:
+            layout = columns
+            continue
+        both = set(column for column, source in layout) & set(column for column, source in columns)
+        both.discard(key)
+        layout = ([(column + '_x' if column in both else column, source) for column, source in layout] +
+                  [(column + '_y' if column in both else column, source) for column, source in columns if column != key])
+    return layout
+
+
+def _has_location(info):
+    return any(name == LOCATION_PREFIX + LOCATION_KEY for name, ftype in info['fields'])
+
+
+def _read_fact(program, fields, wheres, trip, categories, location):
+    info = snapshot['manifest']['tables'][fact_name(program)]
+    levels = [level for level, key in _levels(program, trip)]
+    layout = _layout(program, fields, info, trip)
+    if location:
+        wanted = set(field.upper() for field in fields) | set([LOCATION_KEY])
+        layout += [(name, name) for name, ftype in info['fields']
+                   if name.startswith(LOCATION_PREFIX) and name[len(LOCATION_PREFIX):].upper() in wanted]
+    trees = dict((level, report_sql.parse(where)) for level, where in wheres.items() if where and level in levels)
+
+    needed = set(source for column, source in layout)
+    for level, tree in trees.items():
+        needed |= set('{}.{}'.format(level, column) for column in report_sql.columns(tree))
+    if trip:
+        needed.add('TRIP.TRIP_GUID')
+    columns = [name for name, ftype in info['fields'] if name in needed or name.upper() in needed]
+
+    partitions = snapshot_partitions(info, trees.get('DAY'), 'TRIPDATE')
+    frame = snapshot_files(snapshot['folder'], fact_name(program), partitions, columns)
+    keep = pd.Series(True, index=frame.index).values
+    for level, tree in trees.items():
+        part = frame[[column for column in columns if column.startswith(level + '.')]]
+        part.columns = [column.split('.', 1)[1] for column in part.columns]
+        keep = keep & report_sql.mask(part, tree)
+    if trip:
+        keep = keep & frame['TRIP.TRIP_GUID'].notna().values
+    frame = frame.loc[keep]
+
+    types = dict((name, ftype) for name, ftype in info['fields'])
+    result = pd.DataFrame(dict((column, frame[source].values) for column, source in layout),
+                          columns=[column for column, source in layout])
+    for column, source in layout:
+        # the left joined trip columns come back as float when a trip was missing
+        if FIELD_DTYPES.get(types[source]) == 'int64' and not result[column].isna().any():
+            result[column] = result[column].astype('int64')
+    return encode(result) if categories else result
+
+
+def _join_location(frame, connection, fields, categories):
+    """ Left joins the LOCATION table onto the merged rows, its columns as LOCATION.<field>"""
+    location = read_table('{}LOCATION'.format(connection), list(fields) + [LOCATION_KEY], categories=categories)
+    location = location.drop_duplicates(LOCATION_KEY)
+    location.columns = [LOCATION_PREFIX + column for column in location.columns]
+    return frame.merge(location, how='left', left_on=LOCATION_KEY, right_on=LOCATION_PREFIX + LOCATION_KEY)
+
+
+def with_location(frame, prepare=None):
+    """ The rows of read_facts(location=True) the way frame.merge(prepare(locDF), how='left',
+    on='LOCATION_ID') gave them, with the LOCATION.<field> columns under their own names and
+    _x (the report's) / _y (the location's) where a name is in both. prepare gets the location
+    columns of the rows that have a location and hands them back, e.g. fill_locations."""
+    carried = [column for column in frame.columns if column.startswith(LOCATION_PREFIX)]
+    location = frame[carried]
+    location.columns = [column[len(LOCATION_PREFIX):] for column in carried]
+    location = location.loc[location[LOCATION_KEY].notna()]
+    if prepare is not None:
+        location = prepare(location)
+    location = location.drop(columns=[LOCATION_KEY]).reindex(frame.index)
+    frame = frame.drop(columns=carried)
+    both = set(frame.columns) & set(location.columns)
+    return pd.concat([frame.rename(columns=dict((column, column + '_x') for column in both)),
+                      location.rename(columns=dict((column, column + '_y') for column in both))], axis=1)
+
+
+def fill_locations(location):
+    """ The fill-ins the summaries make on the LOCATION table: the zone name for a location
+    without a full name, USE_AREA from the full name and the unknown ranger district"""
+    location = location.copy()
+    location['FULLNAME'] = location['FULLNAME'].fillna(location['ZONE_NAME'])
+    location['USE_AREA'] = location['FULLNAME'].fillna('Use Area Unknown')
+    location['DISTRICTNAME'] = location['DISTRICTNAME'].fillna('Ranger District Unknown')
+    return location
+
+
+def read_facts(connection, program, fields, day_where=None, stop_where=None, act_where=None, trip_where=None, trip=False,
+               categories=False, location=False):
+    """ Activity rows of a program joined to their stop and day (and trip with trip=True), the
+    same as
+        actDF.merge(stopDF, on='STOP_GUID').merge(dayDF, on='DAY_GUID')[.merge(tripDF, on='TRIP_GUID')]
+    with each table read for the report's fields and filtered by its where clause.
+    categories=True keeps the names as categoricals, see report_data.read_table.
+    location=True adds the LOCATION columns in fields as LOCATION.<field>, see with_location.
+
+    Comes from FACT_<program> when the reports are reading a snapshot that has it, otherwise
+    the tables are read from SDE (the stops by the days read, the activities by the stops)
+    and merged here, once per session for the same fields and where clauses.
+    """
+    wheres = {'DAY': day_where, 'STOP': stop_where, 'ACTIVITY': act_where, 'TRIP': trip_where}
+    if snapshot['folder'] and fact_name(program) in snapshot['manifest']['tables']:
+        info = snapshot['manifest']['tables'][fact_name(program)]
+        if not location or _has_location(info):
+            return _read_fact(program, fields, wheres, trip, categories, location)
+        # built before the fact tables had the locations in them
+        frame = _read_fact(program, fields, wheres, trip, categories, False)
+        return _join_location(frame, connection, fields, categories)
+
+    source = '{}{}'.format(connection, fact_name(program))
+    where_key = (tuple(sorted(wheres.items())), trip, tuple(fields), categories, location)
+    frame = cache.get(source, None, where_key)
+    if frame is not None:
+        return frame
+
+    dayDF = read_table('{}{}_DAY'.format(connection, program), fields, where=day_where, categories=categories)
+    stopDF = read_where_in('{}{}_STOP'.format(connection, program), 'DAY_GUID', dayDF['DAY_GUID'], fields,
+                           where=stop_where, categories=categories)
+    actDF = read_where_in('{}{}_ACTIVITY'.format(connection, program), 'STOP_GUID', stopDF['STOP_GUID'], fields,
+                          where=act_where, categories=categories)
+    frames = [actDF, stopDF, dayDF]
+    if trip:
+        tripDF = read_where_in('{}{}_TRIP'.format(connection, program), 'TRIP_GUID', dayDF['TRIP_GUID'], fields,
+                               where=trip_where, categories=categories)
+        frames.append(tripDF)
+    frame = _chain(frames, [key for level, key in _levels(program, trip)])
+    if location:
+        frame = _join_location(frame, connection, fields, categories)
+    cache.put(source, list(frame.columns), where_key, frame)
+    return frame
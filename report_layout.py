@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Page layout of the trip blocks in the detail reports.
+
+A trip's header row and activity rows are kept on one printed page. The
+rows each trip starts on are worked out from the activity counts before
+anything is written, and the report then gets a page break at the end of
+every page so Excel prints the pages where the layout put them.
+
+@author: kmmiles
+"""
+
+# Rows on the first page of a detail template (its title rows included) and on every page after
+FIRST_PAGE_ROWS = 27
+PAGE_ROWS = 29
+
+
+def page_line(row, first_page=FIRST_PAGE_ROWS, page=PAGE_ROWS):
+    """ Line of its printed page a sheet row falls on"""
+    if row <= first_page:
+        return row
+    return (row - first_page) % page or page
+
+
+def trip_rows(counts, row, header=1, first_page=FIRST_PAGE_ROWS, page=PAGE_ROWS):
+    """ Sheet row each trip starts on, from the number of activity rows of each trip. A trip
+    whose activities would run past the end of its page starts on the next page instead.
+
+    counts - activity rows of each trip, in the order they are written
+    row    - first row the trips can go on
+    header - rows the trip header takes before its activities
+
+    Gives back the start rows and the row after the last trip."""
+    starts = []
+    for count in counts:
+        line = page_line(row, first_page, page)
+        if row <= first_page and line + count > first_page:
+            row += first_page + 1 - line
+        elif row > first_page and line + count > page:
+            row += page + 1 - line
+        starts.append(row)
+        row += header + count
+    return starts, row
+
+
+def page_ends(last_row, first_page=FIRST_PAGE_ROWS, page=PAGE_ROWS):
+    """ Last row of every page before the one last_row is on"""
+    return list(range(first_page, last_row, page))
+
+
+def add_page_breaks(ws, last_row, first_page=FIRST_PAGE_ROWS, page=PAGE_ROWS):
+    """ Puts a page break after the last row of each page up to last_row"""
+    from openpyxl.worksheet.pagebreak import Break
+
+    for end in page_ends(last_row, first_page, page):
+        ws.row_breaks.append(Break(id=end))
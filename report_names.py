@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Business name index for the report tools and the Business Name Excel Creator.
+
+The pickers, FiveYearSummary and the Creator each used to gather the names
+themselves, a DISTINCT cursor or np.unique(FeatureClassToNumPyArray(...))
+over the activity tables. The index keeps one row per business and dataset,
+    BUSINESSNAME, DATASET, FIRSTYEAR, LASTYEAR, ROWS
+in NAMES_INDEX (json) so it outlives the ArcGIS session. Each dataset is
+read from one table, NAME_TABLES, and is built in full once. After that
+update_index only asks the table what changed since its watermark:
+    nothing changed        - the dataset is left as it is
+    only new rows          - they are added to the counts
+    edits or deletes       - the names on the changed rows are summarized
+                             again and names no longer in the table dropped
+The counts of the other names can't see rows deleted or renamed away from
+them, the dataset is marked stale until update_index(rebuild=True) or
+drop_names. The pickers check a dataset again once it is older than NAMES_TTL.
+Datasets are matched on the table name, not the path, so tools reaching
+the table through different connections share them.
+
+scan_names reads its tables one at a time by default. arcpy doesn't say
+its cursors are thread safe, and cursors on the same .sde file share the
+workspace's connection. Pass workers > 1 only for tables in a workspace
+where concurrent cursors have been checked to work.
+
+@author: kmmiles
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import arcpy
+
+from report_data import WATERMARK_FIELDS, watermark, table_name, list_fields, read_table, in_clauses
+
+
+# Where the index is kept between sessions
+NAMES_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'business_names.json')
+
+# Seconds before the pickers check a dataset's table for changes again
+NAMES_TTL = 60 * 60
+
+# Dataset -> (table the names are read from, field the years come from)
+NAME_TABLES = OrderedDict([('GUIDEDREC', ('GUIDEDREC_DAY', 'TRIPDATE')),
+                           ('HELISKI', ('HELISKI_TRIP', 'TRIPDATE')),
+                           ('HUNTING', ('HUNTING_DAY', 'TRIPDATE')),
+                           ('ICEFIELD', ('ICEFIELD_TRIPMONTH', 'REPORTYEAR')),
+                           ('MENDENHALL', ('MENDENHALL_TRIPMONTH', 'REPORTYEAR')),
+                           ('OUTFITTING', ('OUTFITTING_ACTIVITY', 'TRIPDATE'))])
+
+# Tables scan_names reads at the same time, more than 1 runs cursors on threads (see above)
+SCAN_WORKERS = 1
+
+# Fields that only get set when a row is added
+CREATION_FIELDS = ('CREATIONDATE', 'CREATED_DATE')
+
+INDEX_COLUMNS = ['BUSINESSNAME', 'DATASET', 'FIRSTYEAR', 'LASTYEAR', 'ROWS']
+
+# The index as last read or written, and the file time it was read at
+_index = {'path': None, 'mtime': None, 'index': None}
+
+# (parameter name, tables) -> (time, names) of the pickers fill_names has filled
+_filled = {}
+
+
+def name_tables(connection, datasets=None):
+    """ Dataset -> table path for the datasets (all of them when None), connection is the
+    prefix the tools put in front of their table names"""
+    return OrderedDict((dataset, '{}{}'.format(connection, NAME_TABLES[dataset][0]))
+                       for dataset in (datasets or NAME_TABLES))
+
+
+def _empty():
+    return {'datasets': {}, 'names': {}}
+
+
+def load_index(path=NAMES_INDEX):
+    """ The index file, read again only when it has changed on disk"""
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    if _index['path'] != path or _index['mtime'] != mtime or _index['index'] is None:
+        index = _empty()
+        if mtime is not None:
+            try:
+                with open(path) as f:
+                    index = json.load(f)
+            except ValueError:
+                arcpy.AddWarning("Business name index {} can't be read, it will be built again".format(path))
+        _index.update(path=path, mtime=mtime, index=index)
+    return _index['index']
+
+
+def _save(index, path):
+    try:
+        with open(path + '.tmp', 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(path + '.tmp', path)
+    except (IOError, OSError) as e:
+        # keep going off the copy in memory
+        arcpy.AddWarning("Business name index couldn't be saved to {}: {}".format(path, e))
+    _index.update(path=path, mtime=os.path.getmtime(path) if os.path.exists(path) else None, index=index)
+
+
+def read_index(datasets=None, path=NAMES_INDEX):
+    """ The index as a DataFrame of INDEX_COLUMNS, for the datasets given or all of them"""
+    index = load_index(path)
+    rows = [[name, dataset, first, last, count]
+            for dataset in (datasets or sorted(index['names']))
+            for name, first, last, count in index['names'].get(dataset, [])]
+    return pd.DataFrame(rows, columns=INDEX_COLUMNS)
+
+
+def _years(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.year
+    # REPORTYEAR is text in the month tables
+    return pd.to_numeric(values, errors='coerce')
+
+
+def _summarize(frame, year):
+    """ [name, first year, last year, rows] for each business in a table's rows"""
+    frame = frame[frame['BUSINESSNAME'].notna()]
+    if frame.empty:
+        return []
+    counts = pd.DataFrame({'BUSINESSNAME': frame['BUSINESSNAME'].values,
+                           'YEAR': _years(frame[year]).values}).groupby('BUSINESSNAME')['YEAR']
+    summary = counts.agg(['min', 'max', 'size'])
+    return [[name, None if pd.isnull(first) else int(first), None if pd.isnull(last) else int(last), int(rows)]
+            for name, first, last, rows in summary.itertuples()]
+
+
+def _merge(names, added):
+    """ Adds the summary of new rows to a dataset's names"""
+    merged = dict((row[0], list(row)) for row in names)
+    for name, first, last, rows in added:
+        if name not in merged:
+            merged[name] = [name, first, last, rows]
+            continue
+        row = merged[name]
+        row[1] = min([y for y in (row[1], first) if y is not None] or [None])
+        row[2] = max([y for y in (row[2], last) if y is not None] or [None])
+        row[3] += rows
+    return [merged[name] for name in sorted(merged)]
+
+
+def _edit(table, year, names, changed):
+    """ A dataset's names after rows were edited or deleted: the names on the changed rows are
+    summarized again from all of their rows, and names the table no longer has are dropped"""
+    edited = sorted(set(changed['BUSINESSNAME'].dropna()))
+    frames = [read_table(table, ['BUSINESSNAME', year], where=where, use_cache=False)
+              for where in in_clauses('BUSINESSNAME', edited)]
+    present = set(read_table(table, ['BUSINESSNAME'], sql_clause=('DISTINCT', None), use_cache=False)['BUSINESSNAME'].dropna())
+    kept = [row for row in names if row[0] not in edited and row[0] in present]
+    return _merge(kept, _summarize(pd.concat(frames, ignore_index=True), year) if frames else [])
+
+
+def _update_dataset(dataset, table, info, names, rebuild):
+    """ Gives back the dataset's (info, names), brought up to date with its table"""
+    year = NAME_TABLES[dataset][1]
+    marks = [name.split('.')[-1] for name, ftype in list_fields(table)
+             if name.split('.')[-1].upper() in WATERMARK_FIELDS and ftype == 'Date']
+    fields = ['BUSINESSNAME', year] + marks
+    if not rebuild and marks and info.get('watermark') and info.get('table') == table_name(table):
+        count = int(arcpy.GetCount_management(table)[0])
+        # >= as the snapshot refresh does, a row saved in the watermark's second after the
+        # last check is read. The rows at the watermark that were read then come back too.
+        where = ' OR '.join("{} >= timestamp '{}'".format(mark, info['watermark']) for mark in marks)
+        changed = read_table(table, fields, where=where, use_cache=False)
+        created = [mark for mark in marks if mark.upper() in CREATION_FIELDS]
+        newer = changed[pd.concat([pd.to_datetime(changed[mark]) > pd.Timestamp(info['watermark'])
+                                   for mark in marks], axis=1).any(axis=1).values]
+        if newer.empty and count == info['rows']:
+            return dict(info, checked=time.time()), names
+        updated = dict(info, rows=count, watermark=watermark(changed, marks) or info['watermark'], checked=time.time())
+        if created and count == info['rows'] + len(newer) and \
+                (pd.to_datetime(newer[created[0]]) > pd.Timestamp(info['watermark'])).all():
+            arcpy.AddMessage("Adding {} new rows of {} to the business name index".format(len(newer), dataset))
+            return updated, _merge(names, _summarize(newer, year))
+        arcpy.AddMessage("Updating {} edited names of {} in the business name index".format(
+            changed['BUSINESSNAME'].nunique(), dataset))
+        return dict(updated, stale=True), _edit(table, year, names, changed)
+
+    arcpy.AddMessage("Building the business name index for {}...".format(dataset))
+    frame = read_table(table, fields, use_cache=False)
+    return ({'table': table_name(table),
+             'rows': len(frame),
+             'watermark': watermark(frame, marks),
+             'checked': time.time(),
+             'built': time.strftime('%Y-%m-%d %H:%M:%S')},
+            _summarize(frame, year))
+
+
+def update_index(tables, rebuild=False, ttl=None, path=NAMES_INDEX):
+    """ Brings the index up to date for the tables given, dataset -> table path (name_tables).
+    rebuild - read every table in full, e.g. after edits made without editor tracking, or
+              to bring the counts of a stale dataset back
+    ttl     - leave datasets checked less than ttl seconds ago alone
+    Gives back the index as read_index does, for those datasets."""
+    index = load_index(path)
+    now = time.time()
+    changed = False
+    for dataset, table in tables.items():
+        info = index['datasets'].get(dataset, {})
+        if ttl is not None and not rebuild and info.get('table') == table_name(table) and now - info.get('checked', 0) <= ttl:
+            continue
+        info, names = _update_dataset(dataset, table, info, index['names'].get(dataset, []), rebuild)
+        index['datasets'][dataset] = info
+        index['names'][dataset] = names
+        changed = True
+    if changed:
+        _save(index, path)
+    return read_index(list(tables), path)
+
+
+def drop_names(datasets=None, path=NAMES_INDEX):
+    """ Marks datasets (all of them when None) to be built again the next time they're read,
+    for edits the watermarks don't show"""
+    index = load_index(path)
+    for dataset in list(datasets or index['datasets']):
+        index['datasets'].pop(dataset, None)
+    _save(index, path)
+    _filled.clear()
+
+
+def _distinct_names(table):
+    with arcpy.da.SearchCursor(table, "BUSINESSNAME", sql_clause=("DISTINCT", None)) as sc:
+        return [row[0] for row in sc if row[0] is not None]
+
+
+def scan_names(tables, workers=SCAN_WORKERS):
+    """ Set of (name, label) for every business name in the tables, label -> table path. Reads
+    the tables themselves, not the index, workers at a time."""
+    if workers > 1 and len(tables) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tables))) as pool:
+            found = list(pool.map(_distinct_names, tables.values()))
+    else:
+        found = [_distinct_names(table) for table in tables.values()]
+    pairs = set()
+    for label, names in zip(tables, found):
+        arcpy.AddMessage("Read {} business names from {}".format(len(names), label))
+        pairs.update((name, label) for name in names)
+    return pairs
+
+
+def business_names(tables, refresh=False):
+    """ Sorted business names found in any of the datasets, from the index"""
+    index = update_index(tables, ttl=None if refresh else NAMES_TTL)
+    return sorted(set(index['BUSINESSNAME']))
+
+
+def fill_names(parameter, tables):
+    """ Fills a business picker's value list. Call from updateParameters, it only goes to the
+    index the first time for a picker (and again after NAMES_TTL), so a picker whose
+    datasets have no names isn't looked up on every validation."""
+    key = (parameter.name, tuple(tables.values()))
+    filled = _filled.get(key)
+    if filled is None or time.time() - filled[0] > NAMES_TTL:
+        filled = _filled[key] = (time.time(), business_names(tables))
+    if parameter.filter.list != filled[1]:
+        parameter.filter.list = filled[1]
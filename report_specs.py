@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Summary reports written as specs instead of code.
+
+ConfirmActualUse, IcefieldSummary and MendenhallSummary were each the same few
+steps, read a table (and merge its activities on), add a column or two, then
+pd.pivot_table. Only the tables, columns and pivots changed. A spec is a dict
+that says those:
+    fields  - fields the reads pull
+    sources - table, where clause and the activity table merged on to it, if any,
+              and the columns derived on the merged rows (helpers below)
+    pivots  - values x index x columns of a source, margins/dropna as pivot_table
+              takes them. 'by' makes one pivot per group of a column, 'empty' is the
+              message a sheet gets when there are no rows, 'when' only makes the
+              pivot when the tool's parameters match
+    sheets  - (sheet name, pivot, layout options) in workbook order
+The where clauses and messages are format strings filled in from the tool's
+parameters.
+
+run_spec reads each table/where once however many sources use it, derives each
+source once, and makes all the pivots of a source from one groupby sum at the
+finest grain any of them needs. The tools keep their own styling, driven by the
+layout options of the sheets write_sheets hands back.
+
+@author: kmmiles
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from report_data import read_table
+
+
+def copy_of(field):
+    return lambda frame: frame[field]
+
+
+def year_of(field):
+    return lambda frame: frame[field].dt.year
+
+
+def row_sum(fields):
+    return lambda frame: frame[fields].sum(axis=1)
+
+
+def trip_count(flag='Yes', no_ops=0.1):
+    """ 1 for a trip, no_ops for a NO_OPERATION record so the sheet can mark the year"""
+    return lambda frame: pd.Series(np.where(frame['NO_OPERATION'] == flag, no_ops, 1.0), index=frame.index)
+
+
+def _when(spec, params):
+    return all(params.get(key) == value for key, value in spec.get('when', {}).items())
+
+
+def _read(connection, table, fields, where, categories, reads):
+    key = (table, where, categories)
+    if key not in reads:
+        reads[key] = read_table('{}{}'.format(connection, table), fields, where=where, categories=categories)
+    return reads[key]
+
+
+def _source(spec, name, connection, params, reads):
+    source = spec['sources'][name]
+    categories = source.get('categories', False)
+    where = source['where'].format(**params) if source.get('where') else None
+    frame = _read(connection, source['table'], spec['fields'], where, categories, reads)
+    if source.get('activities'):
+        activities = _read(connection, source['activities'], spec['fields'], None, categories, reads)
+        frame = activities.merge(frame, how='inner', on=source['on'])
+    frame = frame.rename(columns=source.get('rename', {}))
+    if source.get('derive'):
+        frame = frame.copy()
+        for column, derive in source['derive']:
+            frame[column] = derive(frame)
+    return frame
+
+
+def _listed(*lists):
+    seen = []
+    for items in lists:
+        for item in ([items] if isinstance(items, str) else items):
+            if item not in seen:
+                seen.append(item)
+    return seen
+
+
+def _pivot(sums, pivot):
+    return pd.pivot_table(sums, values=pivot['values'], index=pivot['index'], columns=pivot['columns'],
+                          aggfunc=np.sum, margins=pivot.get('margins', False), dropna=pivot.get('dropna', True),
+                          margins_name='Total', observed=True)
+
+
+def run_spec(spec, connection, params):
+    """ Runs a spec's pivots, OrderedDict of pivot name (or group name for a 'by' pivot) to the
+    pivot table, or the message for a sheet with no rows"""
+    pivots = OrderedDict((name, pivot) for name, pivot in spec['pivots'].items() if _when(pivot, params))
+    reads = {}
+    results = OrderedDict()
+    for source in spec['sources']:
+        used = [(name, pivot) for name, pivot in pivots.items() if pivot['source'] == source]
+        if not used:
+            continue
+        frame = _source(spec, source, connection, params, reads)
+        keys = _listed(*[[pivot['by']] if pivot.get('by') else [] for name, pivot in used] +
+                        [pivot['index'] + pivot['columns'] for name, pivot in used])
+        values = _listed(*[pivot['values'] for name, pivot in used])
+        # one pass over the rows, every pivot of the source is made from these
+        sums = frame.groupby(keys, as_index=False, observed=True, dropna=False)[values].sum()
+        for name, pivot in used:
+            if not pivot.get('by'):
+                results[name] = (pivot.get('empty', '').format(**params) if frame.empty and pivot.get('empty')
+                                 else _pivot(sums, pivot))
+                continue
+            groups = dict(list(sums.groupby(pivot['by'], observed=True)))
+            for group in pivot['groups']:
+                if group in groups:
+                    results[group] = _pivot(groups[group], pivot)
+                else:
+                    results[group] = pivot['empty'].format(group=group, **params)
+    return results
+
+
+def write_sheets(xlsx, spec, results):
+    """ Writes the results to the sheets of an ExcelWriter in the spec's order. A message goes
+    on its sheet as is, gives back (worksheet, layout options) of the pivot sheets to style."""
+    written = []
+    for sheet, name, options in spec['sheets']:
+        if name not in results:
+            continue
+        if isinstance(results[name], str):
+            pd.DataFrame({'Message': [results[name]]}).to_excel(xlsx, sheet)
+            continue
+        results[name].to_excel(xlsx, sheet)
+        written.append((xlsx.sheets[sheet], options))
+    return written
+
+
+# Number of trip records each business submitted a year, on the forest picked
+_TRIP_COUNTS = {'values': ['Number of Trips'], 'index': ['BUSINESSNAME'], 'columns': ['Year'], 'dropna': False}
+_TRIP_WHERE = "{field} >= timestamp '{{start}}' AND {end} <= timestamp '{{end}}' AND FORESTNAME = '{{forest}}'"
+_YEAR_WHERE = "REPORTYEAR >= {startYear} AND REPORTYEAR <= {endYear}"
+
+CONFIRM_USE = {
+    'fields': ['BUSINESSNAME', 'NO_OPERATION', 'REPORTYEAR', 'STARTDATE', 'TRIPDATE'],
+    'sources': OrderedDict([
+        ('ice', {'table': 'ICEFIELD_TRIPMONTH', 'where': _YEAR_WHERE,
+                 'derive': [('Year', copy_of('REPORTYEAR')), ('Number of Trips', trip_count())]}),
+        ('guide', {'table': 'GUIDEDREC_TRIP', 'where': _TRIP_WHERE.format(field='STARTDATE', end='ENDDATE'),
+                   'derive': [('Year', year_of('STARTDATE')), ('Number of Trips', trip_count())]}),
+        ('hunt', {'table': 'HUNTING_TRIP', 'where': _TRIP_WHERE.format(field='STARTDATE', end='ENDDATE'),
+                  'derive': [('Year', year_of('STARTDATE')), ('Number of Trips', trip_count('YES'))]}),
+        ('heli', {'table': 'HELISKI_TRIP', 'where': _TRIP_WHERE.format(field='TRIPDATE', end='TRIPDATE'),
+                  'derive': [('Year', year_of('TRIPDATE')), ('Number of Trips', trip_count())]}),
+        ('mend', {'table': 'MENDENHALL_TRIPMONTH', 'where': _YEAR_WHERE,
+                  'derive': [('Year', copy_of('REPORTYEAR')), ('Number of Trips', trip_count())]}),
+        ('outfit', {'table': 'OUTFITTING_ACTIVITY', 'where': _TRIP_WHERE.format(field='TRIPDATE', end='TRIPDATE'),
+                    'derive': [('Year', year_of('TRIPDATE')), ('Number of Trips', trip_count())]})]),
+    'pivots': OrderedDict([
+        ('guide', dict(_TRIP_COUNTS, source='guide')),
+        ('hunt', dict(_TRIP_COUNTS, source='hunt')),
+        ('outfit', dict(_TRIP_COUNTS, source='outfit')),
+        ('heli', dict(_TRIP_COUNTS, source='heli')),
+        # the juneau icefields and mendenhall glacier are on the Tongass
+        ('ice', dict(_TRIP_COUNTS, source='ice', when={'forest': 'Tongass'})),
+        ('mend', dict(_TRIP_COUNTS, source='mend', when={'forest': 'Tongass'}))]),
+    'sheets': [('Guided Rec', 'guide', {'dataset': 'Guided Recreation', 'records': 'Trip', 'noUse': True}),
+               ('Guided Hunting', 'hunt', {'dataset': 'Guided Hunting', 'records': 'Trip'}),
+               ('Outfitting', 'outfit', {'dataset': 'Outfitting', 'records': 'Trip', 'noUse': True}),
+               ('Heliski', 'heli', {'dataset': 'Heliski', 'records': 'Trip', 'noUse': True}),
+               ('Icefield', 'ice', {'dataset': 'Icefields', 'records': 'Trip-Month', 'noUse': True}),
+               ('Mendenhall', 'mend', {'dataset': 'Mendenhall', 'records': 'Trip-Month', 'noUse': True})]}
+
+# Clients and landings by location for the last 10 years
+_ICEFIELD_PIVOT = {'source': 'trips', 'columns': ['USELOCATION'], 'margins': True}
+
+ICEFIELD_SUMMARY = {
+    'fields': ['BUSINESSNAME', 'CLIENTSDOGSLED', 'CLIENTSGLACTREK', 'CLIENTSHELITOURSLEGACY', 'CLIENTSHIKE',
+               'LDNGGRATUITY', 'LDNGPAIDCLIENTS', 'REPORTYEAR', 'TRIP_GUID', 'USELOCATION'],
+    'sources': OrderedDict([
+        ('trips', {'table': 'ICEFIELD_TRIPMONTH', 'where': "REPORTYEAR >= '{startYear}' AND REPORTYEAR <= '{endYear}'",
+                   'activities': 'ICEFIELD_ACTIVITY', 'on': 'TRIP_GUID', 'categories': True,
+                   'rename': {'BUSINESSNAME_x': 'BUSINESSNAME'},
+                   'derive': [('ClientActTotal', row_sum(['CLIENTSGLACTREK', 'CLIENTSDOGSLED', 'CLIENTSHIKE',
+                                                          'CLIENTSHELITOURSLEGACY'])),
+                              ('LandingActTotal', row_sum(['LDNGGRATUITY', 'LDNGPAIDCLIENTS']))]})]),
+    'pivots': OrderedDict([
+        ('clients', dict(_ICEFIELD_PIVOT, values='ClientActTotal', index=['BUSINESSNAME', 'REPORTYEAR'])),
+        ('landings', dict(_ICEFIELD_PIVOT, values='LandingActTotal', index=['BUSINESSNAME', 'REPORTYEAR'])),
+        ('clientTotals', dict(_ICEFIELD_PIVOT, values='ClientActTotal', index=['REPORTYEAR'])),
+        ('landingTotals', dict(_ICEFIELD_PIVOT, values='LandingActTotal', index=['REPORTYEAR']))]),
+    # the landing totals go on the Totals sheet under the clients, the tool places them
+    'sheets': [('Totals', 'clientTotals', {'header': 'Total Clients and Landings (Revenue and Gratuity) for last 10 years'}),
+               ('Clients', 'clients', {'header': 'Clients (Revenue and Gratuity)'}),
+               ('Landings', 'landings', {'header': 'Landings (Revenue and Gratuity)'})]}
+
+# Clients by location for a year, and for each month of the season
+MENDENHALL_MONTHS = ['April', 'May', 'June', 'July', 'August', 'September', 'October']
+_MENDENHALL_PIVOT = {'source': 'trips', 'values': 'CLIENTSLOCATION', 'index': ['BUSINESSNAME', 'REPORTYEAR'],
+                     'columns': ['USELOCATION'], 'margins': True}
+
+MENDENHALL_SUMMARY = {
+    'fields': ['BUSINESSNAME', 'CLIENTSLOCATION', 'REPORTMONTH', 'REPORTYEAR', 'TRIP_GUID', 'USELOCATION'],
+    'sources': OrderedDict([
+        ('trips', {'table': 'MENDENHALL_TRIPMONTH', 'where': "REPORTYEAR = {year}",
+                   'activities': 'MENDENHALL_ACTIVITY', 'on': 'TRIP_GUID', 'categories': True,
+                   'rename': {'BUSINESSNAME_x': 'BUSINESSNAME'}})]),
+    'pivots': OrderedDict([
+        ('totals', dict(_MENDENHALL_PIVOT, empty='There were no trips in {reportYr}')),
+        ('months', dict(_MENDENHALL_PIVOT, by='REPORTMONTH', groups=MENDENHALL_MONTHS,
+                        empty='There were no trips in {group}, {reportYr}'))]),
+    'sheets': [('Totals', 'totals', {})] + [(month, month, {}) for month in MENDENHALL_MONTHS]}
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluates the where clauses the report tools hand to their cursors against a
+DataFrame, so the same reports can run off the local snapshot
+(report_data.use_snapshot) without rewriting every query.
+
+Covers the SQL the reports use:
+    REPORTYEAR >= '2016' AND BUSINESSNAME = 'Some Outfitter'
+    "ENDDATE" >= date '2021-01-01' AND TRIPDATE <= timestamp '2021-12-31 23:59:59'
+    FORESTNAME IN ('Tongass', 'Chugach')
+    SERVICE_DAYS_NONHUNTER > 0 AND NOT NO_OPERATION IS NULL
+plus LIKE, BETWEEN and parentheses. Field names can be quoted or table-qualified.
+
+@author: kmmiles
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<str>'(?:[^']|'')*')|
+    (?P<num>-?\d+(?:\.\d+)?(?![\w.]))|
+    (?P<op><>|!=|>=|<=|=|<|>|\(|\)|,)|
+    (?P<name>"[^"]+"|[A-Za-z_][\w.]*)
+    )""", re.X)
+
+_KEYWORDS = ('AND', 'OR', 'NOT', 'IN', 'IS', 'NULL', 'LIKE', 'BETWEEN')
+
+
+def _tokens(where):
+    tokens = []
+    pos = 0
+    where = where.strip()
+    while pos < len(where):
+        m = _TOKEN.match(where, pos)
+        if not m or m.end() == pos:
+            raise ValueError("Can't read where clause at: {}".format(where[pos:]))
+        pos = m.end()
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == 'str':
+            tokens.append(('lit', text[1:-1].replace("''", "'")))
+        elif kind == 'num':
+            tokens.append(('lit', float(text) if '.' in text else int(text)))
+        elif kind == 'op':
+            tokens.append(('op', text))
+        elif text.upper() in _KEYWORDS:
+            tokens.append(('kw', text.upper()))
+        else:
+            tokens.append(('name', text))
+    return tokens
+
+
+class _Parser(object):
+    """ Recursive descent over the tokens, builds a small tuple tree"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, kind=None, value=None):
+        if self.pos >= len(self.tokens):
+            return False
+        k, v = self.tokens[self.pos]
+        return (kind is None or k == kind) and (value is None or v == value)
+
+    def take(self, kind=None, value=None):
+        if not self.peek(kind, value):
+            found = self.tokens[self.pos] if self.pos < len(self.tokens) else 'end of clause'
+            raise ValueError("Expected {} but found {}".format(value or kind, found))
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token[1]
+
+    def parse(self):
+        tree = self.expr()
+        if self.pos != len(self.tokens):
+            raise ValueError("Unexpected {} in where clause".format(self.tokens[self.pos]))
+        return tree
+
+    def expr(self):
+        tree = self.term()
+        while self.peek('kw', 'OR'):
+            self.take()
+            tree = ('or', tree, self.term())
+        return tree
+
+    def term(self):
+        tree = self.factor()
+        while self.peek('kw', 'AND'):
+            self.take()
+            tree = ('and', tree, self.factor())
+        return tree
+
+    def factor(self):
+        if self.peek('kw', 'NOT'):
+            self.take()
+            return ('not', self.factor())
+        if self.peek('op', '('):
+            self.take()
+            tree = self.expr()
+            self.take('op', ')')
+            return tree
+        return self.predicate()
+
+    def operand(self):
+        if self.peek('lit'):
+            return ('lit', self.take())
+        name = self.take('name')
+        if name.lower() in ('date', 'timestamp') and self.peek('lit'):
+            return ('lit', pd.Timestamp(self.take()))
+        return ('col', name.strip('"').split('.')[-1].strip('"').upper())
+
+    def predicate(self):
+        left = self.operand()
+        negate = False
+        if self.peek('kw', 'NOT'):
+            self.take()
+            negate = True
+        if self.peek('kw', 'IN'):
+            self.take()
+            values = []
+            if self.peek('op', '('):
+                self.take()
+                values.append(self.operand()[1])
+                while self.peek('op', ','):
+                    self.take()
+                    # str(tuple(forest)) leaves a trailing comma for one forest
+                    if self.peek('op', ')'):
+                        break
+                    values.append(self.operand()[1])
+                self.take('op', ')')
+            else:
+                # FORESTNAME IN 'Tongass'
+                values.append(self.operand()[1])
+            return ('in', left, values, negate)
+        if self.peek('kw', 'LIKE'):
+            self.take()
+            return ('like', left, self.operand()[1], negate)
+        if self.peek('kw', 'BETWEEN'):
+            self.take()
+            low = self.operand()
+            self.take('kw', 'AND')
+            return ('between', left, low, self.operand(), negate)
+        if self.peek('kw', 'IS'):
+            self.take()
+            if self.peek('kw', 'NOT'):
+                self.take()
+                negate = True
+            self.take('kw', 'NULL')
+            return ('null', left, negate)
+        op = self.take('op')
+        return ('cmp', op, left, self.operand())
+
+
+def parse(where):
+    """ Parses a where clause into a tree, None for an empty clause"""
+    if not where or not where.strip():
+        return None
+    return _Parser(_tokens(where)).parse()
+
+
+def columns(tree):
+    """ Set of the fields a parsed where clause looks at"""
+    found = set()
+
+    def walk(node):
+        if isinstance(node, tuple):
+            if node[0] == 'col':
+                found.add(node[1])
+            for part in node[1:]:
+                walk(part)
+    walk(tree)
+    return found
+
+
+def bounds(tree, column):
+    """ (low, high) that the top level ANDs of a where clause put on a column, e.g. the
+    report years, None where there isn't one"""
+    low = high = None
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if not node:
+            continue
+        if node[0] == 'and':
+            stack.extend(node[1:])
+        elif node[0] == 'cmp' and node[2] == ('col', column) and node[3][0] == 'lit':
+            op, value = node[1], node[3][1]
+            if op in ('>=', '>', '='):
+                low = value if low is None else max(low, value)
+            if op in ('<=', '<', '='):
+                high = value if high is None else min(high, value)
+        elif node[0] == 'between' and node[1] == ('col', column) and not node[4]:
+            low, high = node[2][1], node[3][1]
+    return low, high
+
+
+def year(value):
+    """ Year out of a where clause bound: a timestamp, number or text year"""
+    if isinstance(value, pd.Timestamp):
+        return value.year
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def prune(partitions, tree, column):
+    """ The year partitions ('2021', ..., 'none') a parsed where clause can match, going by
+    the bounds it puts on the year column"""
+    if column is None or tree is None:
+        return partitions
+    low, high = [year(value) for value in bounds(tree, column.upper())]
+    if low is None and high is None:
+        return partitions
+    return [p for p in partitions if p != 'none' and
+            (low is None or int(p) >= low) and (high is None or int(p) <= high)]
+
+
+def _column(frame, name):
+    for column in frame.columns:
+        if column.upper() == name:
+            return frame[column]
+    raise KeyError("Field {} isn't in the table".format(name))
+
+
+def _value(frame, node, like=None):
+    """ Column series or a literal converted to match the column it is compared with"""
+    if node[0] == 'col':
+        return _column(frame, node[1])
+    value = node[1]
+    if like is None or isinstance(value, pd.Timestamp):
+        return value
+    if pd.api.types.is_numeric_dtype(like):
+        return pd.to_numeric(value) if isinstance(value, str) else value
+    if pd.api.types.is_datetime64_any_dtype(like):
+        return pd.Timestamp(value)
+    return value
+
+
+def _numbers(series, *values):
+    """ A text field compared with a bare number, e.g. REPORTYEAR >= 2016.0 from a GPDouble
+    year, is compared as numbers, as text '2019' would sort before '2019.0'"""
+    if not isinstance(series, pd.Series) or pd.api.types.is_numeric_dtype(series) \
+            or pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if not any(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return series
+    return pd.to_numeric(series.astype(object), errors='coerce')
+
+
+def _compare(op, left, right):
+    if op == '=':
+        return left == right
+    if op in ('<>', '!='):
+        # SQL never matches nulls, pandas says NaN != anything
+        result = left != right
+        for side in (left, right):
+            if isinstance(side, pd.Series):
+                result = result & side.notna()
+        return result
+    if op == '>=':
+        return left >= right
+    if op == '<=':
+        return left <= right
+    if op == '>':
+        return left > right
+    return left < right
+
+
+def _mask(frame, node):
+    kind = node[0]
+    if kind == 'and':
+        return _mask(frame, node[1]) & _mask(frame, node[2])
+    if kind == 'or':
+        return _mask(frame, node[1]) | _mask(frame, node[2])
+    if kind == 'not':
+        return ~_mask(frame, node[1])
+    if kind == 'null':
+        result = _value(frame, node[1]).isna()
+        return ~result if node[2] else result
+    if kind == 'in':
+        series = _value(frame, node[1])
+        series = _numbers(series, *node[2])
+        values = [_value(frame, ('lit', value), series) for value in node[2]]
+        result = series.isin(values)
+        return ~result & series.notna() if node[3] else result
+    if kind == 'like':
+        series = _value(frame, node[1])
+        pattern = '^' + re.escape(node[2]).replace('%', '.*').replace('_', '.') + '$'
+        result = series.astype(str).str.match(pattern) & series.notna()
+        return ~result & series.notna() if node[3] else result
+    if kind == 'between':
+        series = _numbers(_value(frame, node[1]), node[2][1], node[3][1])
+        result = (series >= _value(frame, node[2], series)) & (series <= _value(frame, node[3], series))
+        return ~result & series.notna() if node[4] else result
+    left, right = node[2], node[3]
+    if left[0] == 'col':
+        series = _value(frame, left)
+        if right[0] == 'lit':
+            series = _numbers(series, right[1])
+        other = _value(frame, right, series)
+    else:
+        other = _numbers(_value(frame, right), left[1])
+        series = _value(frame, left, other if isinstance(other, pd.Series) else None)
+    result = _compare(node[1], series, other)
+    if not isinstance(result, pd.Series):
+        result = pd.Series(np.repeat(bool(result), len(frame)), index=frame.index)
+    return result.fillna(False).astype(bool)
+
+
+def mask(frame, clause):
+    """ Boolean array of the rows of frame that match a where clause (string or parsed tree)"""
+    tree = parse(clause) if isinstance(clause, str) or clause is None else clause
+    if tree is None or frame.empty:
+        return np.ones(len(frame), dtype=bool)
+    return _mask(frame, tree).values
+
+
+def where(frame, clause):
+    """ Rows of frame that match a where clause (string or parsed tree)"""
+    return frame.loc[mask(frame, clause)]
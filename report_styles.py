@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk cell styling for the report workbooks.
+
+Setting cell.style = NamedStyle(...) compares the style against every named
+style the workbook has, for every cell, to see if it has to be added. Here
+each style is added to its workbook once, the first time a range uses it,
+and the cells are then given the style by name. That only looks the name up
+in the workbook's few named styles. Same cells and styles in the saved
+workbook as setting cell.style to the NamedStyle.
+
+@author: kmmiles
+"""
+
+from weakref import WeakKeyDictionary
+
+from openpyxl.cell.cell import Cell
+from openpyxl.styles import NamedStyle
+
+
+# Workbook -> names of the styles already added to it
+_added = WeakKeyDictionary()
+
+
+def style_name(ws, style):
+    """ Name of a named style (name or NamedStyle) in the worksheet's workbook. A NamedStyle
+    the workbook doesn't have yet is added, as cell.style would."""
+    added = _added.setdefault(ws.parent, set())
+    name = getattr(style, 'name', style)
+    if name not in added:
+        if isinstance(style, NamedStyle) and name not in ws.parent.named_styles:
+            ws.parent.add_named_style(style)
+        added.add(name)
+    return name
+
+
+def _cells(selected):
+    if isinstance(selected, Cell):
+        selected = [selected]
+    for item in selected:
+        if isinstance(item, tuple):
+            for cell in item:
+                yield cell
+        else:
+            yield item
+
+
+def style_range(ws, cells, style):
+    """ Gives a style to every cell in a range, anything ws[...] takes: 'B2:O13', a column
+    'A' or a row 1. Cells already read out of the sheet can be passed instead."""
+    name = style_name(ws, style)
+    selected = ws[cells] if isinstance(cells, (str, int)) else cells
+    for cell in _cells(selected):
+        cell.style = name
+
+
+def write_row(ws, row, values, styles, min_col=1):
+    """ Writes values across a row from min_col, each cell styled with the style at the same
+    position in styles"""
+    names = [style_name(ws, style) for style in styles]
+    for col, value in enumerate(values, min_col):
+        cell = ws.cell(row=row, column=col)
+        cell.value = value
+        cell.style = names[col - min_col]
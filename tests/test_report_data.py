@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for report_data.TableCache, the session cache of the table reads.
+
+@author: kmmiles
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('arcpy')
+import report_data
+from report_data import TableCache
+
+DISTINCT = (None, ('DISTINCT', None))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """ Time the cache sees, moved on by setting clock['now']"""
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(report_data.time, 'time', lambda: clock['now'])
+    return clock
+
+
+@pytest.fixture
+def names():
+    return pd.DataFrame({
+        'BUSINESSNAME': ['Alpine Air', 'Alpine Air', 'Coastal', 'Coastal'],
+        'FORESTNAME': ['Tongass', 'Chugach', 'Tongass', 'Tongass'],
+        'REPORTYEAR': ['2019', '2019', '2020', '2021'],
+    })
+
+
+def test_narrower_read(names):
+    cache = TableCache()
+    cache.put('GUIDEDREC_TRIP', list(names.columns), (None, (None, None)), names)
+
+    frame = cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME', 'FORESTNAME'], (None, (None, None)))
+
+    assert list(frame.columns) == ['BUSINESSNAME', 'FORESTNAME']
+    assert len(frame) == 4
+    assert cache.get('GUIDEDREC_TRIP', ['CLIENTS'], (None, (None, None))) is None
+    assert cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME'], ("FORESTNAME = 'Tongass'", (None, None))) is None
+
+
+def test_narrower_distinct_read(names):
+    cache = TableCache()
+    cache.put('GUIDEDREC_TRIP', list(names.columns), DISTINCT, names)
+
+    frame = cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME', 'FORESTNAME'], DISTINCT, distinct=True)
+
+    # what SELECT DISTINCT BUSINESSNAME, FORESTNAME gives
+    assert frame.values.tolist() == [['Alpine Air', 'Tongass'], ['Alpine Air', 'Chugach'], ['Coastal', 'Tongass']]
+    assert list(frame.index) == [0, 1, 2]
+    assert cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME'], DISTINCT, distinct=True)['BUSINESSNAME'].tolist() == \
+        ['Alpine Air', 'Coastal']
+    # the same columns come back as they were cached
+    assert len(cache.get('GUIDEDREC_TRIP', list(names.columns), DISTINCT, distinct=True)) == 4
+
+
+def test_reads_are_copies(names):
+    cache = TableCache()
+    cache.put('GUIDEDREC_TRIP', list(names.columns), None, names)
+    names.loc[0, 'BUSINESSNAME'] = 'Changed'
+
+    frame = cache.get('GUIDEDREC_TRIP', None, None)
+    frame.loc[1, 'BUSINESSNAME'] = 'Changed'
+
+    assert cache.get('GUIDEDREC_TRIP', None, None)['BUSINESSNAME'].tolist()[:2] == ['Alpine Air', 'Alpine Air']
+
+
+def test_ttl(names, clock):
+    cache = TableCache(ttl=60)
+    cache.put('GUIDEDREC_TRIP', list(names.columns), None, names)
+
+    clock['now'] += 60
+    assert cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME'], None) is not None
+    clock['now'] += 1
+    assert cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME'], None) is None
+    assert not cache.entries and cache.size == 0
+
+
+def test_budget(names):
+    size = int(names.memory_usage(deep=True).sum())
+    cache = TableCache(budget=2 * size)
+    for table in ('GUIDEDREC_TRIP', 'HUNTING_TRIP'):
+        cache.put(table, list(names.columns), None, names)
+    # the older read was used last, so the other one is dropped
+    assert cache.get('GUIDEDREC_TRIP', ['BUSINESSNAME'], None) is not None
+
+    cache.put('HELISKI_TRIP', list(names.columns), None, names)
+
+    assert [key[0] for key in cache.entries] == ['GUIDEDREC_TRIP', 'HELISKI_TRIP']
+    assert cache.size == 2 * size
+    # a frame over the whole budget isn't kept, and doesn't push the others out
+    cache.put('OUTFITTING_ACTIVITY', list(names.columns), None, pd.concat([names] * 3))
+    assert [key[0] for key in cache.entries] == ['GUIDEDREC_TRIP', 'HELISKI_TRIP']
+
+
+def test_invalidate(names):
+    cache = TableCache()
+    for table in ('a.sde\\OWNER.GUIDEDREC_TRIP', 'b.sde\\OWNER.GUIDEDREC_TRIP', 'a.sde\\OWNER.HUNTING_TRIP'):
+        cache.put(table, list(names.columns), None, names)
+
+    cache.invalidate('GUIDEDREC_TRIP')
+
+    assert [key[0] for key in cache.entries] == ['a.sde\\OWNER.HUNTING_TRIP']
+    assert cache.size == int(names.memory_usage(deep=True).sum())
+
+
+def test_disabled(names):
+    cache = TableCache()
+    cache.enabled = False
+    cache.put('GUIDEDREC_TRIP', list(names.columns), None, names)
+
+    assert cache.get('GUIDEDREC_TRIP', None, None) is None
+    assert not cache.entries
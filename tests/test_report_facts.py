@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for report_facts.with_location, the LOCATION columns read_facts carries
+along in place of the reports' own merge with the LOCATION table.
+
+@author: kmmiles
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('arcpy')
+from report_facts import with_location, fill_locations, LOCATION_PREFIX, LOCATION_KEY
+
+
+@pytest.fixture
+def locations():
+    return pd.DataFrame({
+        'LOCATION_ID': [1, 2, 3, 4],
+        'USELOCATION': ['Tracy Arm', 'Juneau Icefield', 'Admiralty', 'Baranof'],
+        'FULLNAME': ['Tracy Arm - Fords Terror', None, None, 'Baranof Island'],
+        'ZONE_NAME': ['Zone 1', 'Zone 2', None, 'Zone 4'],
+        'DISTRICTNAME': ['Juneau', None, 'Admiralty', 'Sitka'],
+    })
+
+
+@pytest.fixture
+def activities():
+    return pd.DataFrame({
+        'DAY_GUID': ['a', 'b', 'c', 'd', 'e'],
+        'LOCATION_ID': [2, 1, 9, np.nan, 2],
+        'USELOCATION': ['juneau icefield', 'Tracy Arm', 'Unlisted', None, 'Juneau Icefield'],
+        'CLIENTS': [4, 6, 2, 1, 8],
+    })
+
+
+def _carried(frame, locations):
+    """ The rows the way read_facts(location=True) hands them back"""
+    location = locations.copy()
+    location.columns = [LOCATION_PREFIX + column for column in location.columns]
+    return frame.merge(location, how='left', left_on=LOCATION_KEY, right_on=LOCATION_PREFIX + LOCATION_KEY)
+
+
+@pytest.mark.parametrize('prepare', [None, fill_locations])
+def test_with_location_matches_the_merge(activities, locations, prepare):
+    expected = activities.merge(prepare(locations) if prepare else locations, how='left', on=['LOCATION_ID'])
+    result = with_location(_carried(activities, locations), prepare)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert 'USELOCATION_x' in result.columns and 'USELOCATION_y' in result.columns
+    assert not [column for column in result.columns if column.startswith(LOCATION_PREFIX)]
+
+
+def test_fill_locations(locations):
+    filled = fill_locations(locations)
+
+    assert filled['FULLNAME'].fillna('').tolist() == ['Tracy Arm - Fords Terror', 'Zone 2', '', 'Baranof Island']
+    assert filled['USE_AREA'].tolist() == ['Tracy Arm - Fords Terror', 'Zone 2', 'Use Area Unknown', 'Baranof Island']
+    assert filled['DISTRICTNAME'].tolist() == ['Juneau', 'Ranger District Unknown', 'Admiralty', 'Sitka']
+    assert locations['FULLNAME'].isna().sum() == 2
+
+
+def test_with_location_without_rows(activities, locations):
+    empty = activities.iloc[:0]
+    expected = empty.merge(fill_locations(locations), how='left', on=['LOCATION_ID'])
+    result = with_location(_carried(empty, locations), fill_locations)
+
+    assert list(result.columns) == list(expected.columns)
+    assert result.empty
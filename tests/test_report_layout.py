@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for report_layout, the page layout of the detail report trips.
+
+@author: kmmiles
+"""
+
+import random
+
+import pytest
+
+from report_layout import trip_rows, page_ends, page_line, add_page_breaks
+
+
+class _Report(object):
+    """ The row keeping of the detail reports' _add_trip before report_layout"""
+
+    def __init__(self, row):
+        self.row = row
+        self.starts = []
+
+    def _add_trip(self, activities):
+        # Skip to next page if trip records span page.
+        current_page_line = (self.row - 27) % 29 if self.row > 27 else self.row
+        current_page_line = 29 if not current_page_line else current_page_line
+        trip_end_line = current_page_line + len(activities)
+        if (self.row <= 27) and (trip_end_line > 27):
+            self.row += 28 - current_page_line
+        elif trip_end_line > 29:
+            self.row += 30 - current_page_line
+
+        self.starts.append(self.row)
+        self.row += 1
+        self.row += len(activities)
+
+
+def _old_rows(counts, row):
+    report = _Report(row)
+    for count in counts:
+        report._add_trip([None] * count)
+    return report.starts, report.row
+
+
+@pytest.mark.parametrize('counts, row', [
+    ([], 9),
+    ([1], 9),
+    ([17], 9),
+    ([18], 9),
+    ([3] * 20, 9),
+    ([28, 1, 27], 9),
+    ([5, 12, 1, 9, 20, 2, 2, 14], 12),
+    ([0, 0, 4], 27),
+    ([2], 28),
+])
+def test_trip_rows_match_add_trip(counts, row):
+    assert trip_rows(counts, row) == _old_rows(counts, row)
+
+
+def test_trip_rows_match_add_trip_random():
+    rng = random.Random(13)
+    for _ in range(500):
+        counts = [rng.randint(0, 30) for _ in range(rng.randint(0, 25))]
+        row = rng.randint(1, 40)
+        assert trip_rows(counts, row) == _old_rows(counts, row)
+
+
+def test_trips_stay_on_their_page():
+    counts = [5, 12, 1, 9, 20, 2, 2, 14, 26, 3]
+    starts, last = trip_rows(counts, 9)
+    ends = page_ends(last)
+    for start, count in zip(starts, counts):
+        # the header and its activities end before the next page end, or on it
+        assert not [end for end in ends if start <= end < start + count]
+
+
+def test_page_line():
+    assert [page_line(row) for row in (1, 27, 28, 56, 57, 85)] == [1, 27, 1, 29, 1, 29]
+
+
+def test_page_ends():
+    assert page_ends(27) == []
+    assert page_ends(28) == [27]
+    assert page_ends(100) == [27, 56, 85]
+    assert page_ends(100, first_page=10, page=20) == [10, 30, 50, 70, 90]
+
+
+class _Sheet(object):
+    def __init__(self):
+        self.row_breaks = []
+
+
+def test_add_page_breaks():
+    pytest.importorskip('openpyxl')
+    ws = _Sheet()
+    add_page_breaks(ws, 100)
+    assert [brk.id for brk in ws.row_breaks] == [27, 56, 85]
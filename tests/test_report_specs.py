@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for report_specs.run_spec, checked against the pivot_table calls the
+ConfirmActualUse, IcefieldSummary and MendenhallSummary tools made before
+they were specs.
+
+@author: kmmiles
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('arcpy')
+import report_data
+import report_specs
+from report_specs import run_spec, CONFIRM_USE, ICEFIELD_SUMMARY, MENDENHALL_SUMMARY, MENDENHALL_MONTHS
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    """ Frames the specs read, by table name. Reads are answered from these, and kept in
+    tables['reads'] as (table, where)"""
+    tables = {'reads': []}
+
+    def read_table(table, fields=None, where=None, categories=False, **kwargs):
+        name = table.split('\\')[-1]
+        tables['reads'].append((name, where))
+        frame = tables[name].copy()
+        return report_data.encode(frame) if categories else frame
+
+    monkeypatch.setattr(report_specs, 'read_table', read_table)
+    # names other reads in the session put in the shared dictionary, not in these tables
+    monkeypatch.setattr(report_data, 'categories', {'USELOCATION': ['Unused Glacier'], 'BUSINESSNAME': ['Unused Air']})
+    return tables
+
+
+def _pivot(frame, values, index, columns, margins, dropna):
+    return pd.pivot_table(frame, values=values, index=index, columns=columns, aggfunc=np.sum,
+                          margins=margins, dropna=dropna, margins_name='Total', observed=True)
+
+
+def _trips(date_field, flag='Yes'):
+    d = datetime.datetime
+    return pd.DataFrame({
+        'BUSINESSNAME': ['Alpine Guides', 'Alpine Guides', 'Coastal', 'Coastal', None],
+        'NO_OPERATION': ['No', 'No', flag, 'No', 'No'],
+        date_field: [d(2018, 5, 1), d(2018, 6, 1), d(2019, 7, 1), d(2020, 7, 1), d(2020, 8, 1)],
+    })
+
+
+def test_confirm_use(tables):
+    for table, field in [('GUIDEDREC_TRIP', 'STARTDATE'), ('HELISKI_TRIP', 'TRIPDATE'),
+                         ('OUTFITTING_ACTIVITY', 'TRIPDATE')]:
+        tables[table] = _trips(field)
+    tables['HUNTING_TRIP'] = _trips('STARTDATE', 'YES')
+    for table in ('ICEFIELD_TRIPMONTH', 'MENDENHALL_TRIPMONTH'):
+        tables[table] = _trips('TRIPDATE').assign(REPORTYEAR=[2018, 2018, 2019, 2020, 2020])
+    params = {'start': '2018-01-01 00:00:00', 'end': '2020-12-31 00:00:00', 'forest': 'Chugach',
+              'startYear': 2018, 'endYear': 2020}
+
+    results = run_spec(CONFIRM_USE, 'c\\', params)
+
+    # the icefields and mendenhall only on the Tongass
+    assert set(results) == set(['guide', 'hunt', 'outfit', 'heli'])
+    assert ('GUIDEDREC_TRIP', "STARTDATE >= timestamp '2018-01-01 00:00:00' AND ENDDATE <= "
+            "timestamp '2020-12-31 00:00:00' AND FORESTNAME = 'Chugach'") in tables['reads']
+    for name, table, field, flag in [('guide', 'GUIDEDREC_TRIP', 'STARTDATE', 'Yes'),
+                                     ('hunt', 'HUNTING_TRIP', 'STARTDATE', 'YES'),
+                                     ('heli', 'HELISKI_TRIP', 'TRIPDATE', 'Yes')]:
+        frame = tables[table].copy()
+        frame['Year'] = frame[field].dt.year
+        frame['Number of Trips'] = 1.0
+        frame.loc[frame['NO_OPERATION'] == flag, 'Number of Trips'] = 0.1
+        expected = _pivot(frame, ['Number of Trips'], ['BUSINESSNAME'], ['Year'], False, False)
+        pd.testing.assert_frame_equal(results[name], expected, check_dtype=False)
+
+    # dropna=False keeps the years a business has no trips in, and the trips without a name
+    assert results['guide'].isna().any().any()
+    assert results['guide'].index.isna().any()
+    assert results['hunt'].loc['Coastal', ('Number of Trips', 2019)] == pytest.approx(0.1)
+
+    results = run_spec(CONFIRM_USE, 'c\\', dict(params, forest='Tongass'))
+    assert set(results) == set(['guide', 'hunt', 'outfit', 'heli', 'ice', 'mend'])
+    assert ('ICEFIELD_TRIPMONTH', 'REPORTYEAR >= 2018 AND REPORTYEAR <= 2020') in tables['reads']
+
+
+def test_icefield_summary(tables):
+    tables['ICEFIELD_TRIPMONTH'] = pd.DataFrame({
+        'TRIP_GUID': ['t1', 't2', 't3'],
+        'BUSINESSNAME': ['Alpine Air', 'Alpine Air', 'Coastal'],
+        'REPORTYEAR': ['2019', '2020', '2020'],
+    })
+    tables['ICEFIELD_ACTIVITY'] = pd.DataFrame({
+        'TRIP_GUID': ['t1', 't1', 't2', 't3', 't3', 't4'],
+        'BUSINESSNAME': ['Alpine Air', 'Alpine Air', 'Alpine Air', 'Coastal', 'Coastal', 'Gone'],
+        'USELOCATION': ['Norris', 'Taku', 'Norris', 'Taku', None, 'Norris'],
+        'CLIENTSDOGSLED': [1, 0, 2, 0, 3, 9],
+        'CLIENTSGLACTREK': [0, 4, 0, 1, 0, 9],
+        'CLIENTSHELITOURSLEGACY': [2, 0, 0, 0, 1, 9],
+        'CLIENTSHIKE': [0, 0, 5, 0, 0, 9],
+        'LDNGGRATUITY': [1, 1, 0, 0, 0, 9],
+        'LDNGPAIDCLIENTS': [3, 1, 2, 2, 1, 9],
+    })
+
+    results = run_spec(ICEFIELD_SUMMARY, 'c\\', {'startYear': 2019, 'endYear': 2020})
+
+    assert ('ICEFIELD_TRIPMONTH', "REPORTYEAR >= '2019' AND REPORTYEAR <= '2020'") in tables['reads']
+    allDF = report_data.encode(tables['ICEFIELD_ACTIVITY'].copy()).merge(
+        report_data.encode(tables['ICEFIELD_TRIPMONTH'].copy()), how='inner', on='TRIP_GUID')
+    allDF.rename(columns={'BUSINESSNAME_x': 'BUSINESSNAME'}, inplace=True)
+    allDF['ClientActTotal'] = allDF[['CLIENTSGLACTREK', 'CLIENTSDOGSLED', 'CLIENTSHIKE', 'CLIENTSHELITOURSLEGACY']].sum(axis=1)
+    allDF['LandingActTotal'] = allDF[['LDNGGRATUITY', 'LDNGPAIDCLIENTS']].sum(axis=1)
+    for name, values, index in [('clients', 'ClientActTotal', ['BUSINESSNAME', 'REPORTYEAR']),
+                                ('landings', 'LandingActTotal', ['BUSINESSNAME', 'REPORTYEAR']),
+                                ('clientTotals', 'ClientActTotal', ['REPORTYEAR']),
+                                ('landingTotals', 'LandingActTotal', ['REPORTYEAR'])]:
+        expected = _pivot(allDF, values, index, ['USELOCATION'], True, True)
+        pd.testing.assert_frame_equal(results[name], expected, check_dtype=False)
+
+    # the categories no row has stay out of the sheets
+    assert 'Unused Glacier' not in results['clients'].columns
+    assert 'Unused Air' not in results['clients'].index.get_level_values(0)
+    assert list(results['clientTotals'].columns) == ['Norris', 'Taku', 'Total']
+    assert results['clientTotals'].loc['Total', 'Total'] == 15
+
+
+def test_mendenhall_summary(tables):
+    tables['MENDENHALL_TRIPMONTH'] = pd.DataFrame({
+        'TRIP_GUID': ['t1', 't2', 't3', 't4'],
+        'BUSINESSNAME': ['Alpine Guides', 'Alpine Guides', 'Coastal', 'Coastal'],
+        'REPORTYEAR': ['2021', '2021', '2021', '2021'],
+        'REPORTMONTH': ['May', 'June', 'June', 'August'],
+    })
+    tables['MENDENHALL_ACTIVITY'] = pd.DataFrame({
+        'TRIP_GUID': ['t1', 't1', 't2', 't3', 't4'],
+        'BUSINESSNAME': ['Alpine Guides', 'Alpine Guides', 'Alpine Guides', 'Coastal', 'Coastal'],
+        'USELOCATION': ['West Glacier', 'Nugget Falls', 'West Glacier', 'Nugget Falls', 'Nugget Falls'],
+        'CLIENTSLOCATION': [10, 4, 6, 20, 8],
+    })
+    params = {'year': 2021, 'reportYr': '2021'}
+
+    results = run_spec(MENDENHALL_SUMMARY, 'c\\', params)
+
+    assert ('MENDENHALL_TRIPMONTH', 'REPORTYEAR = 2021') in tables['reads']
+    assert list(results) == ['totals'] + MENDENHALL_MONTHS
+    allDF = report_data.encode(tables['MENDENHALL_ACTIVITY'].copy()).merge(
+        report_data.encode(tables['MENDENHALL_TRIPMONTH'].copy()), how='inner', on='TRIP_GUID')
+    allDF.rename(columns={'BUSINESSNAME_x': 'BUSINESSNAME'}, inplace=True)
+    index = ['BUSINESSNAME', 'REPORTYEAR']
+    pd.testing.assert_frame_equal(results['totals'], _pivot(allDF, 'CLIENTSLOCATION', index, ['USELOCATION'], True, True),
+                                  check_dtype=False)
+    for month in ('May', 'June', 'August'):
+        expected = _pivot(allDF[allDF['REPORTMONTH'] == month], 'CLIENTSLOCATION', index, ['USELOCATION'], True, True)
+        pd.testing.assert_frame_equal(results[month], expected, check_dtype=False)
+    assert 'Unused Glacier' not in results['June'].columns
+    assert results['April'] == 'There were no trips in April, 2021'
+    assert results['July'] == 'There were no trips in July, 2021'
+
+
+def test_mendenhall_summary_without_trips(tables):
+    tables['MENDENHALL_TRIPMONTH'] = pd.DataFrame(columns=['TRIP_GUID', 'BUSINESSNAME', 'REPORTYEAR', 'REPORTMONTH'])
+    tables['MENDENHALL_ACTIVITY'] = pd.DataFrame(columns=['TRIP_GUID', 'BUSINESSNAME', 'USELOCATION', 'CLIENTSLOCATION'])
+
+    results = run_spec(MENDENHALL_SUMMARY, 'c\\', {'year': 2022, 'reportYr': '2022'})
+
+    assert results['totals'] == 'There were no trips in 2022'
+    assert [results[month] for month in MENDENHALL_MONTHS] == \
+        ['There were no trips in {}, 2022'.format(month) for month in MENDENHALL_MONTHS]
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for report_sql, the where clause evaluator the reports run on a snapshot.
+
+@author: kmmiles
+"""
+
+import pandas as pd
+import pytest
+
+import report_sql
+
+
+@pytest.fixture
+def trips():
+    return pd.DataFrame({
+        'BUSINESSNAME': ['Alpine Guides', "O'Brien Outfitters", 'Alpine Air', None],
+        'FORESTNAME': ['Tongass', 'Chugach', 'Tongass', 'Chugach'],
+        'REPORTYEAR': ['2016', '2019', '2021', '2021'],
+        'CLIENTS': [4, 0, 12, None],
+        'ENDDATE': pd.to_datetime(['2016-06-01', '2019-07-15', '2021-01-01', '2021-12-31 12:00'], format='mixed'),
+    })
+
+
+def matches(frame, clause):
+    return list(report_sql.mask(frame, clause))
+
+
+def test_parse_tree():
+    assert report_sql.parse(None) is None
+    assert report_sql.parse('  ') is None
+    assert report_sql.parse("REPORTYEAR >= '2016' AND BUSINESSNAME = 'Alpine Guides'") == (
+        'and', ('cmp', '>=', ('col', 'REPORTYEAR'), ('lit', '2016')),
+        ('cmp', '=', ('col', 'BUSINESSNAME'), ('lit', 'Alpine Guides')))
+
+
+def test_parse_quoted_and_qualified_names():
+    tree = report_sql.parse('"ENDDATE" >= date \'2021-01-01\' AND TRIP.ClientS > 0')
+    assert report_sql.columns(tree) == {'ENDDATE', 'CLIENTS'}
+    assert tree[1][3] == ('lit', pd.Timestamp('2021-01-01'))
+
+
+def test_parse_errors():
+    with pytest.raises(ValueError):
+        report_sql.parse("REPORTYEAR >= '2016' AND")
+    with pytest.raises(ValueError):
+        report_sql.parse("REPORTYEAR ~ 2016")
+
+
+def test_compare_text_and_numbers(trips):
+    assert matches(trips, "REPORTYEAR >= '2019'") == [False, True, True, True]
+    # a text field compared with a bare number
+    assert matches(trips, "REPORTYEAR >= 2019") == [False, True, True, True]
+    assert matches(trips, "CLIENTS > 0") == [True, False, True, False]
+
+
+def test_text_years_against_numbers():
+    # the tools' GPDouble years come in as 2019.0, '2019' sorts before '2019.0' as text
+    frame = pd.DataFrame({'REPORTYEAR': ['2018', '2019', '2020', None]})
+    assert matches(frame, "REPORTYEAR >= 2019.0 AND REPORTYEAR <= 2020.0") == [False, True, True, False]
+    assert matches(frame, "REPORTYEAR >= 2019 AND REPORTYEAR <= 2020") == [False, True, True, False]
+    assert matches(frame, "REPORTYEAR = 2019.0") == [False, True, False, False]
+    assert matches(frame, "2019 <= REPORTYEAR") == [False, True, True, False]
+    assert matches(frame, "REPORTYEAR BETWEEN 2018.0 AND 2019.0") == [True, True, False, False]
+    assert matches(frame, "REPORTYEAR IN (2018.0, 2020)") == [True, False, True, False]
+    assert matches(frame, "REPORTYEAR NOT IN (2018.0)") == [False, True, True, False]
+    categories = frame.astype('category')
+    assert matches(categories, "REPORTYEAR >= 2019.0") == [False, True, True, False]
+
+
+def test_escaped_quote(trips):
+    assert matches(trips, "BUSINESSNAME = 'O''Brien Outfitters'") == [False, True, False, False]
+
+
+def test_dates(trips):
+    clause = "\"ENDDATE\" >= date '2021-01-01' AND ENDDATE <= timestamp '2021-12-31 23:59:59'"
+    assert matches(trips, clause) == [False, False, True, True]
+
+
+def test_nulls_never_match(trips):
+    assert matches(trips, "BUSINESSNAME <> 'Alpine Guides'") == [False, True, True, False]
+    assert matches(trips, "BUSINESSNAME IS NULL") == [False, False, False, True]
+    assert matches(trips, "NOT BUSINESSNAME IS NULL") == [True, True, True, False]
+    assert matches(trips, "BUSINESSNAME IS NOT NULL") == [True, True, True, False]
+    assert matches(trips, "BUSINESSNAME NOT IN ('Alpine Air')") == [True, True, False, False]
+
+
+def test_in_lists(trips):
+    assert matches(trips, "FORESTNAME IN ('Tongass', 'Chugach')") == [True] * 4
+    # str(tuple(forest)) for one forest
+    assert matches(trips, "FORESTNAME IN ('Tongass',)") == [True, False, True, False]
+    assert matches(trips, "FORESTNAME IN 'Chugach'") == [False, True, False, True]
+
+
+def test_like_between_and_parentheses(trips):
+    assert matches(trips, "BUSINESSNAME LIKE 'Alpine%'") == [True, False, True, False]
+    assert matches(trips, "BUSINESSNAME NOT LIKE 'Alpine%'") == [False, True, False, False]
+    assert matches(trips, "REPORTYEAR BETWEEN '2017' AND '2020'") == [False, True, False, False]
+    clause = "(FORESTNAME = 'Chugach' OR CLIENTS > 10) AND NOT REPORTYEAR = '2019'"
+    assert matches(trips, clause) == [False, False, True, True]
+
+
+def test_where_and_empty_clause(trips):
+    assert len(report_sql.where(trips, None)) == 4
+    assert list(report_sql.where(trips, "CLIENTS = 12").index) == [2]
+    with pytest.raises(KeyError):
+        report_sql.where(trips, "NOPE = 1")
+
+
+def test_bounds():
+    tree = report_sql.parse("REPORTYEAR >= '2016' AND REPORTYEAR <= '2020' AND FORESTNAME = 'Tongass'")
+    assert report_sql.bounds(tree, 'REPORTYEAR') == ('2016', '2020')
+    assert report_sql.bounds(tree, 'FORESTNAME') == ('Tongass', 'Tongass')
+    # an OR can't bound anything
+    tree = report_sql.parse("REPORTYEAR >= '2016' OR FORESTNAME = 'Tongass'")
+    assert report_sql.bounds(tree, 'REPORTYEAR') == (None, None)
+    tree = report_sql.parse("TRIPDATE BETWEEN date '2018-01-01' AND date '2019-12-31'")
+    assert report_sql.bounds(tree, 'TRIPDATE') == (pd.Timestamp('2018-01-01'), pd.Timestamp('2019-12-31'))
+
+
+PARTITIONS = ['2016', '2017', '2018', '2019', '2020', 'none']
+
+
+def test_prune_by_year_bounds():
+    tree = report_sql.parse("REPORTYEAR >= '2017' AND REPORTYEAR <= '2018'")
+    assert report_sql.prune(PARTITIONS, tree, 'ReportYear') == ['2017', '2018']
+    tree = report_sql.parse("REPORTYEAR = 2019")
+    assert report_sql.prune(PARTITIONS, tree, 'REPORTYEAR') == ['2019']
+    tree = report_sql.parse("TRIPDATE >= date '2019-03-01'")
+    assert report_sql.prune(PARTITIONS, tree, 'TRIPDATE') == ['2019', '2020']
+
+
+def test_prune_keeps_everything_without_bounds():
+    assert report_sql.prune(PARTITIONS, None, 'REPORTYEAR') == PARTITIONS
+    tree = report_sql.parse("FORESTNAME = 'Tongass'")
+    assert report_sql.prune(PARTITIONS, tree, 'REPORTYEAR') == PARTITIONS
+    assert report_sql.prune(PARTITIONS, tree, None) == PARTITIONS
+    # the rows without a year can still match an OR
+    tree = report_sql.parse("REPORTYEAR >= '2019' OR FORESTNAME = 'Tongass'")
+    assert report_sql.prune(PARTITIONS, tree, 'REPORTYEAR') == PARTITIONS
+
+
+def test_year():
+    assert report_sql.year(pd.Timestamp('2021-05-01')) == 2021
+    assert report_sql.year('2016') == 2016
+    assert report_sql.year(2016.0) == 2016
+    assert report_sql.year('Tongass') is None
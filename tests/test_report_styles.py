@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for report_styles, checked against setting cell.style cell by cell.
+
+@author: kmmiles
+"""
+
+import io
+
+import pytest
+
+pytest.importorskip('openpyxl')
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import NamedStyle, Font, PatternFill, Border, Side
+
+from report_styles import style_name, style_range, write_row
+
+
+def _styles():
+    thin = Side(border_style='thin', color='000000')
+    trip = NamedStyle('trip_style', font=Font(bold=True), border=Border(top=thin, bottom=thin),
+                      fill=PatternFill('solid', fgColor='DDDDDD'))
+    return [trip, NamedStyle('int_style', number_format='0'), NamedStyle('float_style', number_format='0.00')]
+
+
+def _look(cell):
+    return (cell.style, cell.font.b, cell.fill.fgColor.rgb, getattr(cell.border.top, 'style', None), cell.number_format)
+
+
+def _sheet(styled):
+    wb = Workbook()
+    ws = wb.active
+    trip, int_style, float_style = _styles()
+    if styled:
+        style_range(ws, 'A1:C2', trip)
+        style_range(ws, 'E', int_style)
+        style_range(ws, 4, float_style)
+        write_row(ws, 6, [1, 2.5, 3], [int_style, float_style, 'int_style'])
+    else:
+        for row in ws['A1:C2']:
+            for cell in row:
+                cell.style = trip
+        for cell in ws['E']:
+            cell.style = int_style
+        for cell in ws[4]:
+            cell.style = float_style
+        for col, (value, style) in enumerate(zip([1, 2.5, 3], [int_style, float_style, 'int_style']), 1):
+            cell = ws.cell(row=6, column=col)
+            cell.value = value
+            cell.style = style
+    return wb
+
+
+def test_same_styles_as_cell_style():
+    styled, plain = _sheet(True), _sheet(False)
+
+    assert styled.named_styles == plain.named_styles
+    for row in plain.active.iter_rows(min_row=1, max_row=6, max_col=5):
+        for cell in row:
+            assert _look(styled.active[cell.coordinate]) == _look(cell), cell.coordinate
+
+
+def test_styles_survive_a_save():
+    out = io.BytesIO()
+    _sheet(True).save(out)
+    ws = load_workbook(io.BytesIO(out.getvalue())).active
+
+    assert _look(ws['B2']) == ('trip_style', True, '00DDDDDD', 'thin', 'General')
+    assert _look(ws['C6']) == ('int_style', False, '00000000', None, '0')
+    assert ws['B6'].number_format == '0.00'
+
+
+def test_style_added_once_per_workbook():
+    trip = _styles()[0]
+    first, second = Workbook(), Workbook()
+
+    for wb in (first, second, first):
+        assert style_name(wb.active, trip) == 'trip_style'
+        assert style_name(wb.active, 'trip_style') == 'trip_style'
+
+    assert first.named_styles.count('trip_style') == 1
+    assert second.named_styles.count('trip_style') == 1